@@ -1,12 +1,30 @@
-from .SpecialAbility import SpecialAbility
-from .MinMaxMastery import MinMaxMastery
-from .MechanicalMastery import MechanicalMastery
-from .ImaginativeCreativity import ImaginativeCreativity
-from .BiologicalResilience import BiologicalResilience
-from .EarthyWisdom import EarthyWisdom
-from .Invisibility import Invisibility
-from .JokestersWit import JokestersWit
-from .MasterOfDisguise import MasterOfDisguise
-from .StatisticalInsight import StatisticalInsight
-from .SuperStrength import SuperStrength
-from .Teleportation import Teleportation
\ No newline at end of file
+import importlib
+
+# Classes are imported from their modules on first access, so using one
+# class doesn't import every module in the package
+__all__ = [
+    "SpecialAbility",
+    "MinMaxMastery",
+    "MechanicalMastery",
+    "ImaginativeCreativity",
+    "BiologicalResilience",
+    "EarthyWisdom",
+    "Invisibility",
+    "JokestersWit",
+    "MasterOfDisguise",
+    "StatisticalInsight",
+    "SuperStrength",
+    "Teleportation",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module(f".{name}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
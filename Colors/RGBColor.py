@@ -0,0 +1,9 @@
+from Colors import ColorStrategy
+
+# Color given directly as an (r, g, b) tuple, e.g. from the roster manifest
+class RGBColor(ColorStrategy):
+    def __init__(self, color):
+        self.color = tuple(color)
+
+    def get_color(self):
+        return self.color
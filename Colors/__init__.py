@@ -1,10 +1,29 @@
-from .ColorStrategy import ColorStrategy
-from .BlueColor import BlueColor
-from .BrownColor import BrownColor
-from .ElectricBlueColor import ElectricBlueColor
-from .GreenColor import GreenColor
-from .LightBlueColor import LightBlueColor
-from .OrangeColor import OrangeColor
-from .PurpleColor import PurpleColor
-from .RedColor import RedColor
-from .SteelGrayColor import SteelGrayColor
\ No newline at end of file
+import importlib
+
+# Classes are imported from their modules on first access, so using one
+# class doesn't import every module in the package
+__all__ = [
+    "ColorStrategy",
+    "BlueColor",
+    "BrownColor",
+    "ElectricBlueColor",
+    "GreenColor",
+    "LightBlueColor",
+    "OrangeColor",
+    "PurpleColor",
+    "RedColor",
+    "SteelGrayColor",
+    "RGBColor",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module(f".{name}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
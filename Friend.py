@@ -1,15 +1,29 @@
-import pygame
+import random
+
+from asset_manager import load_sprite
 
 class Friend:
-    def __init__(self, name, xy, special_ability, objective_creator, color_strategy, image_string, character_size):
+    __slots__ = ('name', 'health', 'special_ability', 'objectives_list', 'color_strategy', 'image',
+                 'x', 'y', 'spatial_index', 'happiness', 'quest_completed', 'mini_game')
+
+    def __init__(self, name, xy, special_ability, objective_creator, color_strategy, image_string, character_size,
+                 loader=None):
         self.name = name
         self.health = 100
         self.special_ability = special_ability
         self.objectives_list = objective_creator.generate_data()
         self.color_strategy = color_strategy
-        self.image = pygame.transform.scale(pygame.image.load(image_string), character_size)
+        if loader is None:
+            self.image = load_sprite(image_string, character_size)
+        else:
+            # A placeholder in the friend's color until the SpriteLoader delivers
+            self.image = loader.request(image_string, character_size, self.set_image, color_strategy.get_color())
         self.x = xy[0]
         self.y = xy[1]
+        self.spatial_index = None
+        self.happiness = 50
+        self.quest_completed = False
+        self.mini_game = None  # Mini-game type played for this friend's quests
 
     def use_special_ability(self):
         self.special_ability.use_special_ability()
@@ -23,15 +37,25 @@ class Friend:
     def show_objectives(self):
         self.objectives_list.show_objectives()
 
-    def get_random_objective(self):
-        return self.objectives_list.get_random_objective()
+    def get_random_objective(self, rng=random):
+        return self.objectives_list.get_random_objective(rng)
 
     # def get_objectives(self):
 
 
+    def set_spatial_index(self, index):
+        """Register this friend in a SpatialHash that follows its position"""
+        self.spatial_index = index
+        index.insert(self, self.get_rect())
+
     def set_position(self, x, y):
         self.x = x
         self.y = y
+        if self.spatial_index is not None:
+            self.spatial_index.move(self, self.get_rect())
+
+    def set_image(self, image):
+        self.image = image
 
     def get_image(self): 
         return self.image
@@ -0,0 +1,21 @@
+import pygame
+
+from MiniGames.MiniGame import MiniGame
+
+
+class ButtonMash(MiniGame):
+    """Fallback for friends without a dedicated mini-game - mash SPACE"""
+
+    TYPE = 'button_mash'
+    TARGET = 100
+    DURATION = 5.0
+
+    def setup(self, objective):
+        pass
+
+    def handle_key(self, event):
+        if event.key == pygame.K_SPACE:
+            self.progress += 5
+
+    def draw(self, screen):
+        pass
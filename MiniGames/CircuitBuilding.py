@@ -0,0 +1,71 @@
+import pygame
+
+from hit_test import GridLayout
+from MiniGames.MiniGame import MiniGame
+
+
+class Part:
+    __slots__ = ('type', 'x', 'y', 'connected', 'id')
+
+    def __init__(self, part_type, x, y, part_id):
+        self.type = part_type
+        self.x = x
+        self.y = y
+        self.connected = False
+        self.id = part_id
+
+
+class CircuitBuilding(MiniGame):
+    """Alex - Circuit Building - Connect invention parts by clicking them"""
+
+    TYPE = 'circuit_building'
+    INSTRUCTION = "Click parts to connect them and complete the invention!"
+    TARGET = 6  # Connect all 6 parts in order
+    DURATION = 18.0
+    PART_TYPES = ['💡', '🔧', '⚙️', '🔋', '📡', '🖥️']
+    GLYPHS = PART_TYPES
+    LAYOUT = GridLayout(origin=(200, 300), cell_size=(50, 50), pitch=(150, 100), cols=3, rows=2)
+
+    def setup(self, objective):
+        # Create invention parts that need to be connected
+        self.invention_parts = []
+        for i, part_type in enumerate(self.PART_TYPES):
+            self.invention_parts.append(Part(part_type, *self.LAYOUT.position(i), i))
+
+        self.connection_order = list(range(len(self.PART_TYPES)))
+        self.rng.shuffle(self.connection_order)
+        self.current_connection = 0
+
+    def handle_click(self, pos):
+        index = self.LAYOUT.index_at(pos)
+        if index is None:
+            return
+        part = self.invention_parts[index]
+        if not part.connected:
+            expected_id = self.connection_order[self.current_connection]
+            if part.id == expected_id:
+                part.connected = True
+                self.current_connection += 1
+                self.progress += 1
+            else:
+                # Wrong part, reset
+                for p in self.invention_parts:
+                    p.connected = False
+                self.current_connection = 0
+                self.progress = 0
+
+    def draw(self, screen):
+        game = self.game
+        for part in self.invention_parts:
+            part_color = game.GREEN if part.connected else game.LIGHT_GRAY
+            pygame.draw.rect(screen, part_color, (part.x, part.y, 50, 50))
+            pygame.draw.rect(screen, game.BLACK, (part.x, part.y, 50, 50), 2)
+        # The boxes don't overlap, so their symbols go in one batch
+        self.blit_texts(screen, game.font, [(part.type, (part.x + 25, part.y + 25)) for part in self.invention_parts],
+                        game.BLACK)
+
+        # Show connection order
+        if self.current_connection < len(self.connection_order):
+            next_part_id = self.connection_order[self.current_connection]
+            order_text = f"Connect: {self.invention_parts[next_part_id].type}"
+            self.blit_text(screen, game.small_font, order_text, game.BLACK, topleft=(50, 450))
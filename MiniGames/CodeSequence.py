@@ -0,0 +1,86 @@
+import pygame
+
+from MiniGames.MiniGame import MiniGame
+
+
+class CodeEntry:
+    __slots__ = ('sequence', 'current_input', 'completed')
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.current_input = []
+        self.completed = False
+
+
+class CodeSequence(MiniGame):
+    """Suen - Code Sequence - Enter the correct arrow key sequences"""
+
+    TYPE = 'code_sequence'
+    INSTRUCTION = "Enter the arrow key sequences shown! ↑↓←→"
+    TARGET = 5  # Complete all 5 sequences
+    DURATION = 25.0
+    DISPLAY_TIME = 3.0  # Show each sequence for 3 seconds
+    ARROW_KEYS = ['UP', 'DOWN', 'LEFT', 'RIGHT']
+    KEY_MAP = {
+        pygame.K_UP: 'UP',
+        pygame.K_DOWN: 'DOWN',
+        pygame.K_LEFT: 'LEFT',
+        pygame.K_RIGHT: 'RIGHT'
+    }
+    ARROW_SYMBOLS = {'UP': '↑', 'DOWN': '↓', 'LEFT': '←', 'RIGHT': '→'}
+
+    def setup(self, objective):
+        # Create code sequences using arrow keys
+        self.code_sequences = []
+        for _ in range(5):
+            sequence = [self.rng.choice(self.ARROW_KEYS) for _ in range(4)]
+            self.code_sequences.append(CodeEntry(sequence))
+
+        self.current_sequence_index = 0
+        self.show_sequence()
+
+    def show_sequence(self):
+        """Show the current sequence, then switch to input after DISPLAY_TIME"""
+        self.showing_sequence = True
+        self.scheduler.call_later(self.DISPLAY_TIME, self.hide_sequence)
+
+    def hide_sequence(self):
+        self.showing_sequence = False
+
+    def handle_key(self, event):
+        if self.showing_sequence or self.current_sequence_index >= len(self.code_sequences):
+            return
+        if event.key not in self.KEY_MAP:
+            return
+
+        current_seq = self.code_sequences[self.current_sequence_index]
+        current_seq.current_input.append(self.KEY_MAP[event.key])
+
+        # Check if sequence is correct so far
+        if current_seq.current_input[-1] == current_seq.sequence[len(current_seq.current_input)-1]:
+            if len(current_seq.current_input) == len(current_seq.sequence):
+                # Sequence complete!
+                current_seq.completed = True
+                self.progress += 1
+                self.current_sequence_index += 1
+                self.show_sequence()
+        else:
+            # Wrong! Reset
+            current_seq.current_input = []
+
+    def arrows(self, keys):
+        return " ".join(self.ARROW_SYMBOLS[key] for key in keys)
+
+    def draw(self, screen):
+        game = self.game
+        if self.current_sequence_index < len(self.code_sequences):
+            current_seq = self.code_sequences[self.current_sequence_index]
+
+            if self.showing_sequence:
+                # Show the sequence to memorize
+                sequence_text = "Memorize: " + self.arrows(current_seq.sequence)
+                self.blit_text(screen, game.font, sequence_text, game.BLACK, center=(game.WIDTH//2, 350))
+            else:
+                # Show input prompt
+                input_text = "Enter sequence: " + self.arrows(current_seq.current_input)
+                self.blit_text(screen, game.font, input_text, game.BLUE, center=(game.WIDTH//2, 350))
@@ -0,0 +1,65 @@
+import pygame
+
+from entity_store import EntityStore
+from hit_test import circle_hits
+from MiniGames.MiniGame import MiniGame
+
+
+class CowFeeding(MiniGame):
+    """Roel - Cow Feeding - Move mouse to feed the cows"""
+
+    TYPE = 'cow_feeding'
+    INSTRUCTION = "Move your mouse near the cows to feed them!"
+    TARGET = 5  # Feed all 5 cows to happiness > 90
+    DURATION = 15.0
+    COW_COUNT = 5
+    COW = '🐄'
+    GLYPHS = (COW,)
+
+    def setup(self, objective):
+        # Create cow positions and happiness levels
+        rng = self.rng
+        count = self.COW_COUNT
+        self.cows = EntityStore(x='i', y='i', happiness='b', fed='B')
+        self.cows.extend(x=rng.randints(count, 100, self.game.WIDTH - 100),
+                         y=rng.randints(count, 300, 500),
+                         happiness=rng.randints(count, 30, 70))
+
+        self.feed_radius = 80
+
+    def cows_in_reach(self):
+        """Indices of the hungry cows close enough to the mouse to be fed"""
+        cows = self.cows
+        return circle_hits(cows.x, cows.y, self.game.mouse_pos, self.feed_radius, skip=cows.fed)
+
+    def update(self, dt):
+        super().update(dt)
+        # Update cow feeding with mouse proximity
+        happiness, fed = self.cows.happiness, self.cows.fed
+        for i in self.cows_in_reach():
+            happiness[i] = min(100, happiness[i] + 1)
+            if happiness[i] >= 90:
+                fed[i] = 1
+                self.progress += 1
+
+    def draw(self, screen):
+        game = self.game
+        cows = self.cows
+        in_reach = set(self.cows_in_reach())
+        # All cows in one batch, then their bars and feeding radius on top
+        self.blit_texts(screen, game.font, [(self.COW, (cows.x[i], cows.y[i])) for i in range(len(cows))], game.BLACK)
+        for i in range(len(cows)):
+            x, y = cows.x[i], cows.y[i]
+            # Happiness bar
+            bar_width = 60
+            bar_height = 8
+            bar_x = x - bar_width // 2
+            bar_y = y - 40
+
+            pygame.draw.rect(screen, game.RED, (bar_x, bar_y, bar_width, bar_height))
+            pygame.draw.rect(screen, game.GREEN, (bar_x, bar_y,
+                             int(bar_width * cows.happiness[i] / 100), bar_height))
+
+            # Feeding radius
+            if i in in_reach:
+                pygame.draw.circle(screen, (0, 255, 0, 50), (x, y), self.feed_radius, 2)
@@ -0,0 +1,85 @@
+from functools import partial
+
+import pygame
+
+from hit_test import GridLayout
+from MiniGames.MiniGame import MiniGame
+
+
+class Card:
+    __slots__ = ('symbol', 'revealed', 'matched', 'x', 'y')
+
+    def __init__(self, symbol, x, y):
+        self.symbol = symbol
+        self.revealed = False
+        self.matched = False
+        self.x = x
+        self.y = y
+
+
+class MemoryCards(MiniGame):
+    """Jordy - Memory Card Matching - Find matching clue pairs"""
+
+    TYPE = 'memory_cards'
+    INSTRUCTION = "Click cards to find matching clue pairs!"
+    TARGET = 8  # Match all 8 pairs
+    DURATION = 20.0
+    CLUE_SYMBOLS = ['🔍', '🗝️', '📄', '👤', '🎭', '🚗', '💎', '🔮']
+    GLYPHS = CLUE_SYMBOLS
+    HIDE_DELAY = 1.0  # seconds a mismatched pair stays face up
+    LAYOUT = GridLayout(origin=(300, 250), cell_size=(60, 60), pitch=(70, 70), cols=4, rows=4)
+
+    def setup(self, objective):
+        # Create memory card grid (4x4)
+        all_cards = self.CLUE_SYMBOLS + self.CLUE_SYMBOLS  # Pairs
+        self.rng.shuffle(all_cards)
+
+        # Cards in row-major order, so a card's index is its cell in LAYOUT
+        self.cards = [Card(symbol, *self.LAYOUT.position(i)) for i, symbol in enumerate(all_cards)]
+
+        self.revealed_cards = []
+
+    def handle_click(self, pos):
+        index = self.LAYOUT.index_at(pos)
+        if index is None:
+            return
+        card = self.cards[index]
+        if not card.revealed and not card.matched:
+            card.revealed = True
+            self.revealed_cards.append(card)
+
+            if len(self.revealed_cards) == 2:
+                # Check for match
+                if (self.revealed_cards[0].symbol ==
+                    self.revealed_cards[1].symbol):
+                    # Match found!
+                    for revealed_card in self.revealed_cards:
+                        revealed_card.matched = True
+                    self.progress += 1
+                else:
+                    # No match, hide cards after delay
+                    # A partial rather than a lambda, so the timer can be pickled in save states
+                    self.scheduler.call_later(self.HIDE_DELAY, partial(self.hide_cards, self.revealed_cards))
+                self.revealed_cards = []
+
+    def hide_cards(self, cards):
+        for card in cards:
+            card.revealed = False
+
+    def draw(self, screen):
+        game = self.game
+        symbols = []
+        for card in self.cards:
+            # Card background
+            card_color = game.GREEN if card.matched else game.LIGHT_GRAY
+            pygame.draw.rect(screen, card_color, (card.x, card.y, 60, 60))
+            pygame.draw.rect(screen, game.BLACK, (card.x, card.y, 60, 60), 2)
+
+            # Card content
+            if card.revealed or card.matched:
+                symbols.append((card.symbol, (card.x + 30, card.y + 30)))
+            else:
+                # Hidden card
+                pygame.draw.rect(screen, game.GRAY, (card.x + 5, card.y + 5, 50, 50))
+        # Cards don't overlap, so their symbols can all be blitted afterwards
+        self.blit_texts(screen, game.font, symbols, game.BLACK)
@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+
+import pygame
+
+from observable import Observable, observed
+from scheduler import Scheduler
+
+
+class MiniGame(Observable, ABC):
+    """A quest mini-game: owns its own state, input handling and drawing"""
+
+    TYPE = None
+    INSTRUCTION = "Press SPACE to help!"
+    TARGET = 100
+    DURATION = 5.0  # seconds
+    SUCCESS_THRESHOLD = 0.7  # share of the target needed to complete the quest
+    AMBIENT_PROGRESS_CHANCE = 0.02  # per simulation step
+    GLYPHS = ()  # symbols drawn with game.font, pre-rendered into the texture atlas (see atlas.py)
+
+    progress = observed()  # drives the progress bar and count on the HUD
+
+    def __init__(self, game, rng):
+        self.game = game
+        self.rng = rng  # this mini-game's RandomStream
+        self.instruction = self.INSTRUCTION
+        self.progress = 0
+        self.target = self.TARGET
+        self.time = 0
+        self.duration = self.DURATION
+        # Delayed actions of this mini-game, on its own clock
+        self.scheduler = Scheduler()
+
+    @abstractmethod
+    def setup(self, objective):
+        pass
+
+    def update(self, dt):
+        self.time += dt
+        # Every mini-game occasionally advances on its own
+        if self.rng.random() < self.AMBIENT_PROGRESS_CHANCE:
+            self.progress += 1
+        self.scheduler.advance(dt)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.handle_key(event)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.handle_click(event.pos)
+
+    def handle_key(self, event):
+        pass
+
+    def handle_click(self, pos):
+        pass
+
+    @abstractmethod
+    def draw(self, screen):
+        pass
+
+    def outcome(self):
+        """'complete' once time is up or the target is reached, 'fail' if progress went negative"""
+        if self.time >= self.duration or self.progress >= self.target:
+            return 'complete'
+        if self.progress < 0:
+            return 'fail'
+        return None
+
+    def __getstate__(self):
+        # Save states pickle the mini-game without its game and HUD observers;
+        # savestate.py re-attaches the game on restore
+        state = self.__dict__.copy()
+        del state['game']
+        state.pop('_observers', None)
+        return state
+
+    def time_left(self):
+        return max(0, self.duration - self.time)
+
+    def is_success(self):
+        return self.progress >= self.target * self.SUCCESS_THRESHOLD
+
+    def blit_text(self, screen, font, text, color, **position):
+        """Blit cached text positioned like Rect attributes, e.g. center=(x, y)"""
+        surface = self.game.text_cache.render(font, text, True, color)
+        screen.blit(surface, surface.get_rect(**position))
+
+    def blit_texts(self, screen, font, texts, color, anchor="center"):
+        """Blit (text, position) pairs of cached text with a single Surface.blits() call"""
+        render = self.game.text_cache.render
+        batch = []
+        for text, position in texts:
+            surface = render(font, text, True, color)
+            batch.append((surface, surface.get_rect(**{anchor: position})))
+        screen.blits(batch, doreturn=False)
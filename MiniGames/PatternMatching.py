@@ -0,0 +1,56 @@
+import pygame
+
+from MiniGames.MiniGame import MiniGame
+
+
+class PatternMatching(MiniGame):
+    """Mika - Pattern Matching - Match the statistical patterns"""
+
+    TYPE = 'pattern_matching'
+    INSTRUCTION = "Match the statistical pattern! Press 1-4 keys to match the sequence!"
+    TARGET = 5  # Complete 5 patterns
+    DURATION = 15.0
+    NUMBER_KEYS = (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4)
+
+    def setup(self, objective):
+        self.stats_pattern = self.new_pattern()
+        self.player_pattern = []
+        self.correct_answers = 0
+
+    def new_pattern(self):
+        return self.rng.randints(6, 1, 4)
+
+    def handle_key(self, event):
+        if event.key not in self.NUMBER_KEYS:
+            return
+        self.player_pattern.append(event.key - pygame.K_0)
+
+        # Check if pattern matches so far
+        if self.player_pattern[-1] == self.stats_pattern[len(self.player_pattern) - 1]:
+            if len(self.player_pattern) == len(self.stats_pattern):
+                # Pattern complete!
+                self.progress += 1
+                self.correct_answers += 1
+                self.stats_pattern = self.new_pattern()
+                self.player_pattern = []
+        else:
+            # Wrong! Reset
+            self.player_pattern = []
+
+    def draw(self, screen):
+        game = self.game
+        # Draw the pattern to match
+        pattern_text = "Pattern: " + " ".join([str(x) for x in self.stats_pattern])
+        self.blit_text(screen, game.small_font, pattern_text, game.BLACK, topleft=(50, 450))
+
+        # Draw player's current input
+        input_text = "Input: " + " ".join([str(x) for x in self.player_pattern])
+        self.blit_text(screen, game.small_font, input_text, game.BLUE, topleft=(50, 480))
+
+        # Draw number buttons
+        for i in range(1, 5):
+            button_x = 300 + i * 80
+            button_y = 350
+            pygame.draw.rect(screen, game.LIGHT_GRAY, (button_x, button_y, 60, 60))
+            pygame.draw.rect(screen, game.BLACK, (button_x, button_y, 60, 60), 2)
+            self.blit_text(screen, game.font, str(i), game.BLACK, center=(button_x + 30, button_y + 30))
@@ -0,0 +1,45 @@
+import pygame
+
+from entity_store import EntityStore
+from hit_test import circle_hits
+from MiniGames.MiniGame import MiniGame
+
+
+class PlantCollection(MiniGame):
+    """Phrits - Plant Collection - Click on plants to collect them"""
+
+    TYPE = 'plant_collection'
+    INSTRUCTION = "Click on the rare plants to collect them!"
+    TARGET = 6  # Collect 6 plants
+    DURATION = 10.0
+    PLANT_COUNT = 8
+    CLICK_RADIUS = 30
+    PLANT_TYPES = ['🌿', '🍄', '🌺', '🌻', '🌱']
+    GLYPHS = PLANT_TYPES
+
+    def setup(self, objective):
+        # Create random plant positions; `kind` indexes PLANT_TYPES
+        rng = self.rng
+        count = self.PLANT_COUNT
+        self.plants = EntityStore(x='i', y='i', kind='B', collected='B')
+        self.plants.extend(x=rng.randints(count, 100, self.game.WIDTH - 100),
+                           y=rng.randints(count, 200, 500),
+                           kind=rng.randints(count, 0, len(self.PLANT_TYPES) - 1))
+        self.specimens_found = 0
+
+    def handle_click(self, pos):
+        plants = self.plants
+        for i in circle_hits(plants.x, plants.y, pos, self.CLICK_RADIUS, skip=plants.collected):
+            plants.collected[i] = 1
+            self.progress += 1
+            self.specimens_found += 1
+
+    def draw(self, screen):
+        game = self.game
+        plants = self.plants
+        remaining = [i for i in range(len(plants)) if not plants.collected[i]]
+        # Plants in one batch, then their collection circles
+        self.blit_texts(screen, game.font, [(self.PLANT_TYPES[plants.kind[i]], (plants.x[i], plants.y[i]))
+                                            for i in remaining], game.BLACK)
+        for i in remaining:
+            pygame.draw.circle(screen, game.GREEN, (plants.x[i], plants.y[i]), 25, 2)
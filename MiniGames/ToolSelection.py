@@ -0,0 +1,77 @@
+import pygame
+
+from hit_test import GridLayout
+from MiniGames.MiniGame import MiniGame
+
+
+class BrokenPart:
+    __slots__ = ('part', 'tool', 'x', 'y', 'fixed')
+
+    def __init__(self, part, tool, x, y):
+        self.part = part
+        self.tool = tool
+        self.x = x
+        self.y = y
+        self.fixed = False
+
+
+class ToolSelection(MiniGame):
+    """Rick - Tool Selection - Choose the right tools for broken parts"""
+
+    TYPE = 'tool_selection'
+    INSTRUCTION = "Click the right tool for each broken part!"
+    TARGET = 4  # Fix all 4 parts
+    DURATION = 15.0
+    TOOL_LAYOUT = GridLayout(origin=(200, 450), cell_size=(60, 60), pitch=(80, 60), cols=6, rows=1)
+    PART_LAYOUT = GridLayout(origin=(200, 300), cell_size=(60, 60), pitch=(150, 60), cols=4, rows=1)
+    # Broken part and the tool that fixes it
+    REPAIRS = [('🔩', '🔧'), ('⚡', '🪛'), ('🔌', '✂️'), ('⚙️', '🔨')]
+    TOOLS = ['🔧', '🪛', '✂️', '🔨', '📏', '🪚']
+    GLYPHS = [part for part, _ in REPAIRS] + TOOLS
+
+    def setup(self, objective):
+        # Create broken parts and corresponding tools
+        self.broken_parts = [BrokenPart(part, tool, *self.PART_LAYOUT.position(i))
+                             for i, (part, tool) in enumerate(self.REPAIRS)]
+
+        self.available_tools = list(self.TOOLS)
+        self.rng.shuffle(self.available_tools)
+        self.selected_tool = None
+
+    def handle_click(self, pos):
+        # First check if clicking a tool
+        index = self.TOOL_LAYOUT.index_at(pos)
+        if index is not None and index < len(self.available_tools):
+            self.selected_tool = self.available_tools[index]
+            return
+
+        # Then check if clicking a broken part with selected tool
+        index = self.PART_LAYOUT.index_at(pos)
+        if self.selected_tool and index is not None:
+            part = self.broken_parts[index]
+            if not part.fixed:
+                if self.selected_tool == part.tool:
+                    part.fixed = True
+                    self.progress += 1
+                # Right tool or wrong, it is used up
+                self.selected_tool = None
+
+    def draw(self, screen):
+        game = self.game
+        # Symbols are blitted in one batch after the boxes, which don't overlap
+        symbols = []
+        # Draw available tools
+        for i, tool in enumerate(self.available_tools):
+            tool_x, tool_y = self.TOOL_LAYOUT.position(i)
+            tool_color = game.BLUE if self.selected_tool == tool else game.LIGHT_GRAY
+            pygame.draw.rect(screen, tool_color, (tool_x, tool_y, 60, 60))
+            pygame.draw.rect(screen, game.BLACK, (tool_x, tool_y, 60, 60), 2)
+            symbols.append((tool, (tool_x + 30, tool_y + 30)))
+
+        # Draw broken parts
+        for part in self.broken_parts:
+            part_color = game.GREEN if part.fixed else game.RED
+            pygame.draw.rect(screen, part_color, (part.x, part.y, 60, 60))
+            pygame.draw.rect(screen, game.BLACK, (part.x, part.y, 60, 60), 2)
+            symbols.append((part.part, (part.x + 30, part.y + 30)))
+        self.blit_texts(screen, game.font, symbols, game.BLACK)
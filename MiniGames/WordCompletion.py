@@ -0,0 +1,50 @@
+import pygame
+
+from MiniGames.MiniGame import MiniGame
+
+
+class WordCompletion(MiniGame):
+    """Casper - Word Completion - Complete the jokes by typing missing words"""
+
+    TYPE = 'word_completion'
+    INSTRUCTION = "Type the missing word to complete the joke!"
+    TARGET = 3  # Complete 3 jokes
+    DURATION = 20.0
+
+    # Joke templates with missing words
+    JOKE_TEMPLATES = [
+        ("Why don't scientists trust atoms? Because they make up everything and they're always ___!", "lying"),
+        ("What do you call a fake noodle? An ___!", "impasta"),
+        ("Why did the scarecrow win an award? He was outstanding in his ___!", "field"),
+        ("What do you call a bear with no teeth? A ___ bear!", "gummy"),
+        ("Why don't eggs tell jokes? They'd ___!", "crack"),
+    ]
+
+    def setup(self, objective):
+        self.joke_templates = list(self.JOKE_TEMPLATES)
+        self.current_joke_index = 0
+        self.typed_answer = ""
+
+    def handle_key(self, event):
+        if event.unicode.isalpha():
+            self.typed_answer += event.unicode.lower()
+        elif event.key == pygame.K_BACKSPACE:
+            self.typed_answer = self.typed_answer[:-1]
+        elif event.key == pygame.K_RETURN:
+            # Check answer
+            if self.current_joke_index < len(self.joke_templates):
+                correct_answer = self.joke_templates[self.current_joke_index][1].lower()
+                if self.typed_answer.lower() == correct_answer:
+                    self.progress += 1
+                    self.current_joke_index += 1
+                self.typed_answer = ""
+
+    def draw(self, screen):
+        game = self.game
+        if self.current_joke_index < len(self.joke_templates):
+            joke, answer = self.joke_templates[self.current_joke_index]
+            self.blit_text(screen, game.small_font, joke, game.BLACK, center=(game.WIDTH//2, 350))
+
+            # Draw typed answer
+            answer_text = f"Your answer: {self.typed_answer}"
+            self.blit_text(screen, game.small_font, answer_text, game.BLUE, center=(game.WIDTH//2, 400))
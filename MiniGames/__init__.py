@@ -0,0 +1,36 @@
+import importlib
+
+# Mini-game classes by type. Modules are imported on first use, so only the
+# mini-games that are actually played get loaded
+MINI_GAME_TYPES = {
+    'button_mash': 'ButtonMash',
+    'plant_collection': 'PlantCollection',
+    'pattern_matching': 'PatternMatching',
+    'memory_cards': 'MemoryCards',
+    'word_completion': 'WordCompletion',
+    'cow_feeding': 'CowFeeding',
+    'circuit_building': 'CircuitBuilding',
+    'tool_selection': 'ToolSelection',
+    'code_sequence': 'CodeSequence',
+}
+DEFAULT_MINI_GAME = 'button_mash'
+
+__all__ = ["MiniGame", "create_mini_game", *MINI_GAME_TYPES.values()]
+
+
+def create_mini_game(mini_game_type, game, rng):
+    """Create the mini-game registered for a type, falling back to button mashing"""
+    class_name = MINI_GAME_TYPES.get(mini_game_type, MINI_GAME_TYPES[DEFAULT_MINI_GAME])
+    return __getattr__(class_name)(game, rng)
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module(f".{name}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,7 @@
 
 
 class Objective:
+  __slots__ = ("description",)
 
   def __init__(self, description):
     self.description = description
@@ -0,0 +1,11 @@
+from Objectives import ObjectivesCreator
+from Objectives import ObjectivesList
+
+# Objectives read from the roster manifest instead of a per-friend module
+class ObjectivesCreatorManifest(ObjectivesCreator):
+    def __init__(self, title, descriptions):
+        self.title = title
+        self.descriptions = descriptions
+
+    def generate_data(self):
+        return ObjectivesList(self.title, self.descriptions)
@@ -20,8 +20,8 @@ class ObjectivesList:
     def get_objectives(self):
         return self.objectives
     
-    def get_random_objective(self):
-        return self.objectives[random.randint(0, len(self.objectives) - 1)]
+    def get_random_objective(self, rng=random):
+        return self.objectives[rng.randint(0, len(self.objectives) - 1)]
 
     def add_objective(self, description):
         self.objectives.append(Objective(description))
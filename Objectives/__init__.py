@@ -1,11 +1,30 @@
-from .Objective import Objective
-from .ObjectivesList import ObjectivesList
-from .ObjectivesCreator import ObjectivesCreator
-from .ObjectivesCreatorPhrits import ObjectivesCreatorPhrits
-from .ObjectivesCreatorMika import ObjectivesCreatorMika
-from .ObjectivesCreatorJordy import ObjectivesCreatorJordy
-from .ObjectivesCreatorCasper import ObjectivesCreatorCasper
-from .ObjectivesCreatorRoel import ObjectivesCreatorRoel
-from .ObjectivesCreatorAlex import ObjectivesCreatorAlex
-from .ObjectivesCreatorRick import ObjectivesCreatorRick
-from .ObjectivesCreatorSuen import ObjectivesCreatorSuen
\ No newline at end of file
+import importlib
+
+# Classes are imported from their modules on first access, so using one
+# class doesn't import every module in the package
+__all__ = [
+    "Objective",
+    "ObjectivesList",
+    "ObjectivesCreator",
+    "ObjectivesCreatorPhrits",
+    "ObjectivesCreatorMika",
+    "ObjectivesCreatorJordy",
+    "ObjectivesCreatorCasper",
+    "ObjectivesCreatorRoel",
+    "ObjectivesCreatorAlex",
+    "ObjectivesCreatorRick",
+    "ObjectivesCreatorSuen",
+    "ObjectivesCreatorManifest",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module(f".{name}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,225 @@
+"""
+Sprite asset pipeline.
+
+Every sprite is decoded and scaled once per process and kept in a cache keyed
+by (path, size). The scaled pixels can optionally be written to an on-disk
+cache so the next start skips PNG decoding and resampling altogether; cache
+entries are invalidated when the source image's mtime changes.
+
+SpriteLoader decodes and scales sprites on a thread pool instead, handing out
+placeholder surfaces until they arrive, so the window can show a loading
+screen and stay responsive while the game starts.
+"""
+
+import os
+import struct
+
+import pygame
+
+DISK_CACHE_MAGIC = b"IYKS"
+DISK_CACHE_VERSION = 1
+# magic, version, source mtime (ns), width, height
+DISK_CACHE_HEADER = struct.Struct("<4sHqHH")
+
+
+# pygame < 2.1.3 only has the older tostring() spelling
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+
+def _display_ready():
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+class AssetManager:
+    def __init__(self, disk_cache_dir=None):
+        self.disk_cache_dir = disk_cache_dir
+        self.sprites = {}
+        self.unconverted = set()
+
+    def load_sprite(self, path, size):
+        """Return the sprite at `path` scaled to `size`, loading it at most once"""
+        size = tuple(size)
+        key = (path, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.store(key, self.decode(path, size))
+        elif key in self.unconverted and _display_ready():
+            # Surfaces loaded before a display existed (e.g. headless) can't be
+            # converted yet; do it as soon as a display mode is set
+            self.sprites[key] = sprite = self._convert(key, sprite)
+        return sprite
+
+    def decode(self, path, size):
+        """Read and scale a sprite without converting it; safe to call from worker threads"""
+        sprite = self._read_disk_cache(path, size)
+        if sprite is None:
+            sprite = pygame.transform.scale(pygame.image.load(path), size)
+            self._write_disk_cache(path, sprite)
+        return sprite
+
+    def store(self, key, surface):
+        """Convert a decoded sprite for the display and cache it; main thread only"""
+        self.sprites[key] = sprite = self._convert(key, surface)
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+        self.unconverted.clear()
+
+    def _convert(self, key, surface):
+        if _display_ready():
+            self.unconverted.discard(key)
+            return surface.convert_alpha()
+        self.unconverted.add(key)
+        return surface.copy()
+
+    def _cache_path(self, path, size):
+        import hashlib  # only needed when the disk cache is enabled
+
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.disk_cache_dir, f"{digest}_{size[0]}x{size[1]}.sprite")
+
+    def _read_disk_cache(self, path, size):
+        if not self.disk_cache_dir:
+            return None
+        try:
+            source_mtime = os.stat(path).st_mtime_ns
+            with open(self._cache_path(path, size), "rb") as cache_file:
+                data = cache_file.read()
+        except OSError:
+            return None
+
+        if len(data) < DISK_CACHE_HEADER.size:
+            return None
+        magic, version, mtime, width, height = DISK_CACHE_HEADER.unpack_from(data)
+        if (magic != DISK_CACHE_MAGIC or version != DISK_CACHE_VERSION
+                or mtime != source_mtime or (width, height) != size):
+            return None
+        pixels = data[DISK_CACHE_HEADER.size:]
+        if len(pixels) != width * height * 4:
+            return None
+        return pygame.image.frombuffer(pixels, size, "RGBA")
+
+    def _write_disk_cache(self, path, sprite):
+        if not self.disk_cache_dir:
+            return
+        size = sprite.get_size()
+        try:
+            os.makedirs(self.disk_cache_dir, exist_ok=True)
+            header = DISK_CACHE_HEADER.pack(DISK_CACHE_MAGIC, DISK_CACHE_VERSION,
+                                            os.stat(path).st_mtime_ns, *size)
+            pixels = _tobytes(sprite, "RGBA")
+            # Write to a temp file first so a crash never leaves a torn entry
+            cache_path = self._cache_path(path, size)
+            with open(cache_path + ".tmp", "wb") as cache_file:
+                cache_file.write(header + pixels)
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError:
+            # The disk cache is only an optimisation
+            pass
+
+
+_placeholders = {}
+
+
+def placeholder_sprite(size, color):
+    """Plain surface shown in place of a sprite that is still loading (or failed to load)"""
+    key = (tuple(size), tuple(color))
+    surface = _placeholders.get(key)
+    if surface is None:
+        surface = _placeholders[key] = pygame.Surface(size)
+        surface.fill(color)
+    return surface
+
+
+class SpriteLoader:
+    """Loads sprites for an AssetManager on a thread pool
+
+    request() returns cached sprites right away and a placeholder for anything
+    else. Workers only decode and scale; poll(), called on the main thread,
+    converts the finished sprites for the display (pygame surfaces must not be
+    converted off the main thread) and passes them to their callbacks.
+    """
+
+    def __init__(self, manager, max_workers=None):
+        self.manager = manager
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.executor = None
+        self.pending = {}  # (path, size) -> (future, callbacks)
+        self.requested = 0
+        self.loaded = 0
+        self.failed = []  # (path, exception)
+
+    def request(self, path, size, on_loaded, placeholder_color=(0, 0, 255)):
+        """The sprite if it is cached, else a placeholder; `on_loaded(sprite)` follows from poll()"""
+        size = tuple(size)
+        key = (path, size)
+        if key in self.manager.sprites:
+            return self.manager.load_sprite(path, size)
+        entry = self.pending.get(key)
+        if entry is None:
+            if self.executor is None:
+                from concurrent.futures import ThreadPoolExecutor  # only needed once something loads in the background
+
+                self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="sprite-loader")
+            entry = self.pending[key] = (self.executor.submit(self.manager.decode, path, size), [])
+            self.requested += 1
+        entry[1].append(on_loaded)
+        return placeholder_sprite(size, placeholder_color)
+
+    @property
+    def progress(self):
+        """Fraction of the requested sprites that have been loaded"""
+        return self.loaded / self.requested if self.requested else 1.0
+
+    def poll(self):
+        """Hand finished sprites to their callbacks; returns whether any finished"""
+        finished = [key for key, (future, _) in self.pending.items() if future.done()]
+        for key in finished:
+            future, callbacks = self.pending.pop(key)
+            self.loaded += 1
+            try:
+                sprite = self.manager.store(key, future.result())
+            except (OSError, pygame.error) as error:
+                # Whoever asked keeps the placeholder
+                self.failed.append((key[0], error))
+                continue
+            for callback in callbacks:
+                callback(sprite)
+        return bool(finished)
+
+    def wait(self):
+        """Block until every requested sprite has been handed out"""
+        from concurrent.futures import wait
+
+        wait([future for future, _ in self.pending.values()])
+        self.poll()
+
+
+# Process-wide asset manager shared by every game instance
+assets = AssetManager(disk_cache_dir=os.environ.get("IYKWIM_SPRITE_CACHE"))
+sprite_loader = SpriteLoader(assets)
+
+ATLAS_INDEX = os.environ.get("IYKWIM_ATLAS", os.path.join("resources", "atlas", "atlas.json"))
+_atlas = None
+
+
+def shared_atlas():
+    """The texture atlas built by atlas.py, loaded once with its sprites put in the cache; None without one"""
+    global _atlas
+    if _atlas is None:
+        _atlas = False
+        if os.path.exists(ATLAS_INDEX):
+            from atlas import Atlas
+
+            try:
+                _atlas = Atlas.load(ATLAS_INDEX)
+            except (OSError, ValueError, KeyError, pygame.error) as error:
+                print(f"⚠️ Could not load the texture atlas {ATLAS_INDEX} ({error}), loading sprites one by one")
+            else:
+                assets.sprites.update(_atlas.sprites)
+    return _atlas or None
+
+
+def load_sprite(path, size):
+    return assets.load_sprite(path, size)
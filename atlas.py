@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Texture atlas for the character sprites and mini-game glyphs.
+
+The builder runs offline. It scales every character sprite in the roster to its
+in-game size, renders every mini-game glyph (MiniGame.GLYPHS) the way the
+mini-games draw it, and shelf-packs them all into one or a few atlas pages. The
+pages are saved as PNGs next to a JSON index of each image's page and pixel
+rect.
+
+At runtime Atlas.load() reads the index and the pages, converting each page
+once, and hands out subsurfaces of the pages. The game then loads one image at
+startup instead of nine PNGs, never renders those glyphs, and blits from a few
+shared surfaces. Sprites whose source PNG changed since the build, and glyphs
+rendered by a different pygame version, are left out, and the game falls back
+to loading or rendering them itself.
+
+Build the atlas (the game picks it up from IYKWIM_ATLAS, by default
+resources/atlas/atlas.json):
+
+    python atlas.py [--output resources/atlas] [--page-size 1024] [--padding 2]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+ATLAS_VERSION = 1
+INDEX_NAME = "atlas.json"
+# Mini-games draw their glyphs with game.font in game.BLACK
+GLYPH_FONT_SIZE = 36
+GLYPH_COLOR = (0, 0, 0)
+
+
+def shelf_pack(sizes, page_size, padding=0):
+    """Place rectangles on shelves, tallest first
+
+    Returns (placements, page count), with a (page, x, y) placement for each
+    size in input order.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    page = x = y = shelf_height = 0
+    for i in order:
+        width, height = sizes[i]
+        if width > page_size or height > page_size:
+            raise ValueError(f"A {width}x{height} image does not fit on a {page_size}px atlas page")
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height + padding, 0
+        if y + height > page_size:
+            page, x, y, shelf_height = page + 1, 0, 0, 0
+        placements[i] = (page, x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    return placements, page + 1 if sizes else 0
+
+
+def atlas_images():
+    """(kind, key, surface) for every image that goes into the atlas
+
+    Sprites are keyed like the AssetManager cache, glyphs by (font size, text,
+    color).
+    """
+    from asset_manager import AssetManager
+    from MiniGames import MINI_GAME_TYPES
+    import MiniGames
+    from roster import load_roster
+    from text_cache import shared_font
+
+    character_size = (64, 128)  # QuestGame.character_size
+    roster = load_roster()
+    paths = [f"resources/cutout/{roster.player_image}"]
+    paths += sorted({f"resources/cutout/{entry.image}" for entry in roster.friends})
+    decoder = AssetManager()  # no disk cache: always scale from the source
+    images = [("sprite", (path, character_size), decoder.decode(path, character_size)) for path in paths]
+
+    pygame.font.init()
+    font = shared_font(GLYPH_FONT_SIZE)
+    glyphs = set()
+    for class_name in MINI_GAME_TYPES.values():
+        glyphs.update(getattr(MiniGames, class_name).GLYPHS)
+    images += [("glyph", (GLYPH_FONT_SIZE, text, GLYPH_COLOR), font.render(text, True, GLYPH_COLOR))
+               for text in sorted(glyphs)]
+    return images
+
+
+def build_atlas(output_dir, page_size=1024, padding=2):
+    """Pack every atlas image into pages under `output_dir`; returns the index"""
+    images = atlas_images()
+    placements, page_count = shelf_pack([surface.get_size() for _, _, surface in images], page_size, padding)
+
+    # Trim each page to the area in use
+    extents = [[0, 0] for _ in range(page_count)]
+    for (_, _, surface), (page, x, y) in zip(images, placements):
+        extents[page][0] = max(extents[page][0], x + surface.get_width())
+        extents[page][1] = max(extents[page][1], y + surface.get_height())
+    pages = [pygame.Surface(extent, pygame.SRCALPHA) for extent in extents]
+
+    index = {"version": ATLAS_VERSION, "pygame": pygame.version.ver, "pages": [], "sprites": [], "glyphs": []}
+    for (kind, key, surface), (page, x, y) in zip(images, placements):
+        # Copy the pixels as they are: blending onto the transparent page
+        # would change partly transparent edges
+        pages[page].blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        rect = [x, y, *surface.get_size()]
+        if kind == "sprite":
+            path, size = key
+            index["sprites"].append({"path": path, "size": list(size), "mtime": os.stat(path).st_mtime_ns,
+                                     "page": page, "rect": rect})
+        else:
+            font_size, text, color = key
+            index["glyphs"].append({"font_size": font_size, "text": text, "color": list(color),
+                                    "page": page, "rect": rect})
+
+    os.makedirs(output_dir, exist_ok=True)
+    for page, surface in enumerate(pages):
+        name = f"atlas_{page}.png"
+        pygame.image.save(surface, os.path.join(output_dir, name))
+        index["pages"].append(name)
+    with open(os.path.join(output_dir, INDEX_NAME), "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file, ensure_ascii=False, indent=1)
+    return index
+
+
+class Atlas:
+    """Atlas pages and the subsurfaces cut from them
+
+    `sprites` is keyed like the AssetManager cache, (path, size), and `glyphs`
+    by (font size, text, color).
+    """
+
+    def __init__(self, pages, sprites, glyphs):
+        self.pages = pages
+        self.sprites = sprites
+        self.glyphs = glyphs
+
+    @classmethod
+    def load(cls, index_path):
+        with open(index_path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        if index.get("version") != ATLAS_VERSION:
+            raise ValueError(f"Unsupported atlas version {index.get('version')}")
+
+        directory = os.path.dirname(index_path)
+        pages = []
+        for name in index["pages"]:
+            page = pygame.image.load(os.path.join(directory, name))
+            if not pygame.display.get_init():
+                pass  # nothing to convert for; e.g. a tool reading the atlas
+            elif pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            else:
+                # PNGs load in RGBA byte order; without a window, still match
+                # the usual ARGB layout so blits skip the channel swizzle
+                page = page.convert(pygame.Surface((1, 1), pygame.SRCALPHA))
+            pages.append(page)
+
+        sprites = {}
+        for entry in index["sprites"]:
+            try:
+                stale = os.stat(entry["path"]).st_mtime_ns != entry["mtime"]
+            except OSError:
+                stale = False  # the atlas copy is all there is
+            if not stale:
+                sprites[(entry["path"], tuple(entry["size"]))] = pages[entry["page"]].subsurface(entry["rect"])
+        glyphs = {}
+        if index["pygame"] == pygame.version.ver:
+            for entry in index["glyphs"]:
+                key = (entry["font_size"], entry["text"], tuple(entry["color"]))
+                glyphs[key] = pages[entry["page"]].subsurface(entry["rect"])
+        return cls(pages, sprites, glyphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="directory for pages and index (default: resources/atlas)")
+    parser.add_argument("--page-size", type=int, default=1024, help="maximum page width and height in pixels")
+    parser.add_argument("--padding", type=int, default=2, help="pixels between packed images")
+    args = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.abspath(args.output or os.path.join(repo_root, "resources", "atlas"))
+    sys.path.insert(0, repo_root)
+    os.chdir(repo_root)  # sprite paths are relative to the repository, as in the game
+    index = build_atlas(output_dir, args.page_size, args.padding)
+    print(f"Packed {len(index['sprites'])} sprites and {len(index['glyphs'])} glyphs into "
+          f"{len(index['pages'])} page(s) in {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Monte-Carlo balancing runner.
+
+Plays large numbers of mini-games and whole sessions with scripted bots (see
+bots.py) in headless games spread over a process pool, and reports:
+- per mini-game: win rate, fail rate and time-to-complete percentiles
+- per session: victory and game-over rates, time to victory, quests completed
+  and the mean/min energy curve over time
+- with `--sweep`, the mini-game win rate at each bot skill, next to the win
+  rate of a bot that never acts. A mini-game that an idle bot wins is won by
+  its ambient progress alone (MiniGame.AMBIENT_PROGRESS_CHANCE), whatever the
+  player does.
+
+Difficulty constants can be overridden for a run without editing code, e.g.
+`--set CowFeeding.DURATION=12` or `--set MiniGame.SUCCESS_THRESHOLD=0.6` for
+mini-game class constants, and `--set game.quest_energy_cost=15` for engine
+values. Every run is derived from `--seed`, so results are reproducible for a
+given seed, run count and chunk size, whatever the number of workers.
+
+Usage:
+    python balancing.py --games 100000 [--types cow_feeding,memory_cards]
+                        [--sessions 200] [--skill 0.8] [--reaction 0.4] [--sweep 0,0.25,0.5,0.75,1]
+                        [--workers 8] [--set CowFeeding.DURATION=12] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+TIME_BUCKET = 0.1  # seconds per time-to-complete histogram bucket
+ENERGY_SAMPLE_INTERVAL = 1.0  # seconds between energy curve samples
+DEFAULT_CHUNK = 500  # runs per task
+
+# Per-process state, created by init_worker()
+_worker = {}
+
+
+def parse_overrides(assignments):
+    """['CowFeeding.DURATION=12', ...] -> {('CowFeeding', 'DURATION'): 12.0, ...}"""
+    overrides = {}
+    for assignment in assignments:
+        target, _, value = assignment.partition("=")
+        owner, _, name = target.partition(".")
+        if not (owner and name and value):
+            raise ValueError(f"Expected Owner.NAME=value, got '{assignment}'")
+        overrides[(owner, name)] = json.loads(value)
+    return overrides
+
+
+def apply_class_overrides(overrides):
+    """Set mini-game class constants; 'game.*' entries are applied per game"""
+    import MiniGames
+    from MiniGames.MiniGame import MiniGame
+
+    for (owner, name), value in overrides.items():
+        if owner == "game":
+            continue
+        cls = MiniGame if owner == "MiniGame" else getattr(MiniGames, owner)
+        if not hasattr(cls, name):
+            raise AttributeError(f"{owner} has no constant {name}")
+        setattr(cls, name, value)
+
+
+def apply_game_overrides(game, overrides):
+    for (owner, name), value in overrides.items():
+        if owner != "game":
+            continue
+        if not hasattr(game, name):
+            raise AttributeError(f"QuestGame has no attribute {name}")
+        setattr(game, name, value)
+        if name == "energy_regen_interval":
+            game.energy_timer.interval = value
+            game.scheduler.reschedule(game.energy_timer, value)
+
+
+def init_worker(overrides, skill, reaction):
+    from headless import create_headless_game
+
+    # Special abilities announce themselves on stdout; keep the report readable
+    sys.stdout = open(os.devnull, "w")
+    apply_class_overrides(overrides)
+    _worker.update(overrides=overrides, skill=skill, reaction=reaction,
+                   game=create_headless_game(render=False, seed=0))
+
+
+def new_stats():
+    return {"mini_games": {}, "sessions": None}
+
+
+def mini_game_stats():
+    return {"runs": 0, "wins": 0, "fails": 0, "win_times": Counter(), "progress_share": Counter()}
+
+
+def session_stats():
+    return {"runs": 0, "victories": 0, "game_overs": 0, "timeouts": 0, "victory_times": Counter(),
+            "quests": Counter(), "energy_sum": [], "energy_count": [], "energy_min": []}
+
+
+def merge(total, part):
+    """Fold one worker's partial stats into the running total"""
+    for mini_game_type, stats in part["mini_games"].items():
+        merged = total["mini_games"].setdefault(mini_game_type, mini_game_stats())
+        for key, value in stats.items():
+            merged[key] += value
+    sessions = part["sessions"]
+    if sessions:
+        merged = total["sessions"] = total["sessions"] or session_stats()
+        for key in ("runs", "victories", "game_overs", "timeouts", "victory_times", "quests"):
+            merged[key] += sessions[key]
+        for key, combine in (("energy_sum", int.__add__), ("energy_count", int.__add__), ("energy_min", min)):
+            mine, theirs = merged[key], sessions[key]
+            for i, value in enumerate(theirs):
+                if i < len(mine):
+                    mine[i] = combine(mine[i], value)
+                else:
+                    mine.append(value)
+    return total
+
+
+def play_mini_games(mini_game_type, seed, first, count, skill=None, reaction=None):
+    """Worker task: runs `first` .. `first + count - 1` of one mini-game type
+
+    The bot plays at the run's --skill and --reaction unless given others.
+    """
+    import pygame
+    from bots import MiniGameBot
+    from MiniGames import create_mini_game
+    from rng import RandomStreams
+
+    skill = _worker["skill"] if skill is None else skill
+    reaction = _worker["reaction"] if reaction is None else reaction
+    game = _worker["game"]
+    dt = game.SIM_DT
+    stats = mini_game_stats()
+    for run in range(first, first + count):
+        rng = RandomStreams(seed).fork(f"{mini_game_type}/{run}")
+        bot = MiniGameBot(rng.stream("bot"), skill, reaction)
+        game.mouse_pos = (0, 0)
+        mini_game = create_mini_game(mini_game_type, game, rng.stream(f"mini_game.{mini_game_type}"))
+        mini_game.setup("balancing")
+        bot.start(mini_game)
+
+        # The same per-step order as the engine: input, then one update
+        outcome = None
+        while outcome is None:
+            for event in bot.step(mini_game, dt):
+                if event.type == pygame.MOUSEMOTION:
+                    game.mouse_pos = event.pos
+                else:
+                    mini_game.handle_event(event)
+            mini_game.update(dt)
+            outcome = mini_game.outcome()
+
+        stats["runs"] += 1
+        stats["progress_share"][min(10, int(10 * mini_game.progress / mini_game.target))] += 1
+        if outcome == "fail":
+            stats["fails"] += 1
+        elif mini_game.is_success():
+            stats["wins"] += 1
+            stats["win_times"][int(mini_game.time / TIME_BUCKET)] += 1
+    part = new_stats()
+    part["mini_games"][mini_game_type] = stats
+    return part
+
+
+def play_sessions(seed, first, count, max_seconds, friend_count):
+    """Worker task: whole games from the main menu to victory, game over or the time cap"""
+    from bots import MiniGameBot, SessionBot
+    from game_engine import GameState
+    from headless import create_headless_game
+    from rng import RandomStreams
+
+    stats = session_stats()
+    for run in range(first, first + count):
+        rng = RandomStreams(seed).fork(f"session/{run}")
+        game = create_headless_game(render=False, seed=rng.seed, friend_count=friend_count)
+        apply_game_overrides(game, _worker["overrides"])
+        bot = SessionBot(game, MiniGameBot(rng.stream("bot"), _worker["skill"], _worker["reaction"]))
+
+        samples_every = round(ENERGY_SAMPLE_INTERVAL * game.SIM_HZ)
+        max_frames = round(max_seconds * game.SIM_HZ)
+        curve = []
+        for frame in range(max_frames):
+            if game.state in (GameState.VICTORY, GameState.GAME_OVER):
+                break
+            if frame % samples_every == 0:
+                curve.append(int(game.player_energy))
+            bot.step()
+            game.step()
+
+        stats["runs"] += 1
+        stats["quests"][game.completed_quests] += 1
+        if game.state == GameState.VICTORY:
+            stats["victories"] += 1
+            stats["victory_times"][int(game.sim_time / TIME_BUCKET)] += 1
+        elif game.state == GameState.GAME_OVER:
+            stats["game_overs"] += 1
+        else:
+            stats["timeouts"] += 1
+        for i, energy in enumerate(curve):
+            if i < len(stats["energy_sum"]):
+                stats["energy_sum"][i] += energy
+                stats["energy_count"][i] += 1
+                stats["energy_min"][i] = min(stats["energy_min"][i], energy)
+            else:
+                stats["energy_sum"].append(energy)
+                stats["energy_count"].append(1)
+                stats["energy_min"].append(energy)
+    part = new_stats()
+    part["sessions"] = stats
+    return part
+
+
+def chunks(total, size):
+    for first in range(0, total, size):
+        yield first, min(size, total - first)
+
+
+def histogram_percentiles(histogram, percentiles=(50, 90, 99)):
+    """Nearest-rank percentiles, in seconds, of a TIME_BUCKET histogram"""
+    total = sum(histogram.values())
+    if not total:
+        return {}
+    result = {}
+    buckets = sorted(histogram.items())
+    for p in percentiles:
+        rank = max(1, round(p / 100 * total))
+        seen = 0
+        for bucket, count in buckets:
+            seen += count
+            if seen >= rank:
+                result[f"p{p}"] = round((bucket + 1) * TIME_BUCKET, 3)
+                break
+    return result
+
+
+def report(total):
+    """JSON-friendly summary of the merged stats"""
+    summary = {"mini_games": {}, "sessions": None}
+    for mini_game_type, stats in sorted(total["mini_games"].items()):
+        runs = stats["runs"]
+        summary["mini_games"][mini_game_type] = {
+            "runs": runs,
+            "win_rate": stats["wins"] / runs,
+            "fail_rate": stats["fails"] / runs,
+            "time_to_complete_s": histogram_percentiles(stats["win_times"]),
+            "progress_share": {f"{bucket / 10:.1f}": count / runs
+                               for bucket, count in sorted(stats["progress_share"].items())},
+        }
+    sessions = total["sessions"]
+    if sessions:
+        runs = sessions["runs"]
+        summary["sessions"] = {
+            "runs": runs,
+            "victory_rate": sessions["victories"] / runs,
+            "game_over_rate": sessions["game_overs"] / runs,
+            "timeout_rate": sessions["timeouts"] / runs,
+            "time_to_victory_s": histogram_percentiles(sessions["victory_times"]),
+            "quests_completed": {str(quests): count / runs for quests, count in sorted(sessions["quests"].items())},
+            # Sessions that already ended drop out of later samples
+            "energy_curve": [
+                {"t": i * ENERGY_SAMPLE_INTERVAL, "sessions": count, "mean": energy_sum / count, "min": energy_min}
+                for i, (energy_sum, count, energy_min) in enumerate(
+                    zip(sessions["energy_sum"], sessions["energy_count"], sessions["energy_min"]))
+            ],
+        }
+    return summary
+
+
+def sweep_report(sweep_totals):
+    """{mini-game type: {skill label: win rate}} from the merged stats of each sweep level"""
+    table = {}
+    for label, total in sweep_totals.items():
+        for mini_game_type, stats in sorted(total["mini_games"].items()):
+            table.setdefault(mini_game_type, {})[label] = stats["wins"] / stats["runs"]
+    return table
+
+
+def print_sweep(table):
+    labels = list(next(iter(table.values())))
+    print("\nwin rate by skill")
+    print(f"{'mini-game':20s} " + " ".join(f"{label:>7s}" for label in labels))
+    for mini_game_type, rates in table.items():
+        print(f"{mini_game_type:20s} " + " ".join(f"{rates[label]:7.1%}" for label in labels))
+
+
+def print_report(summary):
+    if summary["mini_games"]:
+        print(f"{'mini-game':20s} {'runs':>9s} {'win':>7s} {'fail':>7s} {'p50 s':>7s} {'p90 s':>7s} {'p99 s':>7s}")
+        for mini_game_type, stats in summary["mini_games"].items():
+            times = stats["time_to_complete_s"]
+            print(f"{mini_game_type:20s} {stats['runs']:9d} {stats['win_rate']:7.1%} {stats['fail_rate']:7.1%} "
+                  + " ".join(f"{times.get(p, float('nan')):7.1f}" for p in ("p50", "p90", "p99")))
+    sessions = summary["sessions"]
+    if sessions:
+        times = sessions["time_to_victory_s"]
+        print(f"\nsessions: {sessions['runs']}  victory {sessions['victory_rate']:.1%}  "
+              f"game over {sessions['game_over_rate']:.1%}  timeout {sessions['timeout_rate']:.1%}")
+        if times:
+            print("time to victory: " + "  ".join(f"{p} {seconds:.0f}s" for p, seconds in times.items()))
+        curve = sessions["energy_curve"]
+        step = max(1, len(curve) // 10)
+        print("energy (mean/min): " + "  ".join(
+            f"{point['t']:.0f}s {point['mean']:.0f}/{point['min']}" for point in curve[::step]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000, help="mini-games to play per type (default 1000)")
+    parser.add_argument("--types", default="", help="comma-separated mini-game types (default: all)")
+    parser.add_argument("--sessions", type=int, default=0, help="whole sessions to play (default 0)")
+    parser.add_argument("--session-seconds", type=float, default=600, help="simulated time cap per session")
+    parser.add_argument("--friends", type=int, default=None, help="friends per session world (default: the roster)")
+    parser.add_argument("--skill", type=float, default=0.8, help="chance a bot action is right (default 0.8)")
+    parser.add_argument("--reaction", type=float, default=0.4, help="seconds between bot actions (default 0.4)")
+    parser.add_argument("--sweep", default="", metavar="SKILLS",
+                        help="also play --games per type at each of these comma-separated skills, and idle")
+    parser.add_argument("--set", action="append", default=[], metavar="OWNER.NAME=VALUE",
+                        help="override a constant, e.g. CowFeeding.DURATION=12 or game.quest_energy_cost=15")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="runs per task")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from MiniGames import MINI_GAME_TYPES
+
+    overrides = parse_overrides(args.set)
+    types = [name for name in args.types.split(",") if name] or list(MINI_GAME_TYPES)
+    unknown = set(types) - MINI_GAME_TYPES.keys()
+    if unknown:
+        parser.error(f"unknown mini-game types: {', '.join(sorted(unknown))}")
+    # Label -> (skill, reaction); the idle bot never acts
+    sweep = {"idle": (0.0, float("inf"))}
+    sweep.update((skill, (float(skill), args.reaction)) for skill in args.sweep.split(",") if skill)
+    if len(sweep) == 1:
+        sweep = {}
+
+    start = time.perf_counter()
+    total = new_stats()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(overrides, args.skill, args.reaction)) as pool:
+        futures = []
+        if args.games:
+            for mini_game_type in types:
+                for first, count in chunks(args.games, args.chunk):
+                    futures.append(pool.submit(play_mini_games, mini_game_type, args.seed, first, count))
+        # Sessions are much longer than mini-games, so they go out a few at a time
+        for first, count in chunks(args.sessions, max(1, args.chunk // 100)):
+            futures.append(pool.submit(play_sessions, args.seed, first, count, args.session_seconds, args.friends))
+        # Every sweep level plays the same games, so the levels differ only by the bot
+        sweep_futures = {label: [] for label in sweep}
+        for label, (skill, reaction) in sweep.items():
+            for mini_game_type in types:
+                for first, count in chunks(args.games, args.chunk):
+                    sweep_futures[label].append(pool.submit(play_mini_games, mini_game_type, args.seed, first,
+                                                            count, skill, reaction))
+        for future in futures:
+            merge(total, future.result())
+        sweep_totals = {label: new_stats() for label in sweep}
+        for label, level_futures in sweep_futures.items():
+            for future in level_futures:
+                merge(sweep_totals[label], future.result())
+    elapsed = time.perf_counter() - start
+
+    summary = report(total)
+    if sweep and args.games:
+        summary["skill_sweep"] = sweep_report(sweep_totals)
+    summary["meta"] = {"seed": args.seed, "skill": args.skill, "reaction": args.reaction,
+                       "overrides": args.set, "workers": args.workers, "seconds": round(elapsed, 2)}
+    print_report(summary)
+    if "skill_sweep" in summary:
+        print_sweep(summary["skill_sweep"])
+    runs = args.games * len(types) * (1 + len(sweep)) + args.sessions
+    print(f"\n{runs} runs in {elapsed:.1f}s on {args.workers} worker(s)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump(summary, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
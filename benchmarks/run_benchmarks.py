@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite.
+
+Drives QuestGame headless (SDL dummy video driver) and measures:
+- overworld simulation ticks per second for several crowd sizes
+- overworld frames per second with rendering
+- every mini-game's update, input handling and drawing, plus swarm-sized
+  plant and cow games
+- setup_game and restart_game latency
+- the cold import time of game_engine on top of pygame (see startup_budget.py)
+
+Each benchmark is repeated and the median is reported. Results can be saved as
+JSON and compared against an earlier run; the script exits with status 1 when
+any benchmark regressed by more than the tolerance.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--save results.json] [--baseline old.json]
+                                        [--tolerance 0.10] [--filter mini_game] [--quick]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from startup_budget import import_time_ms  # noqa: E402
+
+CROWD_SIZES = (8, 500, 5000)
+SWARM_SIZE = 5000
+MINI_GAME_CLICKS = [(x, y) for y in range(200, 600, 37) for x in range(150, 1050, 53)]
+
+
+class Benchmark:
+    """A named measurement; `measure()` returns its median value"""
+
+    def __init__(self, name, unit, higher_is_better, measure):
+        self.name = name
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.measure = measure
+
+
+def rate(work, operations, repeats, prepare=None):
+    """Median operations per second of work(), which performs `operations` operations
+
+    With `prepare`, each repeat runs work(prepare()) and only work() is timed.
+    """
+    samples = []
+    for _ in range(repeats):
+        state = prepare() if prepare else None
+        start = time.perf_counter()
+        work(state) if prepare else work()
+        samples.append(operations / (time.perf_counter() - start))
+    return statistics.median(samples)
+
+
+def latency_ms(work, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def new_game(render=False, **options):
+    from headless import create_headless_game
+
+    options.setdefault("seed", 1)
+    return create_headless_game(render=render, **options)
+
+
+def walk(game, ticks):
+    """Run update_playing for `ticks` steps, walking in a square and skipping quest dialogs"""
+    import pygame
+    from game_engine import GameState
+
+    directions = (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP)
+    held = game.input.held_keys
+    for tick in range(ticks):
+        if tick % 120 == 0:
+            held.clear()
+            held.add(directions[tick // 120 % 4])
+        game.state = GameState.PLAYING
+        game.update_playing()
+
+
+def overworld_update(friends, scale):
+    def measure():
+        game = new_game(friend_count=friends)
+        ticks = int(600 * scale)
+        return rate(lambda: walk(game, ticks), ticks, repeats=5)
+    return measure
+
+
+def overworld_frames(friends, scale):
+    def measure():
+        import pygame
+        from game_engine import GameState
+
+        game = new_game(render=True, friend_count=friends)
+        game.state = GameState.PLAYING
+        frames = int(300 * scale)
+
+        def play():
+            held = game.input.held_keys
+            for frame in range(frames):
+                if frame % 60 == 0:
+                    held.clear()
+                    held.add((pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP)[frame // 60 % 4])
+                game.state = GameState.PLAYING
+                game.step()
+        return rate(play, frames, repeats=5)
+    return measure
+
+
+def started_mini_game(game, mini_game_type, count=None):
+    from MiniGames import create_mini_game
+
+    mini_game = create_mini_game(mini_game_type, game, game.rng.stream(f"mini_game.{mini_game_type}"))
+    if count is not None:
+        # Swarm versions of the entity-heavy games
+        mini_game.PLANT_COUNT = mini_game.COW_COUNT = count
+    mini_game.setup("benchmark")
+    return mini_game
+
+
+def mini_game_update(mini_game_type, scale, count=None):
+    def measure():
+        game = new_game()
+        game.mouse_pos = (600, 400)
+        mini_game = started_mini_game(game, mini_game_type, count)
+        steps = int(3000 * scale)
+
+        def run():
+            for _ in range(steps):
+                mini_game.update(game.SIM_DT)
+        return rate(run, steps, repeats=5)
+    return measure
+
+
+def mini_game_input(mini_game_type, scale, count=None):
+    def measure():
+        import pygame
+
+        game = new_game()
+        events = []
+        for pos in MINI_GAME_CLICKS:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        for key in (pygame.K_1, pygame.K_3, pygame.K_UP, pygame.K_LEFT, pygame.K_SPACE, pygame.K_a, pygame.K_RETURN):
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=chr(key) if key < 127 else ""))
+        rounds = max(1, int(20 * scale))
+
+        def prepare():
+            # A fresh game each round, so clicks keep hitting uncollected targets
+            return [started_mini_game(game, mini_game_type, count) for _ in range(rounds)]
+
+        def run(mini_games):
+            for mini_game in mini_games:
+                for event in events:
+                    mini_game.handle_event(event)
+        return rate(run, rounds * len(events), repeats=5, prepare=prepare)
+    return measure
+
+
+def mini_game_draw(mini_game_type, scale, count=None):
+    def measure():
+        game = new_game(render=True)
+        mini_game = started_mini_game(game, mini_game_type, count)
+        frames = int(300 * scale)
+
+        def run():
+            for _ in range(frames):
+                game.screen.fill(game.LIGHT_GRAY)
+                mini_game.draw(game.screen)
+        return rate(run, frames, repeats=5)
+    return measure
+
+
+def setup_latency(scale):
+    def measure():
+        game = new_game(friend_count=500)
+        return latency_ms(game.setup_game, repeats=max(3, int(10 * scale)))
+    return measure
+
+
+def restart_latency(scale):
+    def measure():
+        game = new_game(render=True)
+        return latency_ms(game.restart_game, repeats=max(3, int(10 * scale)))
+    return measure
+
+
+def collect(scale):
+    from MiniGames import MINI_GAME_TYPES
+
+    benchmarks = []
+    for friends in CROWD_SIZES:
+        benchmarks.append(Benchmark(f"overworld.update[{friends}]", "ticks/s", True, overworld_update(friends, scale)))
+    for friends in CROWD_SIZES[:2]:
+        benchmarks.append(Benchmark(f"overworld.frame[{friends}]", "frames/s", True, overworld_frames(friends, scale)))
+    for mini_game_type in MINI_GAME_TYPES:
+        name = f"mini_game.{mini_game_type}"
+        benchmarks.append(Benchmark(f"{name}.update", "steps/s", True, mini_game_update(mini_game_type, scale)))
+        benchmarks.append(Benchmark(f"{name}.input", "events/s", True, mini_game_input(mini_game_type, scale)))
+        benchmarks.append(Benchmark(f"{name}.draw", "frames/s", True, mini_game_draw(mini_game_type, scale)))
+    for mini_game_type in ("plant_collection", "cow_feeding"):
+        name = f"mini_game.{mini_game_type}[{SWARM_SIZE}]"
+        benchmarks.append(Benchmark(f"{name}.update", "steps/s", True,
+                                    mini_game_update(mini_game_type, scale / 10, SWARM_SIZE)))
+        benchmarks.append(Benchmark(f"{name}.input", "events/s", True,
+                                    mini_game_input(mini_game_type, scale / 10, SWARM_SIZE)))
+    benchmarks.append(Benchmark("setup_game[500]", "ms", False, setup_latency(scale)))
+    benchmarks.append(Benchmark("restart_game", "ms", False, restart_latency(scale)))
+    benchmarks.append(Benchmark("import.game_engine", "ms", False,
+                                lambda: import_time_ms(runs=3 if scale < 1 else 5)))
+    return benchmarks
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against a baseline; returns the names that regressed"""
+    regressions = []
+    print(f"\n{'benchmark':46s} {'baseline':>12s} {'now':>12s} {'change':>8s}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:46s} {'-':>12s} {result['value']:12.2f}    (new)")
+            continue
+        change = (result["value"] - old["value"]) / old["value"]
+        # Positive `worse` means slower, whichever direction the unit goes
+        worse = -change if result["higher_is_better"] else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:46s} {old['value']:12.2f} {result['value']:12.2f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved earlier")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="fail when a benchmark is this much slower than the baseline (default 10%%)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="less work per benchmark, noisier numbers")
+    args = parser.parse_args()
+
+    import pygame
+
+    scale = 0.2 if args.quick else 1.0
+    results = {}
+    for benchmark in collect(scale):
+        if args.filter not in benchmark.name:
+            continue
+        value = benchmark.measure()
+        results[benchmark.name] = {"value": value, "unit": benchmark.unit,
+                                   "higher_is_better": benchmark.higher_is_better}
+        print(f"{benchmark.name:46s} {value:12.2f} {benchmark.unit}", flush=True)
+
+    if args.save:
+        report = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "quick": args.quick,
+            },
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Startup time budget.
+
+Measures, in fresh interpreters:
+- the import time of game_engine, via `python -X importtime`, not counting
+  pygame itself: pygame is imported first and only what game_engine adds on
+  top is budgeted, since pygame's own import (numpy included, when installed)
+  is outside the project's control and varies a lot between installs
+- cold start to first frame: import, QuestGame() and one frame, headless but
+  with sprites loading in the background as in the windowed game
+
+and exits with status 1 when the median of either exceeds its budget.
+
+Usage:
+    python benchmarks/startup_budget.py [--runs 5] [--import-budget-ms 40]
+                                        [--first-frame-budget-ms 400]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import pygame; import game_engine"
+FIRST_FRAME_SNIPPET = """
+import time
+start = time.perf_counter()
+import game_engine
+game = game_engine.QuestGame(headless=True, background_loading=True)
+game.step()
+print(f"first-frame {(time.perf_counter() - start) * 1000:.3f}")
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env["SDL_VIDEODRIVER"] = "dummy"
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    return env
+
+
+def parse_importtime(stderr, after="pygame"):
+    """Returns (total cumulative us, [(self us, module)]) from -X importtime output
+
+    Only imports that follow the top-level import of `after` are counted; a
+    module is listed after the modules it imports, so these are exactly the
+    imports made by the statements after `import after`.
+    """
+    total = 0
+    modules = []
+    counting = after is None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Top-level imports are not indented; their cumulative times add up
+        # to the whole import
+        top_level = not name.startswith("  ")
+        if not counting:
+            counting = top_level and name.strip() == after
+            continue
+        modules.append((int(self_us), name.strip()))
+        if top_level:
+            total += int(cumulative_us)
+    return total, modules
+
+
+def measure_import():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET],
+                            cwd=REPO_ROOT, env=child_env(), capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def measure_first_frame():
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME_SNIPPET],
+                            cwd=REPO_ROOT, env=child_env(), capture_output=True, text=True, check=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("first-frame "):
+            return float(line.split()[1])
+    raise RuntimeError(f"No timing in output:\n{result.stdout}\n{result.stderr}")
+
+
+def import_time_ms(runs=5):
+    """Median cold import time of game_engine on top of pygame, in milliseconds"""
+    return statistics.median(measure_import()[0] for _ in range(runs)) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=40.0)
+    parser.add_argument("--first-frame-budget-ms", type=float, default=400.0)
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest modules")
+    args = parser.parse_args()
+
+    import_totals = []
+    slowest = {}
+    for _ in range(args.runs):
+        total, modules = measure_import()
+        import_totals.append(total / 1000)
+        for self_us, name in modules:
+            slowest[name] = max(slowest.get(name, 0), self_us)
+    first_frames = [measure_first_frame() for _ in range(args.runs)]
+
+    import_ms = statistics.median(import_totals)
+    first_frame_ms = statistics.median(first_frames)
+
+    print(f"Slowest modules (self time, worst of {args.runs} runs):")
+    for name, self_us in sorted(slowest.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {name}")
+    print()
+
+    failed = False
+    for label, value, budget in (("import game_engine - pygame", import_ms, args.import_budget_ms),
+                                 ("cold start to first frame", first_frame_ms, args.first_frame_budget_ms)):
+        status = "ok" if value <= budget else "OVER BUDGET"
+        failed = failed or value > budget
+        print(f"{label:30s} {value:8.2f} ms  (budget {budget:.0f} ms)  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
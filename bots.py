@@ -0,0 +1,194 @@
+"""
+Scripted bot players for balancing runs.
+
+A MiniGameBot plays any registered mini-game through the same input events a
+person would produce. `skill` is the chance that an action is the right one,
+and `reaction` is the time in seconds between actions. A SessionBot walks the
+overworld to the nearest friend who still needs help, accepts their quest and
+plays the mini-game with a MiniGameBot.
+"""
+
+import pygame
+
+from game_engine import GameState
+
+
+def _click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def _key(key, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode)
+
+
+def _move(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+
+class MiniGameBot:
+    def __init__(self, rng, skill=0.8, reaction=0.4):
+        self.rng = rng
+        self.skill = skill
+        self.reaction = reaction
+        self.cooldown = 0.0
+        self.memory = {}  # memory cards: card index -> symbol seen
+
+    def start(self, mini_game):
+        self.cooldown = self.reaction
+        self.memory = {}
+
+    def hits(self):
+        return self.rng.random() < self.skill
+
+    def random_point(self, game):
+        return (self.rng.randrange(game.WIDTH), self.rng.randrange(game.HEIGHT))
+
+    def step(self, mini_game, dt):
+        """Events to send this simulation step"""
+        self.cooldown -= dt
+        if self.cooldown > 0:
+            return []
+        self.cooldown += self.reaction
+        act = getattr(self, f"play_{mini_game.TYPE}", None)
+        return act(mini_game) if act else []
+
+    def play_button_mash(self, mini_game):
+        # A miss is a press that doesn't land in time
+        return [_key(pygame.K_SPACE, " ")] if self.hits() else []
+
+    def play_plant_collection(self, mini_game):
+        plants = mini_game.plants
+        remaining = [i for i in range(len(plants)) if not plants.collected[i]]
+        if remaining and self.hits():
+            i = self.rng.choice(remaining)
+            return [_click((plants.x[i], plants.y[i]))]
+        return [_click(self.random_point(mini_game.game))]
+
+    def play_pattern_matching(self, mini_game):
+        expected = mini_game.stats_pattern[len(mini_game.player_pattern)]
+        number = expected if self.hits() else self.rng.choice([n for n in range(1, 5) if n != expected])
+        return [_key(pygame.K_0 + number, str(number))]
+
+    def play_memory_cards(self, mini_game):
+        cards = mini_game.cards
+        for i, card in enumerate(cards):
+            if card.matched:
+                self.memory.pop(i, None)
+            elif card.revealed:
+                self.memory[i] = card.symbol
+        hidden = [i for i, card in enumerate(cards) if not card.revealed and not card.matched]
+        if not hidden:
+            return []
+
+        if mini_game.revealed_cards:
+            # Second card of a turn: go for the pair of the card that is face up
+            symbol = mini_game.revealed_cards[0].symbol
+            known = [i for i in hidden if self.memory.get(i) == symbol]
+        else:
+            # First card: open one whose pair has been seen, or an unseen one
+            seen = {}
+            for i in hidden:
+                if i in self.memory:
+                    seen.setdefault(self.memory[i], []).append(i)
+            known = next((indices for indices in seen.values() if len(indices) == 2), None)
+            if known is None:
+                known = [i for i in hidden if i not in self.memory]
+        target = known[0] if known and self.hits() else self.rng.choice(hidden)
+        x, y = mini_game.LAYOUT.position(target)
+        return [_click((x + 30, y + 30))]
+
+    def play_word_completion(self, mini_game):
+        if mini_game.current_joke_index >= len(mini_game.joke_templates):
+            return []
+        answer = mini_game.joke_templates[mini_game.current_joke_index][1]
+        word = answer if self.hits() else answer[::-1]
+        return [_key(ord(char), char) for char in word] + [_key(pygame.K_RETURN, "\r")]
+
+    def play_cow_feeding(self, mini_game):
+        cows = mini_game.cows
+        hungry = [i for i in range(len(cows)) if not cows.fed[i]]
+        if hungry and self.hits():
+            i = hungry[0]
+            return [_move((cows.x[i], cows.y[i]))]
+        return [_move(self.random_point(mini_game.game))]
+
+    def play_circuit_building(self, mini_game):
+        if mini_game.current_connection >= len(mini_game.connection_order):
+            return []
+        target = mini_game.connection_order[mini_game.current_connection]
+        if not self.hits():
+            target = self.rng.choice([part.id for part in mini_game.invention_parts if not part.connected])
+        x, y = mini_game.LAYOUT.position(target)
+        return [_click((x + 25, y + 25))]
+
+    def play_tool_selection(self, mini_game):
+        broken = [i for i, part in enumerate(mini_game.broken_parts) if not part.fixed]
+        if not broken:
+            return []
+        if mini_game.selected_tool is None:
+            tools = mini_game.available_tools
+            right_tool = mini_game.broken_parts[broken[0]].tool
+            tool = right_tool if self.hits() else self.rng.choice(tools)
+            x, y = mini_game.TOOL_LAYOUT.position(tools.index(tool))
+        else:
+            x, y = mini_game.PART_LAYOUT.position(broken[0])
+        return [_click((x + 30, y + 30))]
+
+    def play_code_sequence(self, mini_game):
+        if mini_game.showing_sequence or mini_game.current_sequence_index >= len(mini_game.code_sequences):
+            return []
+        entry = mini_game.code_sequences[mini_game.current_sequence_index]
+        expected = entry.sequence[len(entry.current_input)]
+        keys = {name: key for key, name in mini_game.KEY_MAP.items()}
+        if not self.hits():
+            expected = self.rng.choice([name for name in keys if name != expected])
+        return [_key(keys[expected])]
+
+
+class SessionBot:
+    """Plays a whole game: walk to a friend, accept the quest, play it, repeat
+
+    With `restart`, the bot starts a new game once this one is won or lost.
+    """
+
+    DIRECTIONS = ((pygame.K_LEFT, -1, 0), (pygame.K_RIGHT, 1, 0), (pygame.K_UP, 0, -1), (pygame.K_DOWN, 0, 1))
+
+    def __init__(self, game, mini_game_bot, restart=False):
+        self.game = game
+        self.mini_game_bot = mini_game_bot
+        self.restart = restart
+        self.playing = None
+
+    def step(self):
+        """Queue this frame's input on game.input"""
+        game = self.game
+        game_input = game.input
+        game_input.held_keys.clear()
+
+        if game.state == GameState.MAIN_MENU:
+            game_input.tap(pygame.K_SPACE)
+        elif game.state == GameState.QUEST_DIALOG:
+            game_input.tap(pygame.K_y)
+        elif game.state == GameState.MINI_GAME:
+            if self.playing is not game.mini_game:
+                self.playing = game.mini_game
+                self.mini_game_bot.start(game.mini_game)
+            for event in self.mini_game_bot.step(game.mini_game, game.SIM_DT):
+                game_input.post(event)
+        elif game.state == GameState.PLAYING:
+            self.walk_to_next_friend()
+        elif self.restart and game.state in (GameState.VICTORY, GameState.GAME_OVER):
+            game_input.tap(pygame.K_r)
+
+    def walk_to_next_friend(self):
+        game = self.game
+        player = game.player
+        waiting = [friend for friend in game.friends if not friend.quest_completed]
+        if not waiting:
+            return
+        target = min(waiting, key=lambda friend: abs(friend.x - player.x) + abs(friend.y - player.y))
+        dx = target.x - player.x
+        dy = target.y - player.y
+        for key, sx, sy in self.DIRECTIONS:
+            if (sx and sx * dx > 0) or (sy and sy * dy > 0):
+                game.input.held_keys.add(key)
@@ -0,0 +1,29 @@
+import pygame
+
+
+class Camera:
+    """Viewport onto a world that is larger than the screen"""
+
+    def __init__(self, view_size, world_size):
+        self.view_width, self.view_height = view_size
+        self.world_width, self.world_height = world_size
+        self.offset = (0, 0)
+
+    @property
+    def view_rect(self):
+        """The part of the world that is currently on screen, in world coordinates"""
+        return pygame.Rect(self.offset, (self.view_width, self.view_height))
+
+    def follow(self, center):
+        """Center the view on a world position without showing past the world edge"""
+        x = int(center[0]) - self.view_width // 2
+        y = int(center[1]) - self.view_height // 2
+        x = max(0, min(x, self.world_width - self.view_width))
+        y = max(0, min(y, self.world_height - self.view_height))
+        self.offset = (x, y)
+
+    def to_screen(self, pos):
+        return (pos[0] - self.offset[0], pos[1] - self.offset[1])
+
+    def to_world(self, pos):
+        return (pos[0] + self.offset[0], pos[1] + self.offset[1])
@@ -0,0 +1,102 @@
+"""
+Dirty-rectangle rendering.
+
+Sprite scenes are drawn through a LayeredDirty group, which repaints only the
+sprites that changed; the rects it returns are pushed to the display with
+pygame.display.update(rects). A change of scene (game state), a window expose
+or an explicit invalidate() falls back to a full redraw and flip. Scrolling
+shifts the frame already on screen and repaints only what scrolled into view.
+An overlay drawn over the scene (the profiler's) is taken off before scrolling.
+"""
+
+import pygame
+
+# Events after which the window contents must be repainted from scratch
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE))
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, background, headless=False):
+        self.screen = screen
+        self.background = background
+        self.headless = headless
+        self.scene = None
+        self.full_redraw = True
+        self.pending_full = False
+        self.pending_rects = []
+        # Drawn over the scene after each frame; has hide(screen) to take it off again
+        self.overlay = None
+        # Frames drawn from scratch and frames scrolled into place
+        self.full_redraws = 0
+        self.scrolls = 0
+
+    def invalidate(self):
+        """Force the next frame to be redrawn and flipped in full"""
+        self.full_redraw = True
+
+    def begin_frame(self, scene):
+        if scene != self.scene:
+            self.scene = scene
+            self.full_redraw = True
+
+    def render(self, draw_scene):
+        """Redraw the whole scene with draw_scene() if it was invalidated"""
+        if self.full_redraw:
+            self.screen.fill(self.background)
+            draw_scene()
+            self.full_redraw = False
+            self.pending_full = True
+            self.full_redraws += 1
+
+    def render_sprites(self, group):
+        """Draw a LayeredDirty group, keeping only the rects it repainted"""
+        if self.full_redraw:
+            group.repaint_rect(self.screen.get_rect())
+            self.full_redraw = False
+            self.pending_full = True
+            self.full_redraws += 1
+        rects = group.draw(self.screen)
+        if not self.pending_full:
+            self.pending_rects.extend(rects)
+
+    def scroll(self, group, dx, dy):
+        """Move the frame on screen by (dx, dy) for a LayeredDirty group drawn on it
+
+        The group's record of where it drew each sprite moves along, so it
+        clears the right pixels later; the strips scrolled into view are
+        repainted on the next draw. Returns False, and redraws in full instead,
+        when a full redraw is due anyway or the view jumped by a whole screen.
+        Every pixel moved, so the whole frame is pushed to the display.
+        """
+        width, height = self.screen.get_size()
+        if self.full_redraw or abs(dx) >= width or abs(dy) >= height:
+            self.full_redraw = True
+            return False
+        if self.overlay is not None:
+            self.overlay.hide(self.screen)  # it stays where it is on screen
+        self.screen.scroll(dx, dy)
+        drawn_at = group.spritedict
+        for sprite, rect in drawn_at.items():
+            if rect:  # zero-size until first drawn
+                drawn_at[sprite] = rect.move(dx, dy)
+        group.lostsprites[:] = [rect.move(dx, dy) for rect in group.lostsprites]
+        if dx:
+            group.repaint_rect(pygame.Rect(0 if dx > 0 else width + dx, 0, abs(dx), height))
+        if dy:
+            # Leave out the corner the first strip covers: sprites over both
+            # would otherwise be blended in twice
+            left = dx if dx > 0 else 0
+            group.repaint_rect(pygame.Rect(left, 0 if dy > 0 else height + dy, width - abs(dx), abs(dy)))
+        self.pending_full = True
+        self.scrolls += 1
+        return True
+
+    def present(self):
+        """Push the changed parts of the screen to the display"""
+        if not self.headless:
+            if self.pending_full:
+                pygame.display.flip()
+            elif self.pending_rects:
+                pygame.display.update(self.pending_rects)
+        self.pending_full = False
+        self.pending_rects = []
@@ -0,0 +1,86 @@
+"""
+Struct-of-arrays entity storage.
+
+Mini-games with many interchangeable entities (plants, cows) keep each field in
+its own typed array instead of one dict per entity. An entity is just an index
+into the columns, which costs a few bytes per field rather than a dict, and the
+update and hit-test loops read flat arrays of numbers.
+"""
+
+import pickle
+from array import array
+
+
+class EntityStore:
+    """Entities with the given fields, e.g. EntityStore(x='i', y='i', fed='B')
+
+    Every field is an array with the given typecode, reachable as an attribute
+    of the store. Entity `i` is row `i` of every column.
+    """
+
+    def __init__(self, **fields):
+        self.columns = {}
+        for name, typecode in fields.items():
+            if hasattr(self, name):
+                raise ValueError(f"Field name '{name}' clashes with an EntityStore attribute")
+            column = array(typecode)
+            self.columns[name] = column
+            setattr(self, name, column)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def add(self, **values):
+        """Append an entity; fields that are not given start at 0. Returns its index"""
+        unknown = values.keys() - self.columns.keys()
+        if unknown:
+            raise KeyError(f"Unknown fields {sorted(unknown)}")
+        index = len(self)
+        try:
+            for name, column in self.columns.items():
+                column.append(values.get(name, 0))
+        except (OverflowError, TypeError):
+            self._truncate(index)  # keep the columns the same length
+            raise
+        return index
+
+    def extend(self, **columns):
+        """Append one entity per value in the given columns, e.g. from batch draws"""
+        count = len(next(iter(columns.values()), ()))
+        if any(len(values) != count for values in columns.values()):
+            raise ValueError("Columns must have the same length")
+        unknown = columns.keys() - self.columns.keys()
+        if unknown:
+            raise KeyError(f"Unknown fields {sorted(unknown)}")
+        size = len(self)
+        try:
+            for name, column in self.columns.items():
+                values = columns.get(name)
+                column.extend(values if values is not None else [0] * count)
+        except (OverflowError, TypeError):
+            self._truncate(size)
+            raise
+
+    def _truncate(self, size):
+        for column in self.columns.values():
+            del column[size:]
+
+    def row(self, index):
+        """All fields of one entity as a dict, e.g. for debugging or saving"""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def __reduce_ex__(self, protocol):
+        # With protocol 5 the columns can travel as out-of-band buffers (see savestate.py)
+        wrap = pickle.PickleBuffer if protocol >= 5 else bytes
+        typecodes = {name: column.typecode for name, column in self.columns.items()}
+        return _rebuild_store, (typecodes, [wrap(column) for column in self.columns.values()])
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+
+def _rebuild_store(typecodes, buffers):
+    store = EntityStore(**typecodes)
+    for column, buffer in zip(store.columns.values(), buffers):
+        column.frombytes(memoryview(buffer).cast("B"))
+    return store
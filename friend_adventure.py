@@ -6,6 +6,7 @@ from Colors.BrownColor import BrownColor
 from Colors.ElectricBlueColor import ElectricBlueColor
 
 from Friend import Friend
+from spatial_hash import SpatialHash
 from Abilities.MasterOfDisguise import MasterOfDisguise
 from Abilities.JokestersWit import JokestersWit
 from Colors.LightBlueColor import LightBlueColor
@@ -70,6 +71,10 @@ suen = Friend("Suen (Suenpai)", random_position(), MinMaxMastery(), ObjectivesCr
 # List to store friend characters
 friends = [phrits, mika, jordy, casper, roel, alex, rick, suen]  # Add your friends here
 
+# Spatial index so interaction checks only look at nearby friends
+friend_index = SpatialHash(cell_size=character_size[1])
+for friend in friends:
+    friend.set_spatial_index(friend_index)
 
 
 # Initial position for the player
@@ -100,7 +105,7 @@ while running:
 
 
     # Check for interactions with friends
-    for friend in friends:
+    for friend in friend_index.query_rect((your_character.x, your_character.y, 50, 50)):
         if (
             your_character.x < friend.x + 50
             and your_character.x + 50 > friend.x
@@ -0,0 +1,75 @@
+import pygame
+
+
+class PygameInput:
+    """Input source that reads straight from pygame's event queue and keyboard"""
+
+    def get_events(self):
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class KeyState:
+    """Pressed-key lookup that behaves like the result of pygame.key.get_pressed()"""
+
+    def __init__(self, held_keys):
+        self.held_keys = held_keys
+
+    def __getitem__(self, key):
+        return key in self.held_keys
+
+
+class ScriptedInput:
+    """Input source driven from code, used for headless runs and simulations"""
+
+    def __init__(self):
+        self.held_keys = set()
+        self.pending_events = []
+        self.key_state = KeyState(self.held_keys)
+
+    def post(self, event):
+        self.pending_events.append(event)
+
+    def press(self, key, unicode=None):
+        """Push a key down and keep it held until release() is called"""
+        self.held_keys.add(key)
+        self.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=self._unicode_for(key, unicode)))
+
+    def release(self, key):
+        self.held_keys.discard(key)
+        self.post(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def tap(self, key, unicode=None):
+        """Press and release a key within the same frame"""
+        self.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=self._unicode_for(key, unicode)))
+        self.post(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def type_text(self, text):
+        for char in text:
+            self.tap(ord(char), char)
+
+    def move_mouse(self, pos):
+        self.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+
+    def click(self, pos, button=1):
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+        self.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button))
+
+    def quit(self):
+        self.post(pygame.event.Event(pygame.QUIT))
+
+    def get_events(self):
+        events, self.pending_events = self.pending_events, []
+        return events
+
+    def get_pressed(self):
+        return self.key_state
+
+    @staticmethod
+    def _unicode_for(key, unicode):
+        if unicode is not None:
+            return unicode
+        # Letter and digit key constants match their ASCII codes
+        return chr(key) if 32 <= key < 127 else ""
@@ -0,0 +1,58 @@
+"""
+Headless engine support for QuestGame.
+
+Runs the regular handle_events/update/draw loop without a window, against an
+off-screen surface (or no renderer at all), with scripted input and a virtual
+clock that never sleeps. Used for balancing runs and CI where there is no display.
+"""
+
+import os
+
+from game_input import ScriptedInput
+
+
+class VirtualClock:
+    """Drop-in for pygame.time.Clock that advances simulated time without sleeping"""
+
+    def __init__(self):
+        self.time_ms = 0.0
+        self.frame_ms = 0.0
+        self.framerate = 0
+
+    def tick(self, framerate=0):
+        # Unlike pygame's Clock this returns exact (float) milliseconds so a
+        # simulated second is always exactly `framerate` frames long
+        self.framerate = framerate
+        self.frame_ms = 1000.0 / framerate if framerate else 0.0
+        self.time_ms += self.frame_ms
+        return self.frame_ms
+
+    def get_time(self):
+        return self.frame_ms
+
+    def get_fps(self):
+        return float(self.framerate)
+
+
+def create_headless_game(render=True, input_source=None, **kwargs):
+    """Create a QuestGame that runs without a display"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from game_engine import QuestGame
+
+    return QuestGame(headless=True, render=render,
+                     input_source=input_source or ScriptedInput(), **kwargs)
+
+
+def run_headless(game, frames, script=None):
+    """Step a headless game for a number of frames as fast as the CPU allows.
+
+    `script(frame, game)` is called before every frame and can inject input
+    through game.input. Returns the number of frames actually run.
+    """
+    for frame in range(frames):
+        if not game.running:
+            return frame
+        if script:
+            script(frame, game)
+        game.step()
+    return frames
@@ -0,0 +1,113 @@
+"""
+Batched hit-testing for mouse-driven mini-games.
+
+Each query tests a point against every entity in one call and returns the
+indices of all hits in entity order. Positions come in as columns, e.g. the
+arrays of an EntityStore. NumPy is used when it is installed. Without it the
+same queries run as plain Python loops. Regular layouts like the memory card
+grid are resolved by index arithmetic instead of testing every cell.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # optional; everything works without it, just slower for big swarms
+    np = None
+
+# Below this many entities a Python loop beats the cost of building NumPy views
+NUMPY_MIN_ENTITIES = 64
+
+
+def _column(values):
+    # array.array columns are viewed in their own dtype without copying;
+    # anything else is converted
+    typecode = getattr(values, "typecode", None)
+    if typecode is not None:
+        return np.frombuffer(values, dtype=typecode)
+    return np.asarray(values, dtype=np.int64)
+
+
+def _use_numpy(xs):
+    return np is not None and len(xs) >= NUMPY_MIN_ENTITIES
+
+
+def circle_hits(xs, ys, point, radius, skip=None):
+    """Indices of entities strictly within `radius` of `point`
+
+    Entities whose `skip` flag is set (e.g. already collected) are left out.
+    """
+    px, py = point
+    radius_sq = radius * radius
+    if _use_numpy(xs):
+        # Widened while subtracting, so squaring cannot overflow a narrow column
+        dx = np.subtract(_column(xs), px, dtype=np.int64)
+        dy = np.subtract(_column(ys), py, dtype=np.int64)
+        hit = dx * dx + dy * dy < radius_sq
+        if skip is not None:
+            hit &= _column(skip) == 0
+        return np.flatnonzero(hit).tolist()
+
+    hits = []
+    for i in range(len(xs)):
+        if skip is not None and skip[i]:
+            continue
+        dx = xs[i] - px
+        dy = ys[i] - py
+        if dx * dx + dy * dy < radius_sq:
+            hits.append(i)
+    return hits
+
+
+def rect_hits(xs, ys, size, point, skip=None):
+    """Indices of entities whose rect at (x, y) of `size` contains `point`, edges included"""
+    px, py = point
+    width, height = size
+    if _use_numpy(xs):
+        x = _column(xs)
+        y = _column(ys)
+        hit = (x <= px) & (px <= x + width) & (y <= py) & (py <= y + height)
+        if skip is not None:
+            hit &= _column(skip) == 0
+        return np.flatnonzero(hit).tolist()
+
+    hits = []
+    for i in range(len(xs)):
+        if skip is not None and skip[i]:
+            continue
+        x = xs[i]
+        y = ys[i]
+        if x <= px <= x + width and y <= py <= y + height:
+            hits.append(i)
+    return hits
+
+
+class GridLayout:
+    """Cells of `cell_size` laid out every `pitch` pixels from `origin`, row by row"""
+
+    def __init__(self, origin, cell_size, pitch, cols, rows):
+        self.origin = origin
+        self.cell_size = cell_size
+        self.pitch = pitch
+        self.cols = cols
+        self.rows = rows
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def position(self, index):
+        """Top-left corner of the cell with the given index"""
+        row, col = divmod(index, self.cols)
+        return (self.origin[0] + col * self.pitch[0], self.origin[1] + row * self.pitch[1])
+
+    def index_at(self, point):
+        """Index of the cell containing `point` (edges included), or None in a gap"""
+        dx = point[0] - self.origin[0]
+        dy = point[1] - self.origin[1]
+        if dx < 0 or dy < 0:
+            return None
+        col, x_in_cell = divmod(dx, self.pitch[0])
+        row, y_in_cell = divmod(dy, self.pitch[1])
+        if col >= self.cols or row >= self.rows:
+            return None
+        if x_in_cell > self.cell_size[0] or y_in_cell > self.cell_size[1]:
+            return None
+        return int(row * self.cols + col)
@@ -0,0 +1,150 @@
+"""
+Retained-mode HUD widgets.
+
+Each widget holds its rendered surface and only re-renders when the value it
+shows changes. Value widgets are bound to an observed attribute (see
+observable.py) and are pushed the new value by its setter, so a frame on which
+no stat changed costs a blit per widget and nothing else: no string
+formatting, no text rendering, no surface allocation.
+
+Widgets are DirtySprites, so they can sit in a LayeredDirty group (the
+overworld HUD) or be blitted directly (the mini-game HUD).
+"""
+
+import pygame
+
+_bar_surfaces = {}
+
+
+def bar_surface(fill_width, width, height, back_color, fill_color):
+    """Pre-rendered progress bar, shared by every bar showing the same fill"""
+    fill_width = max(0, fill_width)
+    key = (fill_width, width, height, back_color, fill_color)
+    surface = _bar_surfaces.get(key)
+    if surface is None:
+        # Overfilled bars (e.g. happiness above 100) spill past the red background
+        surface = pygame.Surface((max(width, fill_width), height), pygame.SRCALPHA)
+        pygame.draw.rect(surface, back_color, (0, 0, width, height))
+        pygame.draw.rect(surface, fill_color, (0, 0, fill_width, height))
+        _bar_surfaces[key] = surface
+    return surface
+
+
+def framed_bar_surface(fill_width, width, height, back_color, fill_color, frame_color, frame_width=2):
+    """Progress bar with a frame, as used by the energy and mini-game progress bars"""
+    key = (fill_width, width, height, back_color, fill_color, frame_color, frame_width)
+    surface = _bar_surfaces.get(key)
+    if surface is None:
+        surface = bar_surface(fill_width, width, height, back_color, fill_color).copy()
+        pygame.draw.rect(surface, frame_color, (0, 0, width, height), frame_width)
+        _bar_surfaces[key] = surface
+    return surface
+
+
+class Bound:
+    """Mixin for widgets that follow an observed attribute through set_value()"""
+
+    binding = None
+
+    def bind(self, source, name):
+        """Follow observed attribute `name` of `source`"""
+        self.unbind()
+        self.binding = (source, name)
+        source.observe(name, self.set_value)
+        self.set_value(getattr(source, name), force=True)
+
+    def unbind(self):
+        if self.binding:
+            source, name = self.binding
+            source.unobserve(name, self.set_value)
+            self.binding = None
+
+
+class Label(pygame.sprite.DirtySprite):
+    """Fixed text at a position; `anchor` names the rect point `position` refers to"""
+
+    def __init__(self, text_cache, font, color, position, text, anchor="topleft"):
+        super().__init__()
+        self.text_cache = text_cache
+        self.font = font
+        self.color = color
+        self.position = position
+        self.anchor = anchor
+        self.text = None
+        self.rect = pygame.Rect(position, (0, 0))
+        self.set_text(text)
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.image = self.text_cache.render(self.font, text, True, self.color)
+            self.rect = self.image.get_rect(**{self.anchor: self.position})
+            self.dirty = 1
+
+
+class ValueLabel(Bound, Label):
+    """Text made from a value with `format(value)`, re-rendered only when the value changes"""
+
+    def __init__(self, text_cache, font, color, position, format, source=None, name=None):
+        self.format = format
+        self.value = None
+        super().__init__(text_cache, font, color, position, "")
+        if source is not None:
+            self.bind(source, name)
+
+    def set_value(self, value, force=False):
+        if force or value != self.value:
+            self.value = value
+            self.set_text(self.format(value))
+
+
+class ValueBar(Bound, pygame.sprite.DirtySprite):
+    """Framed progress bar showing value/maximum, re-rendered only when its fill width changes"""
+
+    def __init__(self, position, size, colors, maximum, source=None, name=None, frame_width=2):
+        super().__init__()
+        self.width, self.height = size
+        self.back_color, self.fill_color, self.frame_color = colors
+        self.maximum = maximum
+        self.frame_width = frame_width
+        self.fill_width = None
+        self.rect = pygame.Rect(position, size)
+        if source is not None:
+            self.bind(source, name)
+
+    def set_value(self, value, force=False):
+        fill_width = int(self.width * value / self.maximum)
+        if force or fill_width != self.fill_width:
+            self.fill_width = fill_width
+            self.image = framed_bar_surface(fill_width, self.width, self.height, self.back_color,
+                                            self.fill_color, self.frame_color, self.frame_width)
+            self.dirty = 1
+
+
+class MiniGameHud:
+    """Title, progress bar, progress count and timer shown above every mini-game"""
+
+    def __init__(self, game, mini_game, friend_name):
+        text_cache = game.text_cache
+        small_font = game.small_font
+        self.timer = ValueLabel(text_cache, small_font, game.BLACK, (50, 50), "Time: {:.1f}s".format)
+        self.widgets = [
+            Label(text_cache, game.font, game.BLACK, (game.WIDTH // 2, 100),
+                  f"Helping {friend_name}!", anchor="center"),
+            ValueBar(((game.WIDTH - 400) // 2, 300), (400, 40), (game.RED, game.GREEN, game.BLACK),
+                     mini_game.target, mini_game, "progress", frame_width=3),
+            Label(text_cache, small_font, game.BLACK, (game.WIDTH // 2, 400),
+                  mini_game.instruction, anchor="center"),
+            self.timer,
+            ValueLabel(text_cache, small_font, game.BLACK, (50, 80),
+                       lambda progress: f"Progress: {int(progress)}/{mini_game.target}",
+                       mini_game, "progress"),
+        ]
+        self.mini_game = mini_game
+
+    def draw(self, screen):
+        # The timer is pushed rather than observed: it changes every step, but
+        # its text only every few frames
+        self.timer.set_value(round(self.mini_game.time_left(), 1))
+        for widget in self.widgets:
+            screen.blit(widget.image, widget.rect)
@@ -15,6 +15,7 @@ Controls:
 - WASD or Arrow Keys: Move around
 - Space: Interact in mini-games
 - Y/N: Accept/Decline quests
+- F5/F9: Save/Load the game
 
 How to Play:
 1. Walk near friends (they glow when they have quests)
@@ -39,7 +40,31 @@ try:
     print("Loading game...")
     
     # Create and run the game
-    game = QuestGame()
+    save_path = os.environ.get("IYKWIM_SAVE")
+    if save_path:
+        # Kiosk mode: resume where the last session left off and keep saving
+        game = QuestGame(save_path=save_path, autosave=30)
+        try:
+            if game.load_state():
+                print(f"💾 Resumed from {save_path}")
+        except Exception as e:
+            print(f"⚠️ Could not resume from {save_path} ({e}), starting fresh")
+    else:
+        # F5/F9 quicksave in the per-user data directory, never the working directory
+        from savestate import user_save_path
+        game = QuestGame(save_path=user_save_path())
+    record_path = os.environ.get("IYKWIM_RECORD")
+    if record_path:
+        # Capture the session so it can be replayed with replay.py
+        from replay import InputRecorder
+        InputRecorder(record_path).attach(game)
+        print(f"⏺️ Recording input to {record_path}")
+    profile_path = os.environ.get("IYKWIM_PROFILE")
+    if profile_path:
+        # Export frame timings (.csv or .json) when the game exits
+        import atexit
+        game.profiler.enabled = True
+        atexit.register(lambda: game.profiler.export(profile_path))
     print("✅ Game loaded successfully!")
     print("💡 Tip: Walk near friends to help them with their objectives!")
     game.run()
@@ -56,6 +81,7 @@ except ImportError as e:
     
 except FileNotFoundError as e:
     print(f"❌ File Error: {e}")
+    print("Make sure the friend roster exists at resources/roster.json")
     print("Make sure all image files are in resources/cutout/:")
     print("- thijs.png (player)")
     print("- alex.png, casper.png, gurdy.png, mika.png")
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Networked multiplayer overworld.
+
+MultiplayerServer is an asyncio TCP server that owns the shared world. The
+friends and their quest state come from a logic-only QuestGame built from the
+server's seed, and the server moves every connected player from the movement
+keys they hold. Clients send their held keys and the quests they finish, and
+receive state updates (wire format in net_protocol.py):
+- updates go out SEND_HZ times a second, delta-compressed against what each
+  client was sent before, with quantized positions
+- interest management: a client only hears about the players and friends in
+  its view plus INTEREST_MARGIN, and about at most MAX_VISIBLE_PLAYERS of the
+  nearest players, so bandwidth and server work per player stay bounded
+  however many players join
+- a client whose connection backs up is skipped until it drains; its next
+  update then carries everything it missed
+
+Mini-games are played on the client. The server accepts a finished quest only
+from a player standing at that friend while the quest is still open, and then
+marks it done for everyone.
+
+Usage:
+    python multiplayer.py serve [--port 8765] [--seed 1] [--friends 8]
+    python multiplayer.py play [--host 127.0.0.1] [--port 8765]
+    python multiplayer.py loadtest [--players 200] [--seconds 10] [--friends 500]
+"""
+
+import argparse
+import asyncio
+import heapq
+import os
+import sys
+import threading
+from time import perf_counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from camera import Camera  # noqa: E402
+from net_protocol import (  # noqa: E402
+    HELLO, INPUT, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MSG_HELLO, MSG_INPUT, MSG_QUEST_DONE, MSG_RESYNC,
+    MSG_UPDATE, MSG_WELCOME, PROTOCOL_VERSION, QUEST_DONE, RECORD_DELTA, RESYNC, WELCOME, ProtocolError,
+    decode_update, dequantize, encode_update, frame, message_type, quantize, read_frame, unpack,
+)
+from spatial_hash import SpatialHash  # noqa: E402
+
+DEFAULT_PORT = 8765
+SEND_HZ = 20
+INTEREST_MARGIN = 200  # pixels around a client's view that it still hears about
+MAX_VISIBLE_PLAYERS = 32
+MAX_BUFFERED_BYTES = 64 * 1024  # skip updates to a client with this much unsent data
+QUEST_REACH = 150  # how far from a friend a player may be when finishing its quest
+
+
+def held_bits(keys):
+    """Movement bits for a pygame.key.get_pressed()-style lookup"""
+    return ((MOVE_LEFT if keys[pygame.K_LEFT] or keys[pygame.K_a] else 0)
+            | (MOVE_RIGHT if keys[pygame.K_RIGHT] or keys[pygame.K_d] else 0)
+            | (MOVE_UP if keys[pygame.K_UP] or keys[pygame.K_w] else 0)
+            | (MOVE_DOWN if keys[pygame.K_DOWN] or keys[pygame.K_s] else 0))
+
+
+class RemotePlayer:
+    """A connected player, as the server sees them"""
+
+    __slots__ = ("id", "rect", "held", "input_seq", "score", "writer", "camera",
+                 "known_players", "known_friends", "sent_input_seq", "sent_score")
+
+    def __init__(self, player_id, rect, writer, camera):
+        self.id = player_id
+        self.rect = rect
+        self.held = 0
+        self.input_seq = 0
+        self.score = 0
+        self.writer = writer
+        self.camera = camera
+        # What this client was last sent: player id -> quantized position, friend id -> state
+        self.known_players = {}
+        self.known_friends = {}
+        self.sent_input_seq = 0
+        self.sent_score = 0
+
+
+class MultiplayerServer:
+    def __init__(self, seed=1, friend_count=None, world_size=None, tick_hz=60, send_hz=SEND_HZ):
+        from headless import create_headless_game
+
+        self.world = create_headless_game(render=False, seed=seed, friend_count=friend_count,
+                                          world_size=world_size)
+        # Positions go out as u16 quantized coordinates
+        largest = dequantize(0xFFFF)
+        if self.world.WORLD_WIDTH > largest or self.world.WORLD_HEIGHT > largest:
+            raise ValueError(f"A {self.world.WORLD_WIDTH}x{self.world.WORLD_HEIGHT} world is too big for the "
+                             f"protocol, which reaches {largest} pixels")
+        self.friend_ids = {friend: i for i, friend in enumerate(self.world.friends)}
+        self.spawn_rng = self.world.rng.stream("spawn")
+        self.players = {}
+        self.player_index = SpatialHash(cell_size=256)
+        self.free_ids = list(range(0xFFFF, 0, -1))
+        self.tick_hz = tick_hz
+        self.send_every = max(1, round(tick_hz / send_hz))
+        self.ticks = 0
+        self.busy_seconds = 0.0
+        self.bytes_sent = 0
+        self.server = None
+        self.handlers = set()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def stop(self):
+        """Stop listening and disconnect everybody, waiting for their handlers to finish"""
+        self.server.close()
+        for player in self.players.values():
+            player.writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle_client(self, reader, writer):
+        player = None
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            payload = await read_frame(reader)
+            if message_type(payload) != MSG_HELLO or unpack(HELLO, payload)[1] != PROTOCOL_VERSION:
+                return
+            player = self.join(writer)
+            world = self.world
+            writer.write(frame(WELCOME.pack(MSG_WELCOME, player.id, world.seed, world.friend_count or 0,
+                                            *(world.world_size or (0, 0)))))
+            while True:
+                self.handle_message(player, await read_frame(reader))
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass  # a client that sends garbage is disconnected like one that hangs up
+        finally:
+            if player is not None:
+                self.leave(player)
+            writer.close()
+            self.handlers.discard(task)
+
+    def handle_message(self, player, payload):
+        kind = message_type(payload)
+        if kind == MSG_INPUT:
+            _, player.input_seq, player.held = unpack(INPUT, payload)
+        elif kind == MSG_QUEST_DONE:
+            _, friend_id, success = unpack(QUEST_DONE, payload)
+            self.finish_quest(player, friend_id, success)
+        elif kind == MSG_RESYNC:
+            # Everything in view goes out again as full records in the next update
+            _, player.input_seq = unpack(RESYNC, payload)
+            player.known_players.clear()
+            player.known_friends.clear()
+        else:
+            raise ProtocolError(f"Unexpected message type {kind}")
+
+    def join(self, writer):
+        world = self.world
+        rect = pygame.Rect((0, 0), world.character_size)
+        # Spread spawns out so a crowd does not start inside everybody's view
+        rect.x = self.spawn_rng.randrange(world.WORLD_WIDTH - rect.width)
+        rect.y = self.spawn_rng.randrange(world.WORLD_HEIGHT - rect.height)
+        camera = Camera((world.WIDTH, world.HEIGHT), (world.WORLD_WIDTH, world.WORLD_HEIGHT))
+        player = RemotePlayer(self.free_ids.pop(), rect, writer, camera)
+        self.players[player.id] = player
+        self.player_index.insert(player, rect)
+        return player
+
+    def leave(self, player):
+        # Other clients drop the player from their view on their next update
+        del self.players[player.id]
+        self.player_index.remove(player)
+        self.free_ids.append(player.id)
+
+    def finish_quest(self, player, friend_id, success):
+        friends = self.world.friends
+        if friend_id >= len(friends):
+            return
+        friend = friends[friend_id]
+        reach = player.rect.inflate(2 * QUEST_REACH, 2 * QUEST_REACH)
+        if friend.quest_completed or not reach.colliderect(friend.get_rect()):
+            return
+        if success:
+            friend.quest_completed = True
+            friend.happiness += 20
+            player.score += 100
+        else:
+            friend.happiness += 5
+            player.score += 25
+
+    def step(self):
+        """Move every player by the keys they hold, as update_playing does for the local player"""
+        world = self.world
+        speed = world.player_speed
+        max_x = world.WORLD_WIDTH - world.character_size[0]
+        max_y = world.WORLD_HEIGHT - world.character_size[1]
+        for player in self.players.values():
+            held = player.held
+            if not held:
+                continue
+            rect = player.rect
+            rect.x = max(0, min(rect.x + speed * ((held & MOVE_RIGHT > 0) - (held & MOVE_LEFT > 0)), max_x))
+            rect.y = max(0, min(rect.y + speed * ((held & MOVE_DOWN > 0) - (held & MOVE_UP > 0)), max_y))
+            self.player_index.move(player, rect)
+
+    def build_update(self, player):
+        """The update for one client, or None when it has nothing new"""
+        camera = player.camera
+        camera.follow(player.rect.center)
+        view = camera.view_rect.inflate(2 * INTEREST_MARGIN, 2 * INTEREST_MARGIN)
+
+        nearby = self.player_index.query_rect(view)
+        if len(nearby) > MAX_VISIBLE_PLAYERS:
+            cx, cy = player.rect.center
+            nearby = heapq.nsmallest(MAX_VISIBLE_PLAYERS, nearby,
+                                     key=lambda other: (other.rect.centerx - cx) ** 2 + (other.rect.centery - cy) ** 2)
+        known = player.known_players
+        records = []
+        visible = set()
+        for other in nearby:
+            visible.add(other.id)
+            position = (quantize(other.rect.x), quantize(other.rect.y))
+            previous = known.get(other.id)
+            if position != previous:
+                records.append((other.id, position[0], position[1], previous))
+                known[other.id] = position
+        gone = [player_id for player_id in known if player_id not in visible]
+        for player_id in gone:
+            del known[player_id]
+
+        known_friends = player.known_friends
+        friends = []
+        for friend in self.world.friend_index.query_rect(view):
+            state = (int(friend.quest_completed), friend.happiness)
+            friend_id = self.friend_ids[friend]
+            if known_friends.get(friend_id) != state:
+                known_friends[friend_id] = state
+                friends.append((friend_id, *state))
+
+        if not (records or gone or friends) and (player.input_seq, player.score) == (player.sent_input_seq,
+                                                                                     player.sent_score):
+            return None
+        player.sent_input_seq = player.input_seq
+        player.sent_score = player.score
+        return encode_update(self.ticks, player.input_seq, player.score, records, gone, friends)
+
+    def send_updates(self):
+        for player in self.players.values():
+            writer = player.writer
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                continue
+            payload = self.build_update(player)
+            if payload is not None:
+                data = frame(payload)
+                writer.write(data)
+                self.bytes_sent += len(data)
+
+    async def run(self, duration=None):
+        """Simulate at tick_hz and send updates at SEND_HZ, for `duration` seconds or forever"""
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_hz
+        deadline = loop.time()
+        end = deadline + duration if duration is not None else None
+        while end is None or loop.time() < end:
+            start = perf_counter()
+            self.step()
+            self.ticks += 1
+            if self.ticks % self.send_every == 0:
+                self.send_updates()
+            self.busy_seconds += perf_counter() - start
+
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < 0:
+                deadline = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+
+
+class MultiplayerClient:
+    """Client-side replica of what the server sends about the world around us"""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.player_id = None
+        self.world = None  # engine options to build the same world: seed, friend_count, world_size
+        self.players = {}  # player id -> quantized position
+        self.friends = {}  # friend id -> (quest completed, happiness)
+        self.changed_friends = set()
+        self.tick = 0
+        self.input_seq = 0
+        self.acked_input_seq = 0
+        self.resync_seq = 0  # input sequence of our last resync request
+        self.resyncs = 0
+        self.score = 0
+        self.updates = 0
+        self.bytes_received = 0
+        # Updates arrive on the network thread when used through MultiplayerLink
+        self.lock = threading.Lock()
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(frame(HELLO.pack(MSG_HELLO, PROTOCOL_VERSION)))
+        payload = await read_frame(self.reader)
+        if message_type(payload) != MSG_WELCOME:
+            raise ProtocolError("Unexpected reply from server")
+        _, self.player_id, seed, friend_count, world_width, world_height = unpack(WELCOME, payload)
+        self.world = dict(seed=seed, friend_count=friend_count or None,
+                          world_size=(world_width, world_height) if world_width else None)
+        return self
+
+    async def listen(self):
+        """Apply updates until the server goes away or sends something malformed"""
+        try:
+            while True:
+                payload = await read_frame(self.reader)
+                self.bytes_received += len(payload) + 2
+                if message_type(payload) != MSG_UPDATE:
+                    raise ProtocolError(f"Unexpected message type {payload[0]}")
+                self.apply_update(payload)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            self.writer.close()
+
+    def apply_update(self, payload):
+        tick, input_seq, score, players, gone, friends = decode_update(payload)
+        with self.lock:
+            known = self.players
+            lost = False
+            for kind, player_id, x, y in players:
+                if kind == RECORD_DELTA:
+                    if player_id not in known:
+                        lost = True
+                        continue
+                    old_x, old_y = known[player_id]
+                    known[player_id] = (old_x + x, old_y + y)
+                else:
+                    known[player_id] = (x, y)
+            for player_id in gone:
+                known.pop(player_id, None)
+            for friend_id, completed, happiness in friends:
+                self.friends[friend_id] = (completed, happiness)
+                self.changed_friends.add(friend_id)
+            self.tick = tick
+            self.acked_input_seq = input_seq
+            self.score = score
+            self.updates += 1
+            # Deltas sent before the server saw our resync request may still refer to players we dropped
+            if lost and input_seq >= self.resync_seq:
+                self.request_resync()
+
+    def request_resync(self):
+        """Drop what we know of the other players and have the server send it all again"""
+        self.input_seq += 1
+        self.resync_seq = self.input_seq
+        self.resyncs += 1
+        self.players.clear()
+        self.writer.write(frame(RESYNC.pack(MSG_RESYNC, self.input_seq)))
+
+    def send_input(self, held):
+        self.input_seq += 1
+        self.writer.write(frame(INPUT.pack(MSG_INPUT, self.input_seq, held)))
+
+    def finish_quest(self, friend_id, success=True):
+        self.writer.write(frame(QUEST_DONE.pack(MSG_QUEST_DONE, friend_id, int(success))))
+
+    def positions(self):
+        """World positions of every player in view, including ours, by player id"""
+        with self.lock:
+            return {player_id: (dequantize(x), dequantize(y)) for player_id, (x, y) in self.players.items()}
+
+    def take_friend_changes(self):
+        """(friend id, quest completed, happiness) for friends changed since the last call"""
+        with self.lock:
+            changes = [(friend_id, *self.friends[friend_id]) for friend_id in self.changed_friends]
+            self.changed_friends.clear()
+        return changes
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class _LinkedInput:
+    """Input source wrapper that syncs the game with the server once per frame"""
+
+    def __init__(self, source, link):
+        self.source = source
+        self.link = link
+
+    def get_events(self):
+        self.link.sync()
+        return self.source.get_events()
+
+    def get_pressed(self):
+        return self.source.get_pressed()
+
+
+class MultiplayerLink:
+    """Plays a QuestGame on a server; networking runs on an asyncio loop in a background thread
+
+    The local game still moves the player right away. The server's position
+    wins when the two drift more than SNAP_DISTANCE apart.
+    """
+
+    SNAP_DISTANCE = 96
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.client = MultiplayerClient()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self.client.connect(host, port), self.loop).result(timeout=10)
+        asyncio.run_coroutine_threadsafe(self.client.listen(), self.loop)
+        self.game = None
+        self.friends = None
+        self.held = None
+
+    def attach(self, game):
+        self.game = game
+        game.input = _LinkedInput(game.input, self)
+        game.engine_options.update(input_source=game.input)
+        return self
+
+    def sync(self):
+        game = self.game
+        if game.friends is not self.friends:
+            # New or restarted game: follow it, and take the whole server state again
+            self.friends = game.friends
+            game.observe("quest_completed", self.quest_completed)
+            with self.client.lock:
+                self.client.changed_friends.update(self.client.friends)
+
+        held = held_bits(game.input.get_pressed()) if game.state.name == "PLAYING" else 0
+        if held != self.held:
+            self.held = held
+            self.loop.call_soon_threadsafe(self.client.send_input, held)
+
+        for friend_id, completed, happiness in self.client.take_friend_changes():
+            if friend_id >= len(game.friends):
+                continue  # the server's world has more friends than ours
+            friend = game.friends[friend_id]
+            friend.happiness = happiness
+            friend.quest_completed = bool(completed)
+            if completed and friend.name not in game.completed_friends:
+                game.completed_friends.add(friend.name)
+                game.notify("completed_friends", game.completed_friends)
+
+        positions = self.client.positions()
+        own = positions.pop(self.client.player_id, None)
+        if own is not None:
+            dx, dy = own[0] - game.player.x, own[1] - game.player.y
+            if dx * dx + dy * dy > self.SNAP_DISTANCE ** 2:
+                game.player.topleft = own
+        overworld = game.overworld
+        if overworld is not None:
+            for player_id in [player_id for player_id in overworld.remote_sprites if player_id not in positions]:
+                overworld.hide_remote_player(player_id)
+            for player_id, position in positions.items():
+                overworld.show_remote_player(player_id, position)
+
+    def quest_completed(self, friend):
+        self.loop.call_soon_threadsafe(self.client.finish_quest, self.game.friends.index(friend))
+
+
+async def load_test(players, seconds, friend_count, seed):
+    """A server and `players` wandering bot clients over localhost; returns the measurements"""
+    import random
+
+    server = MultiplayerServer(seed=seed, friend_count=friend_count)
+    await server.start(port=0)
+    clients = [await MultiplayerClient().connect(port=server.port) for _ in range(players)]
+    listeners = [asyncio.ensure_future(client.listen()) for client in clients]
+
+    async def wander(client, rng):
+        while True:
+            client.send_input(rng.choice((MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MOVE_DOWN, MOVE_LEFT | MOVE_UP,
+                                          MOVE_RIGHT | MOVE_DOWN, 0)))
+            await asyncio.sleep(rng.uniform(0.3, 1.5))
+
+    walkers = [asyncio.ensure_future(wander(client, random.Random(i))) for i, client in enumerate(clients)]
+    await server.run(duration=seconds)
+    for task in walkers + listeners:
+        task.cancel()
+    await asyncio.gather(*walkers, *listeners, return_exceptions=True)
+    for client in clients:
+        await client.close()
+    await server.stop()
+
+    ticks = max(1, server.ticks)
+    return {
+        "players": players,
+        "ticks": server.ticks,
+        "server_ms_per_tick": server.busy_seconds / ticks * 1000,
+        "server_us_per_player_tick": server.busy_seconds / ticks / players * 1e6,
+        "bytes_per_player_per_second": server.bytes_sent / players / seconds,
+        "updates_per_client": sum(client.updates for client in clients) / players,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("serve", "play", "loadtest"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--friends", type=int, default=None, help="friends in the shared world (default: the roster)")
+    parser.add_argument("--players", type=int, default=200, help="bot clients for loadtest")
+    parser.add_argument("--seconds", type=float, default=10.0, help="loadtest duration")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.mode == "serve":
+        async def serve():
+            server = MultiplayerServer(seed=args.seed, friend_count=args.friends)
+            await server.start(args.host, args.port)
+            print(f"Serving seed {args.seed} on {args.host}:{server.port}")
+            await server.run()
+        asyncio.run(serve())
+    elif args.mode == "play":
+        from game_engine import QuestGame
+
+        link = MultiplayerLink(args.host, args.port)
+        game = QuestGame(**link.client.world)
+        link.attach(game)
+        game.run()
+    else:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        results = asyncio.run(load_test(args.players, args.seconds, args.friends, args.seed))
+        print(f"{results['players']} players, {results['ticks']} ticks: "
+              f"{results['server_ms_per_tick']:.2f} ms server time per tick, "
+              f"{results['server_us_per_player_tick']:.1f} us per player, "
+              f"{results['bytes_per_player_per_second']:.0f} B/s per player, "
+              f"{results['updates_per_client']:.0f} updates per client")
+
+
+if __name__ == "__main__":
+    main()
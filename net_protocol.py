@@ -0,0 +1,135 @@
+"""
+Wire format for multiplayer (see multiplayer.py).
+
+Every message is a frame: a little-endian u16 payload length followed by the
+payload, whose first byte is the message type. Positions are quantized to
+QUANTUM world pixels and sent as u16.
+
+State updates are delta-compressed per client. The server remembers what it
+last sent each client and only sends what changed since: a player that moved a
+little is a 5-byte delta record, one that moved far or just came into view is
+a 7-byte full record, and friends are only sent when their quest state or
+happiness changed. TCP delivers every update in order, so the server's memory
+of the client's state is always exact and no acknowledgements are needed. A
+client that still loses track (a delta for a player it does not know) asks for
+a resync, and the server forgets what it sent that client and starts over with
+full records.
+"""
+
+import struct
+
+PROTOCOL_VERSION = 1
+QUANTUM = 2  # world pixels per position unit
+
+FRAME_HEADER = struct.Struct("<H")
+MAX_FRAME = 0xFFFF
+
+# Client -> server
+MSG_HELLO = 1
+MSG_INPUT = 2
+MSG_QUEST_DONE = 3
+MSG_RESYNC = 4
+# Server -> client
+MSG_WELCOME = 10
+MSG_UPDATE = 11
+
+HELLO = struct.Struct("<BH")  # type, protocol version
+INPUT = struct.Struct("<BIB")  # type, input sequence, held movement bits
+QUEST_DONE = struct.Struct("<BHB")  # type, friend id, success
+RESYNC = struct.Struct("<BI")  # type, input sequence (acknowledged in UPDATE like an INPUT's)
+WELCOME = struct.Struct("<BHQIII")  # type, player id, seed, friend count, world width, world height
+# type, tick, last input sequence applied, score, player records, players gone, friend records
+UPDATE = struct.Struct("<BIIIHHH")
+PLAYER_FULL = struct.Struct("<BHHH")  # kind, player id, x, y
+PLAYER_DELTA = struct.Struct("<BHbb")  # kind, player id, dx, dy
+PLAYER_GONE = struct.Struct("<H")  # player id
+FRIEND = struct.Struct("<HBB")  # friend id, quest completed, happiness (clamped to 0..255)
+
+RECORD_FULL = 0
+RECORD_DELTA = 1
+
+# Held movement bits in INPUT
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+
+
+class ProtocolError(ValueError):
+    """A message that is malformed or not expected at this point"""
+
+
+def message_type(payload):
+    if not payload:
+        raise ProtocolError("Empty message")
+    return payload[0]
+
+
+def unpack(message, payload):
+    """Fields of a fixed-size message, checking its length first"""
+    if len(payload) != message.size:
+        raise ProtocolError(f"Message type {message_type(payload)} should be {message.size} bytes, not {len(payload)}")
+    return message.unpack(payload)
+
+
+def quantize(value):
+    return int(value) // QUANTUM
+
+
+def dequantize(value):
+    return value * QUANTUM
+
+
+def frame(payload):
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f"Message of {len(payload)} bytes does not fit in a frame")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader):
+    """Next message payload from an asyncio StreamReader; raises IncompleteReadError at EOF"""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    return await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+
+
+def encode_update(tick, input_seq, score, players, gone, friends):
+    """players: (id, qx, qy, previous (qx, qy) or None); gone: ids; friends: (id, completed, happiness)"""
+    parts = [UPDATE.pack(MSG_UPDATE, tick, input_seq, score, len(players), len(gone), len(friends))]
+    for player_id, qx, qy, previous in players:
+        if previous is not None:
+            dx, dy = qx - previous[0], qy - previous[1]
+            if -128 <= dx <= 127 and -128 <= dy <= 127:
+                parts.append(PLAYER_DELTA.pack(RECORD_DELTA, player_id, dx, dy))
+                continue
+        parts.append(PLAYER_FULL.pack(RECORD_FULL, player_id, qx, qy))
+    parts.extend(PLAYER_GONE.pack(player_id) for player_id in gone)
+    parts.extend(FRIEND.pack(friend_id, completed, max(0, min(255, happiness)))
+                 for friend_id, completed, happiness in friends)
+    return b"".join(parts)
+
+
+def decode_update(payload):
+    """Inverse of encode_update; player records come back as (kind, id, x or dx, y or dy)"""
+    try:
+        return _decode_update(payload)
+    except (IndexError, struct.error) as e:
+        raise ProtocolError(f"Truncated update: {e}") from None
+
+
+def _decode_update(payload):
+    _, tick, input_seq, score, player_count, gone_count, friend_count = UPDATE.unpack_from(payload)
+    offset = UPDATE.size
+    players = []
+    for _ in range(player_count):
+        if payload[offset] == RECORD_DELTA:
+            players.append(PLAYER_DELTA.unpack_from(payload, offset))
+            offset += PLAYER_DELTA.size
+        else:
+            players.append(PLAYER_FULL.unpack_from(payload, offset))
+            offset += PLAYER_FULL.size
+    gone = [PLAYER_GONE.unpack_from(payload, offset + i * PLAYER_GONE.size)[0] for i in range(gone_count)]
+    offset += gone_count * PLAYER_GONE.size
+    friends = [FRIEND.unpack_from(payload, offset + i * FRIEND.size) for i in range(friend_count)]
+    if offset + friend_count * FRIEND.size != len(payload):
+        raise ProtocolError("Update has trailing bytes")
+    return tick, input_seq, score, players, gone, friends
@@ -0,0 +1,60 @@
+"""
+Change notifications for game state.
+
+Attributes declared with `observed()` on an Observable class call back their
+observers whenever they are assigned a different value. The HUD binds its
+widgets this way, so a label or bar is only re-rendered on the frame its value
+actually changes instead of being reformatted every frame.
+"""
+
+
+class observed:
+    """Attribute that notifies the owner's observers when its value changes
+
+    The value lives in the instance __dict__ under the same name, so reading
+    it costs one dict lookup.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        values = obj.__dict__
+        name = self.name
+        changed = name not in values or values[name] != value
+        values[name] = value
+        if changed and obj._observers:
+            obj.notify(name, value)
+
+
+class Observable:
+    """Mixin for classes with observed attributes"""
+
+    _observers = None  # attribute name -> list of callbacks, created on first observe()
+
+    def observe(self, name, callback):
+        """Call callback(value) whenever attribute `name` changes"""
+        if self._observers is None:
+            self._observers = {}
+        self._observers.setdefault(name, []).append(callback)
+
+    def unobserve(self, name, callback):
+        callbacks = self._observers.get(name, []) if self._observers else []
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def notify(self, name, value):
+        """Tell the observers of `name` about its new value, e.g. after mutating it in place"""
+        for callback in self._observers.get(name, ()) if self._observers else ():
+            callback(value)
+
+    def clear_observers(self):
+        self._observers = None
@@ -0,0 +1,279 @@
+"""
+Layered sprite scene for the overworld.
+
+Every friend is drawn by three DirtySprites sharing a layer: its glow, its body
+and its happiness bar. Glow and bar surfaces are pre-rendered and shared, so the
+overworld allocates no surfaces per frame. Layers follow the bottom edge of each
+character, which gives z-ordering by y, and LayeredDirty only repaints sprites
+that were marked dirty.
+
+The world can be larger than the screen. Only friends inside the camera view
+have sprites in the group; the rest are culled, so drawing cost depends on what
+is visible rather than on the total number of friends.
+"""
+
+import pygame
+
+from hud import Bound, Label, ValueBar, ValueLabel, bar_surface
+
+HUD_LAYER = 1 << 30
+# Glow and happiness bar stick out of a friend's rect by up to this much
+CULL_MARGIN = 32
+GLOW_SIZE = 80
+BAR_WIDTH = 50
+BAR_HEIGHT = 8
+
+_glow_surfaces = {}
+
+
+def glow_surface(color):
+    """Pre-rendered translucent glow for a friend's color, shared per color"""
+    surface = _glow_surfaces.get(color)
+    if surface is None:
+        surface = pygame.Surface((GLOW_SIZE, GLOW_SIZE), pygame.SRCALPHA)
+        radius = GLOW_SIZE // 2
+        pygame.draw.circle(surface, (*color, 100), (radius, radius), radius)
+        _glow_surfaces[color] = surface
+    return surface
+
+
+class WorldSprite(pygame.sprite.DirtySprite):
+    """Sprite at `world_pos` in the world, drawn relative to the camera"""
+
+    def __init__(self):
+        super().__init__()
+        self.placed_at = None
+        self.offset = None
+
+    def place(self, offset, redraw=True):
+        """Position on screen for a camera offset; `redraw=False` when the frame was scrolled along"""
+        self.offset = offset
+        self.placed_at = self.world_pos
+        self.rect.topleft = (self.placed_at[0] - offset[0], self.placed_at[1] - offset[1])
+        if redraw:
+            self.dirty = 1
+
+
+class FriendPartSprite(WorldSprite):
+    """Sprite drawn at a fixed distance from a friend, following the friend when it moves"""
+
+    def __init__(self, friend, anchor):
+        super().__init__()
+        self.friend = friend
+        self.anchor = anchor
+
+    @property
+    def world_pos(self):
+        return (self.friend.x + self.anchor[0], self.friend.y + self.anchor[1])
+
+    def update(self):
+        if self.offset is not None and self.world_pos != self.placed_at:
+            self.place(self.offset)
+            for group in self.groups():
+                group.change_layer(self, self.friend.get_rect().bottom)
+
+
+class GlowSprite(FriendPartSprite):
+    def __init__(self, friend):
+        super().__init__(friend, (-8, -8))
+        self.image = glow_surface(friend.color_strategy.get_color())
+        self.rect = self.image.get_rect()
+        self.visible = int(not friend.quest_completed)
+
+    def update(self):
+        super().update()
+        visible = int(not self.friend.quest_completed)
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = 1
+
+
+class FriendSprite(FriendPartSprite):
+    def __init__(self, friend):
+        super().__init__(friend, (0, 0))
+        self.image = friend.get_image()
+        self.rect = self.image.get_rect()
+
+    def update(self):
+        super().update()
+        image = self.friend.get_image()
+        if image is not self.image:
+            self.image = image
+            self.dirty = 1
+
+
+class HappinessBarSprite(FriendPartSprite):
+    def __init__(self, friend, colors):
+        super().__init__(friend, ((friend.get_rect().width - BAR_WIDTH) // 2, -15))
+        self.colors = colors
+        self.fill_width = None
+        self.rect = pygame.Rect(0, 0, BAR_WIDTH, BAR_HEIGHT)
+        self.update()
+
+    def update(self):
+        super().update()
+        fill_width = int(BAR_WIDTH * self.friend.happiness / 100)
+        if fill_width != self.fill_width:
+            self.fill_width = fill_width
+            self.image = bar_surface(fill_width, BAR_WIDTH, BAR_HEIGHT, *self.colors)
+            self.rect.size = self.image.get_size()
+            self.dirty = 1
+
+
+class PlayerSprite(pygame.sprite.DirtySprite):
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.image = game.player_image
+        self.rect = game.player.copy()
+        self.rect.topleft = game.camera.to_screen(game.player_render_position())
+
+    def update(self):
+        game = self.game
+        position = game.camera.to_screen(game.player_render_position())
+        if self.rect.topleft != position or self.image is not game.player_image:
+            self.image = game.player_image
+            self.rect.topleft = position
+            self.dirty = 1
+            for group in self.groups():
+                group.change_layer(self, game.player.bottom)
+
+
+class RemotePlayerSprite(WorldSprite):
+    """Another player in a multiplayer game, where the server last put them"""
+
+    def __init__(self, image, world_pos):
+        super().__init__()
+        self.world_pos = world_pos
+        self.image = image
+        self.rect = image.get_rect()
+
+
+class Overworld:
+    """Sprite scene for GameState.PLAYING"""
+
+    def __init__(self, game):
+        self.game = game
+        self.group = pygame.sprite.LayeredDirty()
+        # Never fall back to repainting the whole screen on slow frames
+        set_threshold = getattr(self.group, "set_timing_threshold", None) or self.group.set_timing_treshold
+        set_threshold(float("inf"))
+
+        self.background = pygame.Surface(game.screen.get_size())
+        self.background.fill(game.WHITE)
+        self.group.clear(game.screen, self.background)
+
+        # Sprites of the friends currently in view
+        self.friend_sprites = {}
+        # Other players in a multiplayer game (see multiplayer.py), by player id
+        self.remote_sprites = {}
+        self.offset = None
+
+        self.player_sprite = PlayerSprite(game)
+        self.group.add(self.player_sprite, layer=game.player.bottom)
+        self.add_hud()
+        self.update()
+
+    def add_friend(self, friend):
+        layer = friend.get_rect().bottom
+        bar_colors = (self.game.RED, self.game.GREEN)
+        sprites = (GlowSprite(friend), FriendSprite(friend), HappinessBarSprite(friend, bar_colors))
+        for sprite in sprites:
+            sprite.place(self.offset)
+        self.group.add(*sprites, layer=layer)
+        self.friend_sprites[friend] = sprites
+
+    def remove_friend(self, friend):
+        self.group.remove(*self.friend_sprites.pop(friend))
+
+    def show_remote_player(self, player_id, world_pos):
+        """Add or move another player's sprite"""
+        sprite = self.remote_sprites.get(player_id)
+        if sprite is None:
+            sprite = self.remote_sprites[player_id] = RemotePlayerSprite(self.game.player_image, world_pos)
+            self.group.add(sprite, layer=world_pos[1] + sprite.rect.height)
+        elif sprite.world_pos == world_pos:
+            return
+        else:
+            sprite.world_pos = world_pos
+            self.group.change_layer(sprite, world_pos[1] + sprite.rect.height)
+        if self.offset is not None:  # otherwise placed on the first update
+            sprite.place(self.offset)
+
+    def hide_remote_player(self, player_id):
+        sprite = self.remote_sprites.pop(player_id, None)
+        if sprite is not None:
+            self.group.remove(sprite)
+
+    def add_hud(self):
+        """Stat widgets bound to the game's observed attributes; they repaint only when a stat changes"""
+        game = self.game
+        text_cache = game.text_cache
+        small_font = game.small_font
+        self.hud = [
+            Label(text_cache, small_font, game.BLACK, (10, 10), "Energy:"),
+            ValueBar((10, 35), (150, 20), (game.RED, game.GREEN, game.BLACK), game.max_energy,
+                     game, "player_energy"),
+            ValueLabel(text_cache, small_font, game.BLACK, (10, 70), "Score: {}".format, game, "score"),
+            ValueLabel(text_cache, small_font, game.BLACK, (10, 95),
+                       lambda quests: f"Quests: {quests}/{len(game.friends)}", game, "completed_quests"),
+            ValueLabel(text_cache, small_font, game.BLACK, (10, 120),
+                       lambda friends: f"Friends Helped: {len(friends)}", game, "completed_friends"),
+            Label(text_cache, small_font, game.GRAY, (10, game.HEIGHT - 30),
+                  "Walk near friends to help them! WASD/Arrows to move"),
+        ]
+        self.group.add(*self.hud, layer=HUD_LAYER)
+
+    def close(self):
+        """Stop the HUD following the game, e.g. when the scene is rebuilt"""
+        for widget in self.hud:
+            if isinstance(widget, Bound):
+                widget.unbind()
+
+    def cull(self):
+        """Keep sprites only for the friends that are inside the camera view"""
+        view = self.game.camera.view_rect.inflate(2 * CULL_MARGIN, 2 * CULL_MARGIN)
+        visible = self.game.friend_index.query_rect(view)
+        visible_set = set(visible)
+        for friend in [f for f in self.friend_sprites if f not in visible_set]:
+            self.remove_friend(friend)
+        for friend in visible:
+            if friend not in self.friend_sprites:
+                self.add_friend(friend)
+
+    def update(self):
+        """Sync sprites with the game; returns True when the view scrolled"""
+        game = self.game
+        x, y = game.player_render_position()
+        game.camera.follow((x + game.player.width // 2, y + game.player.height // 2))
+        offset = game.camera.offset
+        scrolled = offset != self.offset
+        if scrolled:
+            previous, self.offset = self.offset, offset
+            # Shift what is already on screen rather than repainting it all:
+            # world sprites move with the frame, and only the newly exposed
+            # strips and the sprites fixed to the screen need drawing
+            shifted = previous is not None and game.renderer.scroll(self.group, previous[0] - offset[0],
+                                                                     previous[1] - offset[1])
+            if shifted:
+                self.player_sprite.dirty = 1
+                for widget in self.hud:
+                    widget.dirty = 1
+            for sprites in self.friend_sprites.values():
+                for sprite in sprites:
+                    sprite.place(offset, redraw=not shifted)
+            for sprite in self.remote_sprites.values():
+                sprite.place(offset, redraw=not shifted)
+            self.cull()
+        self.group.update()
+        return scrolled
+
+    def draw(self, surface):
+        """Draw the sprites that changed and return the dirty rects"""
+        return self.group.draw(surface)
+
+    def draw_all(self, surface):
+        """Draw the whole scene, e.g. underneath the quest dialog"""
+        self.update()
+        self.group.repaint_rect(surface.get_rect())
+        return self.group.draw(surface)
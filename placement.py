@@ -0,0 +1,83 @@
+"""
+Friend placement.
+
+Uses Bridson's Poisson-disk sampling: points are grown outwards from already
+accepted points and checked against a background grid, so placing thousands of
+friends costs O(n) instead of retrying random positions until one fits.
+"""
+
+import math
+import random
+
+
+def poisson_disk_sample(width, height, radius, rng=random, attempts=30):
+    """Points in [0, width) x [0, height) that are at least `radius` apart"""
+    if width <= 0 or height <= 0:
+        return []
+    cell = radius / math.sqrt(2)
+    cols = int(width / cell) + 1
+    rows = int(height / cell) + 1
+    grid = [None] * (cols * rows)
+    radius_sq = radius * radius
+
+    def fits(x, y):
+        gx = int(x / cell)
+        gy = int(y / cell)
+        for ny in range(max(gy - 2, 0), min(gy + 3, rows)):
+            row = ny * cols
+            for nx in range(max(gx - 2, 0), min(gx + 3, cols)):
+                other = grid[row + nx]
+                if other is not None:
+                    dx = other[0] - x
+                    dy = other[1] - y
+                    if dx * dx + dy * dy < radius_sq:
+                        return False
+        return True
+
+    first = (rng.random() * width, rng.random() * height)
+    grid[int(first[1] / cell) * cols + int(first[0] / cell)] = first
+    points = [first]
+    active = [first]
+    while active:
+        index = rng.randrange(len(active))
+        px, py = active[index]
+        for _ in range(attempts):
+            angle = rng.random() * 2 * math.pi
+            distance = radius * (1 + rng.random())
+            x = px + math.cos(angle) * distance
+            y = py + math.sin(angle) * distance
+            if 0 <= x < width and 0 <= y < height and fits(x, y):
+                point = (x, y)
+                grid[int(y / cell) * cols + int(x / cell)] = point
+                points.append(point)
+                active.append(point)
+                break
+        else:
+            # No room left around this point
+            active[index] = active[-1]
+            active.pop()
+    return points
+
+
+def scatter_positions(count, area, size, radius, rng=random, keep_clear=None):
+    """Top-left positions for `count` objects of `size` inside the `area` rect.
+
+    Positions are Poisson-disk distributed with a minimum spacing of `radius`,
+    which is relaxed until there is room for all of them. Objects never overlap
+    the `keep_clear` rect.
+    """
+    width = area.width - size[0]
+    height = area.height - size[1]
+    while True:
+        positions = []
+        for x, y in poisson_disk_sample(width, height, radius, rng):
+            x = area.x + int(x)
+            y = area.y + int(y)
+            if keep_clear is not None and keep_clear.colliderect((x, y, size[0], size[1])):
+                continue
+            positions.append((x, y))
+        if len(positions) >= count or radius < 1:
+            break
+        radius *= 0.8
+    rng.shuffle(positions)
+    return positions[:count]
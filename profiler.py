@@ -0,0 +1,173 @@
+"""
+Frame-time instrumentation.
+
+The engine times each phase of a frame (events, update, render, present) plus
+every mini-game's update, and keeps the most recent samples per phase in a
+fixed-size ring buffer. From those it reports p50/p95/p99 frame costs, shows
+them in an on-screen overlay (F3) and exports them as CSV or JSON.
+
+While disabled, the game loop skips all of this behind a single flag check.
+"""
+
+from array import array
+
+import pygame
+
+
+class PhaseTimer:
+    """Ring buffer of the last `capacity` durations of one phase, in milliseconds"""
+
+    def __init__(self, capacity):
+        self.samples = array("d", [0.0]) * capacity
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0  # total samples ever recorded
+
+    def add(self, ms):
+        self.samples[self.index] = ms
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    def recent(self):
+        """Samples still in the buffer, oldest first"""
+        if self.count < self.capacity:
+            return self.samples[:self.count].tolist()
+        return (self.samples[self.index:] + self.samples[:self.index]).tolist()
+
+    def stats(self):
+        samples = sorted(self.recent())
+        if not samples:
+            return None
+
+        def percentile(p):
+            # Nearest-rank percentile
+            return samples[min(len(samples) - 1, max(0, round(p / 100 * len(samples)) - 1))]
+
+        return {
+            "count": self.count,
+            "mean": sum(samples) / len(samples),
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": samples[-1],
+        }
+
+
+class Profiler:
+    def __init__(self, capacity=600, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.phases = {}
+
+    def record(self, phase, ms):
+        timer = self.phases.get(phase)
+        if timer is None:
+            timer = self.phases[phase] = PhaseTimer(self.capacity)
+        timer.add(ms)
+
+    def summary(self):
+        return {phase: timer.stats() for phase, timer in self.phases.items()}
+
+    def reset(self):
+        self.phases = {}
+
+    def export(self, path):
+        """Write the summary and recent samples; the format follows the extension (.csv or .json)"""
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def export_json(self, path):
+        import json
+
+        trace = {
+            phase: {"summary": timer.stats(), "samples_ms": timer.recent()}
+            for phase, timer in self.phases.items()
+        }
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"capacity": self.capacity, "phases": trace}, trace_file, indent=2)
+
+    def export_csv(self, path):
+        import csv
+
+        with open(path, "w", newline="", encoding="utf-8") as trace_file:
+            writer = csv.writer(trace_file)
+            writer.writerow(["phase", "sample", "ms"])
+            for phase, timer in self.phases.items():
+                for i, ms in enumerate(timer.recent()):
+                    writer.writerow([phase, i, f"{ms:.4f}"])
+
+
+class ProfilerOverlay:
+    """Translucent p50/p95/p99 table in the top-right corner of the screen
+
+    The overlay is its own dirty region: it keeps the scene pixels beneath it,
+    so it only pushes its own rect, on the frames where the table is rebuilt
+    or the scene under it was repainted.
+    """
+
+    COLUMNS = ("phase", "p50", "p95", "p99")
+    COLUMN_WIDTHS = (170, 60, 60, 60)
+    REFRESH_FRAMES = 30  # rebuild the table twice a second at 60 FPS
+
+    def __init__(self, profiler, font):
+        self.profiler = profiler
+        self.font = font
+        self.surface = None
+        self.frames = 0
+        self.rect = None
+        self.under = None  # the scene beneath the overlay, while it is on screen
+
+    def rows(self):
+        rows = [self.COLUMNS]
+        for phase, stats in self.profiler.summary().items():
+            if stats:
+                rows.append((phase, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"))
+        return rows
+
+    def build(self):
+        rows = self.rows()
+        line_height = self.font.get_linesize()
+        surface = pygame.Surface((sum(self.COLUMN_WIDTHS) + 10, line_height * len(rows) + 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for row_index, row in enumerate(rows):
+            x = 5
+            for cell, width in zip(row, self.COLUMN_WIDTHS):
+                # Rendered directly: the numbers change constantly and would churn the text cache
+                surface.blit(self.font.render(cell, True, (255, 255, 255)), (x, 5 + row_index * line_height))
+                x += width
+        return surface
+
+    def hide(self, screen):
+        """Put the scene beneath the overlay back on screen, e.g. before the frame is scrolled"""
+        if self.under is not None:
+            screen.blit(self.under, self.rect)
+
+    def draw(self, screen, renderer):
+        """Draw over the frame the DirtyRectRenderer just rendered, queueing only the overlay's rect"""
+        refresh = self.surface is None or self.frames % self.REFRESH_FRAMES == 0
+        self.frames += 1
+        if renderer.pending_full:
+            # Redrawn or scrolled: the scene on screen has no overlay on it
+            self.under = None
+        elif self.under is not None:
+            # Take in the parts of the scene repainted beneath the overlay
+            repainted = False
+            for rect in renderer.pending_rects:
+                clip = rect.clip(self.rect)
+                if clip:
+                    self.under.blit(screen, clip.move(-self.rect.x, -self.rect.y), clip)
+                    repainted = True
+            if not (repainted or refresh):
+                return
+            self.hide(screen)
+            renderer.pending_rects.append(self.rect)  # the old rect, in case the table shrinks
+        if refresh:
+            self.surface = self.build()
+        self.rect = self.surface.get_rect(topright=(screen.get_width() - 10, 10))
+        if self.under is None or self.under.get_size() != self.rect.size:
+            self.under = screen.subsurface(self.rect).copy()
+        screen.blit(self.surface, self.rect)
+        if not renderer.pending_full:
+            renderer.pending_rects.append(self.rect)
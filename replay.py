@@ -0,0 +1,305 @@
+"""
+Input recording and deterministic replay.
+
+A recording is a compact binary log of what the engine read each frame: the
+frame time, the mouse position, which movement keys were held, and the key
+presses, clicks and quit events. Together with the game seed and a save state
+of the game as recording started (see savestate.py) in the header, that is
+everything the simulation depends on. Feeding a log back through a headless
+game therefore replays the session exactly, as fast as the CPU allows, even
+when it was resumed from a save. A frame in which F9 was pressed also carries
+a save state of the game after its events, which playback restores in place of
+reading the save file. Use it to reproduce bug reports, or re-run recorded
+sessions as performance workloads.
+
+Record a session with IYKWIM_RECORD=session.iykr python main_game.py, then:
+
+    python replay.py session.iykr
+"""
+
+import atexit
+import struct
+
+import pygame
+
+from game_input import KeyState
+
+REPLAY_MAGIC = b"IYKR"
+REPLAY_VERSION = 2
+# magic, version, seed, friend count, world width, world height (0 = default)
+REPLAY_HEADER = struct.Struct("<4sHQIII")
+# Size of the save state that follows the header (version 2 on)
+SNAPSHOT_SIZE = struct.Struct("<I")
+# frame ms, mouse x, mouse y, held key bitmask, event count
+FRAME = struct.Struct("<dhhHH")
+KEYDOWN = struct.Struct("<BiI")  # tag, key, unicode code point (0 = none)
+CLICK = struct.Struct("<BBhh")  # tag, button, x, y
+QUIT = struct.Struct("<B")  # tag
+SNAPSHOT = struct.Struct("<BI")  # tag, size of the save state that follows
+
+EVENT_KEYDOWN = 1
+EVENT_CLICK = 2
+EVENT_QUIT = 3
+EVENT_SNAPSHOT = 4  # always the frame's last event
+
+# Keys whose held state the game polls; bit i is TRACKED_KEYS[i]
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)
+
+
+class _RecordingInput:
+    """Input source wrapper that hands everything the game reads to the recorder"""
+
+    def __init__(self, source, recorder):
+        self.source = source
+        self.recorder = recorder
+
+    def get_events(self):
+        events = self.source.get_events()
+        self.recorder.capture(events, self.source.get_pressed())
+        return events
+
+    def get_pressed(self):
+        return self.source.get_pressed()
+
+
+class _RecordingClock:
+    """Clock wrapper that ends the recorder's frame on every tick"""
+
+    def __init__(self, clock, recorder):
+        self.clock = clock
+        self.recorder = recorder
+
+    def tick(self, framerate=0):
+        frame_ms = self.clock.tick(framerate)
+        self.recorder.end_frame(frame_ms)
+        return frame_ms
+
+    def get_time(self):
+        return self.clock.get_time()
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+class InputRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.game = None
+        self.mouse_pos = (0, 0)
+        self.held_mask = 0
+        self.events = []
+        self.loading = False
+        self.frames = 0
+
+    def attach(self, game):
+        """Start recording everything `game` reads from its input source and clock"""
+        from savestate import snapshot
+
+        start = snapshot(game)
+        self.file = open(self.path, "wb")
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, game.seed,
+                                           game.friend_count or 0, *(game.world_size or (0, 0))))
+        self.file.write(SNAPSHOT_SIZE.pack(len(start)) + start)
+        self.game = game
+        self.mouse_pos = game.mouse_pos
+        game.input = _RecordingInput(game.input, self)
+        game.clock = _RecordingClock(game.clock, self)
+        # A restart keeps recording into the same log
+        game.engine_options.update(input_source=game.input, clock=game.clock)
+        atexit.register(self.close)
+        return self
+
+    def capture(self, events, pressed):
+        self.held_mask = sum(1 << bit for bit, key in enumerate(TRACKED_KEYS) if pressed[key])
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.loading = self.loading or event.key == pygame.K_F9
+                code_point = ord(event.unicode[0]) if getattr(event, "unicode", "") else 0
+                self.events.append(KEYDOWN.pack(EVENT_KEYDOWN, event.key, code_point))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.events.append(CLICK.pack(EVENT_CLICK, event.button, *event.pos))
+            elif event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
+            elif event.type == pygame.QUIT:
+                self.events.append(QUIT.pack(EVENT_QUIT))
+
+    def end_frame(self, frame_ms):
+        if self.file is None:
+            return
+        if self.loading:
+            # The clock ticks after the frame's events were handled, so this
+            # is the state the save file was loaded into
+            from savestate import snapshot
+
+            state = snapshot(self.game)
+            self.events.append(SNAPSHOT.pack(EVENT_SNAPSHOT, len(state)) + state)
+            self.loading = False
+        self.file.write(FRAME.pack(frame_ms, *self.mouse_pos, self.held_mask, len(self.events)))
+        self.file.write(b"".join(self.events))
+        self.events = []
+        self.frames += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_replay(path):
+    """Parse a recording into (header dict, starting save state, list of frames)
+
+    Each frame is (frame_ms, mouse_pos, held_mask, events), where events are
+    tuples starting with their EVENT_* tag. The save state is empty for
+    version 1 recordings, which always start from a new game.
+    """
+    with open(path, "rb") as replay_file:
+        data = replay_file.read()
+    magic, version, seed, friend_count, world_width, world_height = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ValueError(f"{path} is not a replay file")
+    if version not in (1, REPLAY_VERSION):
+        raise ValueError(f"Unsupported replay version {version}")
+    header = dict(seed=seed, friend_count=friend_count or None,
+                  world_size=(world_width, world_height) if world_width else None)
+
+    offset = REPLAY_HEADER.size
+    start = b""
+    if version >= 2:
+        size = SNAPSHOT_SIZE.unpack_from(data, offset)[0]
+        offset += SNAPSHOT_SIZE.size
+        start = data[offset:offset + size]
+        offset += size
+
+    frames = []
+    while offset < len(data):
+        frame_ms, mouse_x, mouse_y, held_mask, event_count = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        events = []
+        for _ in range(event_count):
+            tag = data[offset]
+            if tag == EVENT_KEYDOWN:
+                events.append(KEYDOWN.unpack_from(data, offset))
+                offset += KEYDOWN.size
+            elif tag == EVENT_CLICK:
+                events.append(CLICK.unpack_from(data, offset))
+                offset += CLICK.size
+            elif tag == EVENT_QUIT:
+                events.append(QUIT.unpack_from(data, offset))
+                offset += QUIT.size
+            elif tag == EVENT_SNAPSHOT:
+                size = SNAPSHOT.unpack_from(data, offset)[1]
+                offset += SNAPSHOT.size
+                events.append((EVENT_SNAPSHOT, data[offset:offset + size]))
+                offset += size
+            else:
+                raise ValueError(f"Corrupt replay: unknown event {tag} at byte {offset}")
+        frames.append((frame_ms, (mouse_x, mouse_y), held_mask, events))
+    return header, start, frames
+
+
+class ReplayInput:
+    """Input source and clock that play back a recording frame by frame
+
+    The game quits once the recording runs out. Save states recorded with a
+    frame are restored into `game` when that frame's clock tick comes.
+    """
+
+    def __init__(self, frames, game=None):
+        self.frames = frames
+        self.game = game
+        self.frame = 0
+        self.mouse_pos = (0, 0)
+        self.held_keys = set()
+        self.key_state = KeyState(self.held_keys)
+
+    def get_events(self):
+        if self.frame >= len(self.frames):
+            return [pygame.event.Event(pygame.QUIT)]
+        _, mouse_pos, held_mask, recorded = self.frames[self.frame]
+
+        self.held_keys.clear()
+        self.held_keys.update(key for bit, key in enumerate(TRACKED_KEYS) if held_mask >> bit & 1)
+
+        events = []
+        if mouse_pos != self.mouse_pos:
+            self.mouse_pos = mouse_pos
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=mouse_pos, rel=(0, 0), buttons=(0, 0, 0)))
+        for event in recorded:
+            if event[0] == EVENT_KEYDOWN:
+                _, key, code_point = event
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=key,
+                                                 unicode=chr(code_point) if code_point else ""))
+            elif event[0] == EVENT_CLICK:
+                _, button, x, y = event
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=button))
+            elif event[0] == EVENT_QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def get_pressed(self):
+        return self.key_state
+
+    def tick(self, framerate=0):
+        if self.frame >= len(self.frames):
+            return 0.0
+        frame_ms, _, _, recorded = self.frames[self.frame]
+        self.frame += 1
+        if recorded and recorded[-1][0] == EVENT_SNAPSHOT:
+            from savestate import restore
+
+            restore(self.game, recorded[-1][1])
+        return frame_ms
+
+    def get_time(self):
+        return self.frames[self.frame - 1][0] if self.frame else 0.0
+
+    def get_fps(self):
+        frame_ms = self.get_time()
+        return 1000.0 / frame_ms if frame_ms else 0.0
+
+
+def replay(path, render=False, profile=False):
+    """Run a recording through a headless game; returns the game when it ends"""
+    from headless import create_headless_game
+
+    from savestate import restore
+
+    header, start, frames = read_replay(path)
+    playback = ReplayInput(frames)
+    # Loads come from the recording; never read or write a save file
+    game = create_headless_game(render=render, input_source=playback, clock=playback,
+                                save_path=None, autosave=None, **header)
+    if start:
+        restore(game, start)
+    playback.game = game
+    game.profiler.enabled = profile
+    while game.running:
+        game.step()
+    return game
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly")
+    parser.add_argument("path")
+    parser.add_argument("--render", action="store_true", help="also draw every frame off-screen")
+    parser.add_argument("--profile", metavar="PATH", help="write per-phase frame timings to a .csv or .json file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    game = replay(args.path, render=args.render, profile=bool(args.profile))
+    elapsed = time.perf_counter() - start
+    if args.profile:
+        game.profiler.export(args.profile)
+    frames = len(game.input.frames)
+    print(f"{frames} frames in {elapsed:.2f}s ({frames / max(elapsed, 1e-9):.0f} frames/s)")
+    print(f"seed {game.seed}: state {game.state.name}, score {game.score}, "
+          f"quests {game.completed_quests}, energy {game.player_energy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Data-driven friend roster.
+
+Friends are described in resources/roster.json: their name, sprite, objectives,
+which SpecialAbility and ColorStrategy they use and which mini-game their quests
+play. Abilities and colors are looked up by class name through a registry that
+imports the matching module on first use, so adding a friend needs no new
+modules. Colors may also be given as an [r, g, b] list.
+
+The manifest is compiled once into a pickled cache next to it, which is reused
+until the manifest changes.
+"""
+
+import importlib
+import os
+import pickle
+from collections import namedtuple
+
+from MiniGames import DEFAULT_MINI_GAME
+
+ROSTER_PATH = "resources/roster.json"
+MANIFEST_VERSION = 1
+CACHE_VERSION = 2
+
+RosterEntry = namedtuple("RosterEntry", "name ability color image objectives_title objectives mini_game")
+Roster = namedtuple("Roster", "player_image friends")
+
+
+class Registry:
+    """Maps names used in the manifest to classes in a package"""
+
+    def __init__(self, package):
+        self.package = package
+        self.classes = {}
+
+    def register(self, name, cls=None):
+        """Register a class under a name; usable as a class decorator"""
+        if cls is None:
+            return lambda cls: self.register(name, cls)
+        self.classes[name] = cls
+        return cls
+
+    def resolve(self, name):
+        cls = self.classes.get(name)
+        if cls is None:
+            # By convention every class lives in a module of the same name
+            if not name.isidentifier():
+                raise KeyError(f"Unknown {self.package} entry '{name}'")
+            try:
+                module = importlib.import_module(f"{self.package}.{name}")
+            except ImportError:
+                raise KeyError(f"Unknown {self.package} entry '{name}'")
+            cls = self.classes[name] = getattr(module, name)
+        return cls
+
+
+abilities = Registry("Abilities")
+colors = Registry("Colors")
+
+
+def create_ability(name):
+    return abilities.resolve(name)()
+
+
+def create_color(spec):
+    if isinstance(spec, (list, tuple)):
+        return colors.resolve("RGBColor")(spec)
+    return colors.resolve(spec)()
+
+
+def create_objectives_creator(entry):
+    from Objectives.ObjectivesCreatorManifest import ObjectivesCreatorManifest
+
+    return ObjectivesCreatorManifest(entry.objectives_title, list(entry.objectives))
+
+
+def compile_manifest(manifest):
+    """Validate a parsed manifest and reduce it to plain tuples"""
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported roster manifest version {manifest.get('version')!r}")
+
+    friends = []
+    for index, friend in enumerate(manifest.get("friends", [])):
+        try:
+            color = friend["color"]
+            if isinstance(color, list):
+                color = tuple(color)
+            friends.append((
+                friend["name"],
+                friend["ability"],
+                color,
+                friend["image"],
+                friend["objectives"]["title"],
+                tuple(friend["objectives"]["items"]),
+                friend.get("mini_game", DEFAULT_MINI_GAME),
+            ))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Roster entry {index} is missing {e}")
+    if not friends:
+        raise ValueError("Roster manifest has no friends")
+    return (manifest.get("player", {}).get("image", "thijs.png"), tuple(friends))
+
+
+def default_cache_path(manifest_path):
+    return os.path.join(os.path.dirname(manifest_path), ".cache", "roster.pickle")
+
+
+def load_roster(manifest_path=ROSTER_PATH, cache_path=None):
+    """Load the roster, using the compiled cache when it is up to date"""
+    cache_path = cache_path or default_cache_path(manifest_path)
+    stat = os.stat(manifest_path)
+    stamp = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    compiled = None
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_stamp, cached = pickle.load(cache_file)
+        if cached_stamp == stamp:
+            compiled = cached
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+
+    if compiled is None:
+        import json  # only needed when the cache is stale
+
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            compiled = compile_manifest(json.load(manifest_file))
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path + ".tmp", "wb") as cache_file:
+                pickle.dump((stamp, compiled), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError:
+            # The cache is only an optimisation
+            pass
+
+    player_image, friends = compiled
+    return Roster(player_image, [RosterEntry(*friend) for friend in friends])
@@ -0,0 +1,225 @@
+"""
+Save states: snapshot and restore a whole game session.
+
+A snapshot holds everything that changes while playing: the game state, the
+player, energy and score, each friend's position, happiness and quest, every
+random stream and, if one is running, the mini-game with its pending timers.
+Images, fonts and the rest of the world are rebuilt from the seed when needed
+and taken from the sprite cache, so restoring into a running game with the same
+world takes milliseconds and does not touch a single surface.
+
+The format is a small header followed by a pickle (protocol 5) and its
+out-of-band buffers: bulk numeric data such as friend and EntityStore columns
+goes into raw buffers after the pickle and is loaded from memoryview slices of
+the file, without going through the pickle stream, and so does the state of
+each random stream. Buffers use the machine's native byte order, so only load
+saves written by this game on the same kind of machine.
+
+Loading a save unpickles it, which can run arbitrary code. Never load a save
+state (or a replay, which embeds them) from a source you do not trust.
+
+Press F5 in game to save and F9 to load. QuestGame only saves when given a
+save_path; main_game.py uses user_save_path(), or resumes from and autosaves to
+IYKWIM_SAVE.
+"""
+
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+SAVE_MAGIC = b"IYKG"
+SAVE_VERSION = 1
+# magic, version, pickle size, number of out-of-band buffers
+SAVE_HEADER = struct.Struct("<4sHQI")
+BUFFER_SIZE = struct.Struct("<Q")
+
+
+def _column(typecode, values):
+    return pickle.PickleBuffer(array(typecode, values))
+
+
+def _array(typecode, buffer):
+    column = array(typecode)
+    column.frombytes(memoryview(buffer).cast("B"))
+    return column
+
+
+def capture(game):
+    """The session state of `game` as a dict of picklable values"""
+    friends = game.friends
+    energy_timer = game.energy_timer
+    return {
+        "engine": {"seed": game.seed, "friend_count": game.friend_count, "world_size": game.world_size},
+        "state": game.state.name,
+        "sim_time": game.sim_time,
+        "sim_ticks": game.sim_ticks,
+        "accumulator_ms": game.accumulator_ms,
+        "player": tuple(game.player),
+        "player_previous": game.player_previous,
+        "player_energy": game.player_energy,
+        "score": game.score,
+        "completed_quests": game.completed_quests,
+        "friendship_points": game.friendship_points,
+        "completed_friends": sorted(game.completed_friends),
+        "energy_timer_due": energy_timer.deadline - game.scheduler.now if energy_timer.active else None,
+        "friends": {
+            "x": _column("i", [friend.x for friend in friends]),
+            "y": _column("i", [friend.y for friend in friends]),
+            "happiness": _column("i", [friend.happiness for friend in friends]),
+            "quest_completed": _column("B", [friend.quest_completed for friend in friends]),
+        },
+        "current_friend": friends.index(game.current_friend) if game.current_friend else None,
+        "current_quest": game.current_quest,
+        "mouse_pos": game.mouse_pos,
+        # Pickled together, so the mini-game keeps sharing its stream with game.rng
+        "rng_streams": game.rng.streams,
+        "mini_game": game.mini_game,
+    }
+
+
+def snapshot(game):
+    """Serialize the session state of `game` to bytes"""
+    buffers = []
+    payload = pickle.dumps(capture(game), protocol=5, buffer_callback=buffers.append)
+    raw = [buffer.raw() for buffer in buffers]
+    return b"".join([SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(payload), len(raw)),
+                     *(BUFFER_SIZE.pack(view.nbytes) for view in raw),
+                     payload, *raw])
+
+
+def unpack(data):
+    """Parse snapshot bytes back into the state dict; buffers stay views of `data`
+
+    This unpickles `data`: only pass snapshots from a trusted source.
+    """
+    view = memoryview(data)
+    magic, version, payload_size, buffer_count = SAVE_HEADER.unpack_from(view)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a save state")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save state version {version}")
+    offset = SAVE_HEADER.size
+    sizes = [BUFFER_SIZE.unpack_from(view, offset + i * BUFFER_SIZE.size)[0] for i in range(buffer_count)]
+    offset += buffer_count * BUFFER_SIZE.size
+    payload = view[offset:offset + payload_size]
+    offset += payload_size
+    buffers = []
+    for size in sizes:
+        buffers.append(view[offset:offset + size])
+        offset += size
+    return pickle.loads(payload, buffers=buffers)
+
+
+def restore(game, data):
+    """Put `game` into the state of a snapshot
+
+    The world is only rebuilt when the snapshot comes from a different seed or
+    world size; otherwise the friends, sprites and scene are kept as they are.
+    """
+    return apply_state(game, unpack(data))
+
+
+def apply_state(game, state):
+    from game_engine import GameState
+    from hud import MiniGameHud
+
+    engine = state["engine"]
+    if (game.seed, game.friend_count, game.world_size) != (engine["seed"], engine["friend_count"],
+                                                           engine["world_size"]):
+        seed = game.engine_options["seed"]
+        game.__init__(**dict(game.engine_options, **engine))
+        game.engine_options["seed"] = seed
+    friends = game.friends
+    columns = state["friends"]
+    xs, ys = _array("i", columns["x"]), _array("i", columns["y"])
+    happiness = _array("i", columns["happiness"])
+    quest_completed = _array("B", columns["quest_completed"])
+    if len(xs) != len(friends):
+        raise ValueError("Save state does not match this world")
+    moved = False
+    for i, friend in enumerate(friends):
+        if (friend.x, friend.y) != (xs[i], ys[i]):
+            friend.set_position(xs[i], ys[i])
+            moved = True
+        friend.happiness = happiness[i]
+        friend.quest_completed = bool(quest_completed[i])
+    if moved and game.overworld is not None:
+        # Friends may have moved into or out of view; the ones still in view follow by themselves
+        game.overworld.cull()
+
+    game.state = GameState[state["state"]]
+    game.sim_time = state["sim_time"]
+    game.sim_ticks = state["sim_ticks"]
+    game.accumulator_ms = state["accumulator_ms"]
+    game.player.update(state["player"])
+    game.player_previous = state["player_previous"]
+    game.player_energy = state["player_energy"]
+    game.score = state["score"]
+    game.completed_quests = state["completed_quests"]
+    game.friendship_points = state["friendship_points"]
+    game.completed_friends = set(state["completed_friends"])
+    game.mouse_pos = state["mouse_pos"]
+    game.rng.streams = state["rng_streams"]
+    if state["energy_timer_due"] is None:
+        game.scheduler.cancel(game.energy_timer)
+    else:
+        game.scheduler.reschedule(game.energy_timer, state["energy_timer_due"])
+
+    index = state["current_friend"]
+    game.current_friend = friends[index] if index is not None else None
+    game.current_quest = state["current_quest"]
+    mini_game = state["mini_game"]
+    game.mini_game = mini_game
+    game.mini_game_hud = None
+    if mini_game is not None:
+        mini_game.game = game
+        if game.render_enabled:
+            game.mini_game_hud = MiniGameHud(game, mini_game, game.current_friend.name)
+
+    game.next_autosave = game.sim_time + (game.autosave or 0)
+    game.renderer.invalidate()
+    return game
+
+
+def resume(data, **engine_options):
+    """A new QuestGame in the state of a snapshot, e.g. to fork simulations from a checkpoint"""
+    from game_engine import QuestGame
+
+    state = unpack(data)
+    return apply_state(QuestGame(**dict(engine_options, **state["engine"])), state)
+
+
+def user_save_path(name="quicksave.iykg"):
+    """Save file in the per-user data directory, e.g. ~/.local/share/iykwim/quicksave.iykg"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "iykwim", name)
+
+
+def save_game(game, path):
+    """Write a snapshot to `path`; a crash while saving leaves the previous save intact"""
+    data = snapshot(game)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as save_file:
+        save_file.write(data)
+    os.replace(temporary_path, path)
+
+
+def load_game(game, path):
+    """Restore `game` from the save at `path`
+
+    The save is unpickled, so only load files this game wrote; a crafted save
+    can run arbitrary code.
+    """
+    with open(path, "rb") as save_file:
+        data = save_file.read()
+    return restore(game, data)
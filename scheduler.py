@@ -0,0 +1,88 @@
+"""
+Timed callbacks on the simulation clock.
+
+Timers live in a min-heap ordered by deadline, so advancing the clock only
+touches the timers that expire instead of polling every countdown each step.
+A scheduler has its own clock that the owner advances with the simulation
+time step. That keeps timers deterministic and lets a subsystem pause its
+timers simply by not advancing them, e.g. the overworld while a mini-game runs.
+"""
+
+import heapq
+
+# Slack for deadlines reached by summing float time steps (e.g. 10 x 1/60 vs 1/6)
+EPSILON = 1e-9
+
+
+class Timer:
+    __slots__ = ("callback", "interval", "deadline", "entry")
+
+    def __init__(self, callback, interval):
+        self.callback = callback
+        self.interval = interval
+        self.deadline = None
+        self.entry = None
+
+    @property
+    def active(self):
+        return self.entry is not None
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []
+        self.sequence = 0  # plain int, so schedulers pickle into save states
+
+    def __len__(self):
+        return sum(1 for entry in self.heap if entry[2] is not None)
+
+    def _push(self, timer, deadline):
+        timer.deadline = deadline
+        # The sequence number keeps timers with equal deadlines in the order they were set
+        self.sequence += 1
+        timer.entry = [deadline, self.sequence, timer]
+        heapq.heappush(self.heap, timer.entry)
+
+    def call_at(self, deadline, callback, interval=None):
+        """Run callback() once the clock reaches `deadline`, then every `interval` if given"""
+        timer = Timer(callback, interval)
+        self._push(timer, deadline)
+        return timer
+
+    def call_later(self, delay, callback, interval=None):
+        return self.call_at(self.now + delay, callback, interval)
+
+    def call_every(self, interval, callback):
+        return self.call_at(self.now + interval, callback, interval)
+
+    def cancel(self, timer):
+        # The heap entry is dropped lazily when it reaches the top
+        if timer.entry is not None:
+            timer.entry[2] = None
+            timer.entry = None
+
+    def reschedule(self, timer, delay):
+        """Move a timer, active or not, to fire `delay` from now"""
+        self.cancel(timer)
+        self._push(timer, self.now + delay)
+
+    def advance(self, dt):
+        """Move the clock forward and run every timer that came due, in deadline order"""
+        self.now += dt
+        heap = self.heap
+        while heap and heap[0][0] <= self.now + EPSILON:
+            deadline, _, timer = heapq.heappop(heap)
+            if timer is None:
+                continue
+            timer.entry = None
+            if timer.interval is not None:
+                # Re-arm before the callback so it can cancel or reschedule its own timer
+                self._push(timer, deadline + timer.interval)
+            timer.callback()
+
+    def clear(self):
+        for entry in self.heap:
+            if entry[2] is not None:
+                entry[2].entry = None
+        self.heap = []
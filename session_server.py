@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Multi-session server engine.
+
+Hosts many independent game sessions in one process. Every session is a
+logic-only QuestGame: headless, without rendering, so it holds no screen
+surface, shares fonts and sprites with every other session in the process, and
+is driven by its own scripted input and virtual clock. The overworld, quests
+and every mini-game run exactly as they do in the desktop game.
+
+SessionServer ticks all sessions on one asyncio loop, in batches, yielding to
+the loop between batches so network I/O keeps flowing while a tick is in
+progress. To use more cores, run one server per process and shard sessions
+across them (see `--processes`).
+
+Benchmark how many sessions one core sustains at the simulation rate, with bots
+playing every session:
+
+    python session_server.py --sessions 1000 --seconds 10 [--processes 4] [--realtime]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+class Session:
+    """One player's game; `driver()` (e.g. a bot or a network connection) runs before every tick"""
+
+    __slots__ = ("id", "game", "driver")
+
+    def __init__(self, session_id, game, driver=None):
+        self.id = session_id
+        self.game = game
+        self.driver = driver
+
+    @property
+    def input(self):
+        return self.game.input
+
+
+class SessionServer:
+    def __init__(self, tick_hz=60, batch_size=256, **engine_options):
+        self.tick_hz = tick_hz
+        self.batch_size = batch_size
+        self.engine_options = engine_options
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.running = False
+        # Tick statistics
+        self.ticks = 0
+        self.session_ticks = 0
+        self.overruns = 0
+        self.busy_seconds = 0.0
+
+    def open_session(self, driver=None, **options):
+        """Start a new logic-only game; returns its Session
+
+        Sessions do not save unless given a save_path of their own, so F5/F9
+        in one session cannot touch another's save.
+        """
+        from headless import create_headless_game
+
+        session_id = next(self.ids)
+        options = {"save_path": None, "autosave": None, **self.engine_options, **options}
+        game = create_headless_game(render=False, **options)
+        session = self.sessions[session_id] = Session(session_id, game, driver)
+        return session
+
+    def close_session(self, session_id):
+        return self.sessions.pop(session_id, None)
+
+    def tick_batch(self, sessions):
+        """Advance each session by one frame; sessions whose game quit are closed"""
+        for session in sessions:
+            if session.driver:
+                session.driver()
+            game = session.game
+            game.step()
+            if not game.running:
+                self.close_session(session.id)
+        self.session_ticks += len(sessions)
+
+    def tick(self):
+        """Advance every session by one frame, all at once"""
+        start = time.perf_counter()
+        self.tick_batch(list(self.sessions.values()))
+        self.ticks += 1
+        self.busy_seconds += time.perf_counter() - start
+
+    async def serve(self, duration=None):
+        """Tick every session `tick_hz` times a second until stop() (or for `duration` seconds)
+
+        A tick that runs past its deadline counts as an overrun; the schedule
+        then restarts from now instead of trying to catch up.
+        """
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_hz
+        deadline = loop.time()
+        end = deadline + duration if duration is not None else None
+        self.running = True
+        while self.running and (end is None or loop.time() < end):
+            start = time.perf_counter()
+            sessions = list(self.sessions.values())
+            for first in range(0, len(sessions), self.batch_size):
+                self.tick_batch(sessions[first:first + self.batch_size])
+                await asyncio.sleep(0)
+            self.ticks += 1
+            self.busy_seconds += time.perf_counter() - start
+
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                deadline = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+        self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def stats(self):
+        busy = self.busy_seconds
+        return {
+            "sessions": len(self.sessions),
+            "ticks": self.ticks,
+            "session_ticks": self.session_ticks,
+            "overruns": self.overruns,
+            "busy_seconds": busy,
+            "session_ticks_per_second": self.session_ticks / busy if busy else 0.0,
+            # Sessions one core can keep at the full simulation rate
+            "sessions_per_core": self.session_ticks / busy / self.tick_hz if busy else 0.0,
+        }
+
+
+def _max_rss_kb():
+    """Peak resident memory in KB, or 0 where the resource module is missing (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB elsewhere
+
+
+def run_shard(shard, sessions, seconds, realtime, seed, tick_hz=60, batch_size=256):
+    """Host `sessions` bot-driven sessions for `seconds` seconds; returns the server stats"""
+    from bots import MiniGameBot, SessionBot
+    from rng import RandomStreams
+
+    # Special abilities print on use
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        server = SessionServer(tick_hz=tick_hz, batch_size=batch_size)
+        rss_before = _max_rss_kb()
+        start = time.perf_counter()
+        for i in range(sessions):
+            rng = RandomStreams(seed).fork(f"shard{shard}/session{i}")
+            session = server.open_session(seed=rng.seed)
+            bot = SessionBot(session.game, MiniGameBot(rng.stream("bot")), restart=True)
+            session.driver = bot.step
+        open_seconds = time.perf_counter() - start
+        rss_after = _max_rss_kb()
+
+        if realtime:
+            asyncio.run(server.serve(duration=seconds))
+        else:
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                server.tick()
+
+    stats = server.stats()
+    stats["open_ms_per_session"] = open_seconds / max(1, sessions) * 1000
+    stats["kb_per_session"] = (rss_after - rss_before) / max(1, sessions)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000, help="sessions per process (default 1000)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long to run (default 10)")
+    parser.add_argument("--processes", type=int, default=1, help="shard sessions across this many processes")
+    parser.add_argument("--realtime", action="store_true",
+                        help="tick at 60 Hz on the asyncio loop instead of as fast as possible")
+    parser.add_argument("--batch-size", type=int, default=256, help="sessions ticked between event loop yields")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    shard_args = [(shard, args.sessions, args.seconds, args.realtime, args.seed, 60, args.batch_size)
+                  for shard in range(args.processes)]
+    if args.processes == 1:
+        results = [run_shard(*shard_args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            results = list(pool.map(run_shard, *zip(*shard_args)))
+
+    for shard, stats in enumerate(results):
+        print(f"shard {shard}: {stats['sessions']} sessions, {stats['ticks']} ticks, "
+              f"{stats['session_ticks_per_second']:.0f} session-ticks/s, "
+              f"{stats['sessions_per_core']:.0f} sessions/core at 60 Hz, "
+              f"{stats['overruns']} overruns, {stats['kb_per_session']:.0f} KB and "
+              f"{stats['open_ms_per_session']:.1f} ms to open per session")
+    total = sum(stats["sessions"] for stats in results)
+    per_core = sum(stats["sessions_per_core"] for stats in results) / len(results)
+    print(f"\n{total} sessions on {args.processes} process(es); {per_core:.0f} sessions per core at 60 Hz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Uniform-grid spatial index.
+
+Objects are bucketed into square cells by their bounding rect, so proximity and
+collision queries only look at the cells around the query area instead of at
+every object in the world.
+"""
+
+import pygame
+
+
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        # obj -> [rect, cell keys, insertion order]
+        self.entries = {}
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def _cell_keys(self, rect):
+        size = self.cell_size
+        x0 = rect.left // size
+        x1 = (rect.right - 1) // size
+        y0 = rect.top // size
+        y1 = (rect.bottom - 1) // size
+        return tuple((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    def insert(self, obj, rect):
+        if obj in self.entries:
+            self.move(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        keys = self._cell_keys(rect)
+        for key in keys:
+            self.cells.setdefault(key, {})[obj] = None
+        self.entries[obj] = [rect, keys, self.next_order]
+        self.next_order += 1
+
+    def remove(self, obj):
+        entry = self.entries.pop(obj, None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            cell = self.cells[key]
+            del cell[obj]
+            if not cell:
+                del self.cells[key]
+
+    def move(self, obj, rect):
+        entry = self.entries[obj]
+        rect = pygame.Rect(rect)
+        keys = self._cell_keys(rect)
+        if keys != entry[1]:
+            for key in entry[1]:
+                cell = self.cells[key]
+                del cell[obj]
+                if not cell:
+                    del self.cells[key]
+            for key in keys:
+                self.cells.setdefault(key, {})[obj] = None
+            entry[1] = keys
+        entry[0] = rect
+
+    def _candidates(self, rect):
+        found = {}
+        cells = self.cells
+        for key in self._cell_keys(rect):
+            cell = cells.get(key)
+            if cell:
+                found.update(cell)
+        return found
+
+    def _in_order(self, objs):
+        # Results come back in insertion order so lookups are deterministic
+        entries = self.entries
+        return sorted(objs, key=lambda obj: entries[obj][2])
+
+    def query_rect(self, rect):
+        """Objects whose rect intersects `rect`"""
+        rect = pygame.Rect(rect)
+        entries = self.entries
+        hits = [obj for obj in self._candidates(rect) if rect.colliderect(entries[obj][0])]
+        return self._in_order(hits)
+
+    def query_radius(self, center, radius):
+        """Objects whose rect comes within `radius` of the point `center`"""
+        cx, cy = center
+        bounds = pygame.Rect(int(cx - radius), int(cy - radius),
+                             int(2 * radius) + 2, int(2 * radius) + 2)
+        entries = self.entries
+        radius_sq = radius * radius
+        hits = []
+        for obj in self._candidates(bounds):
+            rect = entries[obj][0]
+            # Distance from the center to the closest point of the rect
+            dx = max(rect.left - cx, 0, cx - rect.right)
+            dy = max(rect.top - cy, 0, cy - rect.bottom)
+            if dx * dx + dy * dy <= radius_sq:
+                hits.append(obj)
+        return self._in_order(hits)
+
+    def rect_of(self, obj):
+        return self.entries[obj][0]
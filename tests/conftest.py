@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    # Sprite and roster paths are relative to the repository, as in the game
+    monkeypatch.chdir(REPO_ROOT)
+
+
+def play(game, frames, rng):
+    """Step `game` with random movement, accepting every quest and mashing through mini-games"""
+    import pygame
+    from game_engine import GameState
+
+    game_input = getattr(game.input, "source", game.input)  # under a recorder or multiplayer link
+    keys = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+    for frame in range(frames):
+        if frame % 30 == 0:
+            game_input.held_keys.clear()
+            game_input.held_keys.add(rng.choice(keys))
+        if game.state == GameState.MAIN_MENU:
+            game_input.tap(pygame.K_SPACE)
+        elif game.state == GameState.QUEST_DIALOG:
+            game_input.tap(pygame.K_y)
+        elif game.state == GameState.MINI_GAME:
+            if rng.random() < 0.3:
+                game_input.tap(pygame.K_SPACE)
+            if rng.random() < 0.2:
+                game_input.click((rng.randrange(game.WIDTH), rng.randrange(game.HEIGHT)))
+        elif game.state in (GameState.GAME_OVER, GameState.VICTORY):
+            game_input.tap(pygame.K_r)
+        game.step()
+
+
+def outcome(game):
+    """What a session run ends in, for comparing two runs"""
+    return (game.state, game.score, game.completed_quests, game.player_energy, tuple(game.player), game.sim_ticks,
+            sorted(game.completed_friends))
@@ -0,0 +1,57 @@
+import os
+
+import pygame
+
+from asset_manager import AssetManager, placeholder_sprite
+
+SPRITE = "resources/cutout/thijs.png"
+SIZE = (64, 128)
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGBA")
+
+
+def test_sprites_are_scaled_and_loaded_once():
+    manager = AssetManager()
+    sprite = manager.load_sprite(SPRITE, SIZE)
+    assert sprite.get_size() == SIZE
+    assert manager.load_sprite(SPRITE, list(SIZE)) is sprite
+    assert manager.load_sprite(SPRITE, (32, 64)) is not sprite
+    manager.clear()
+    assert manager.load_sprite(SPRITE, SIZE) is not sprite
+
+
+def test_disk_cache_round_trip(tmp_path):
+    first = AssetManager(disk_cache_dir=str(tmp_path))
+    expected = pixels(first.load_sprite(SPRITE, SIZE))
+    [entry] = os.listdir(tmp_path)
+    assert entry.endswith("_64x128.sprite")
+
+    cached = AssetManager(disk_cache_dir=str(tmp_path))
+    assert cached._read_disk_cache(SPRITE, SIZE) is not None
+    assert pixels(cached.load_sprite(SPRITE, SIZE)) == expected
+
+
+def test_stale_or_torn_disk_cache_entries_are_ignored(tmp_path):
+    manager = AssetManager(disk_cache_dir=str(tmp_path))
+    manager.load_sprite(SPRITE, SIZE)
+    entry = tmp_path / os.listdir(tmp_path)[0]
+
+    data = entry.read_bytes()
+    entry.write_bytes(data[:-1])
+    assert manager._read_disk_cache(SPRITE, SIZE) is None
+
+    # An entry written for another version of the source image
+    stale = bytearray(data)
+    stale[6] ^= 1  # the source mtime
+    entry.write_bytes(bytes(stale))
+    assert manager._read_disk_cache(SPRITE, SIZE) is None
+    assert manager.decode(SPRITE, SIZE).get_size() == SIZE
+    assert entry.read_bytes() == data  # rewritten
+
+
+def test_placeholders_are_shared():
+    placeholder = placeholder_sprite(SIZE, (0, 0, 255))
+    assert placeholder is placeholder_sprite(list(SIZE), [0, 0, 255])
+    assert placeholder.get_at((10, 10))[:3] == (0, 0, 255)
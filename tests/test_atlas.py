@@ -0,0 +1,42 @@
+import pygame
+import pytest
+
+from asset_manager import AssetManager
+from atlas import Atlas, build_atlas, shelf_pack
+from text_cache import shared_font
+
+
+def test_shelf_pack_keeps_rects_apart():
+    sizes = [(64, 128)] * 9 + [(20, 30), (200, 40), (5, 5)] * 4
+    placements, pages = shelf_pack(sizes, 256, padding=2)
+    assert pages > 1
+    rects = {}
+    for (page, x, y), (width, height) in zip(placements, sizes):
+        assert x + width <= 256 and y + height <= 256
+        rect = pygame.Rect(x, y, width, height)
+        assert rect.collidelist(rects.setdefault(page, [])) == -1
+        rects[page].append(rect)
+
+
+@pytest.mark.parametrize("display", [True, False])
+def test_atlas_images_match_loading_and_rendering_them(tmp_path, display):
+    # Pages are converted for the display when there is one, and kept as loaded otherwise
+    pygame.font.init()
+    index = build_atlas(str(tmp_path), page_size=512)
+    if not display:
+        pygame.display.quit()
+    try:
+        atlas = Atlas.load(str(tmp_path / "atlas.json"))
+    finally:
+        pygame.display.init()
+    assert len(atlas.sprites) == len(index["sprites"]) > 0
+    assert len(atlas.glyphs) == len(index["glyphs"]) > 0
+
+    decoder = AssetManager()
+    for (path, size), sprite in atlas.sprites.items():
+        expected = decoder.decode(path, size)
+        assert sprite.get_size() == expected.get_size()
+        assert pygame.image.tobytes(sprite, "RGBA") == pygame.image.tobytes(expected, "RGBA"), path
+    for (font_size, text, color), glyph in atlas.glyphs.items():
+        expected = shared_font(font_size).render(text, True, color)
+        assert pygame.image.tobytes(glyph, "RGBA") == pygame.image.tobytes(expected, "RGBA"), text
@@ -0,0 +1,94 @@
+import sys
+from collections import Counter
+
+import pytest
+
+import balancing
+import MiniGames
+from balancing import (
+    apply_class_overrides, apply_game_overrides, chunks, histogram_percentiles, init_worker, merge, new_stats,
+    parse_overrides, play_mini_games, play_sessions, report, sweep_report,
+)
+from headless import create_headless_game
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(sys, "stdout", sys.stdout)  # init_worker silences stdout
+    monkeypatch.setattr(balancing, "_worker", {})
+    init_worker({}, 0.8, 0.4)
+    sys.stdout = sys.__stdout__
+
+
+def test_parse_overrides():
+    assert parse_overrides(["CowFeeding.DURATION=12", "game.quest_energy_cost=15", "MiniGame.GLYPHS=[1]"]) == {
+        ("CowFeeding", "DURATION"): 12, ("game", "quest_energy_cost"): 15, ("MiniGame", "GLYPHS"): [1]}
+    for bad in ("DURATION=12", "CowFeeding.DURATION", "CowFeeding.DURATION=twelve"):
+        with pytest.raises(ValueError):
+            parse_overrides([bad])
+
+
+def test_apply_overrides(monkeypatch):
+    cow_feeding = MiniGames.CowFeeding
+    monkeypatch.setattr(cow_feeding, "DURATION", cow_feeding.DURATION)
+    apply_class_overrides({("CowFeeding", "DURATION"): 12.0, ("game", "quest_energy_cost"): 15})
+    assert cow_feeding.DURATION == 12.0
+    with pytest.raises(AttributeError):
+        apply_class_overrides({("CowFeeding", "NO_SUCH_CONSTANT"): 1})
+
+    game = create_headless_game(render=False, seed=1)
+    apply_game_overrides(game, {("game", "quest_energy_cost"): 15, ("game", "energy_regen_interval"): 0.5})
+    assert game.quest_energy_cost == 15
+    assert game.energy_timer.interval == 0.5 and game.energy_timer.deadline == game.scheduler.now + 0.5
+    with pytest.raises(AttributeError):
+        apply_game_overrides(game, {("game", "no_such_value"): 1})
+
+
+def test_histogram_percentiles():
+    assert histogram_percentiles(Counter()) == {}
+    histogram = Counter({9: 50, 19: 40, 49: 10})  # 1 s, 2 s and 5 s buckets
+    assert histogram_percentiles(histogram) == {"p50": 1.0, "p90": 2.0, "p99": 5.0}
+
+
+def test_runs_are_reproducible_and_independent_of_chunking(worker):
+    whole = play_mini_games("memory_cards", 7, 0, 20)
+    split = merge(merge(new_stats(), play_mini_games("memory_cards", 7, 0, 12)),
+                  play_mini_games("memory_cards", 7, 12, 8))
+    assert split == whole
+    assert play_mini_games("memory_cards", 8, 0, 20) != whole
+    assert list(chunks(1200, 500)) == [(0, 500), (500, 500), (1000, 200)]
+
+
+def test_report(worker):
+    total = merge(new_stats(), play_mini_games("cow_feeding", 1, 0, 30))
+    merge(total, play_sessions(1, 0, 2, max_seconds=20, friend_count=None))
+    summary = report(total)
+    cows = summary["mini_games"]["cow_feeding"]
+    assert cows["runs"] == 30
+    assert 0 <= cows["win_rate"] <= 1 and 0 <= cows["fail_rate"] <= 1
+    assert sum(cows["progress_share"].values()) == pytest.approx(1)
+    sessions = summary["sessions"]
+    assert sessions["runs"] == 2
+    assert sessions["victory_rate"] + sessions["game_over_rate"] + sessions["timeout_rate"] == pytest.approx(1)
+    assert sessions["energy_curve"][0] == {"t": 0.0, "sessions": 2, "mean": 100.0, "min": 100}
+
+
+def mean_progress_share(mini_game_type, skill, reaction=0.4):
+    stats = play_mini_games(mini_game_type, 1, 0, 40, skill, reaction)["mini_games"][mini_game_type]
+    return sum(bucket * count for bucket, count in stats["progress_share"].items()) / stats["runs"]
+
+
+def test_bots_press_buttons_as_well_as_their_skill(worker):
+    rates = [mean_progress_share("button_mash", skill) for skill in (0.0, 0.5, 1.0)]
+    assert rates == sorted(set(rates))
+    assert mean_progress_share("button_mash", 1.0, 0.2) == 10  # fast enough to fill the bar
+
+
+def test_sweep_report():
+    def total(wins):
+        stats = new_stats()
+        stats["mini_games"]["button_mash"] = {"runs": 10, "wins": wins}
+        return stats
+
+    assert sweep_report({"idle": total(0), "0.5": total(3), "1": total(9)}) == {
+        "button_mash": {"idle": 0.0, "0.5": 0.3, "1": 0.9}}
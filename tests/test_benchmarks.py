@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+from run_benchmarks import collect, compare, rate  # noqa: E402
+
+
+def result(value, higher_is_better=True):
+    return {"value": value, "unit": "x", "higher_is_better": higher_is_better}
+
+
+def test_compare_flags_regressions_in_either_direction():
+    baseline = {"fps": result(100.0), "latency": result(10.0, False), "steady": result(50.0)}
+    results = {"fps": result(85.0), "latency": result(10.5, False), "steady": result(49.0), "new": result(1.0)}
+    assert compare(results, baseline, 0.10) == ["fps"]
+    results["latency"] = result(12.0, False)
+    assert compare(results, baseline, 0.10) == ["fps", "latency"]
+    assert compare(results, baseline, 0.25) == []
+
+
+def test_rate_times_only_the_work():
+    prepared = []
+    assert rate(lambda: None, 1000, repeats=3) > 0
+    rate(lambda state: None, 1, repeats=3, prepare=lambda: prepared.append(1))
+    assert prepared == [1, 1, 1]
+
+
+@pytest.mark.parametrize("name", ["overworld.update[8]", "overworld.frame[8]", "mini_game.memory_cards.update",
+                                  "mini_game.cow_feeding.input", "mini_game.code_sequence.draw",
+                                  "mini_game.plant_collection[5000].update", "restart_game"])
+def test_benchmarks_measure_something(name):
+    [benchmark] = [benchmark for benchmark in collect(0.01) if benchmark.name == name]
+    assert benchmark.measure() > 0
+
+
+def test_every_mini_game_is_benchmarked():
+    from MiniGames import MINI_GAME_TYPES
+
+    names = {benchmark.name for benchmark in collect(1.0)}
+    for mini_game_type in MINI_GAME_TYPES:
+        for part in ("update", "input", "draw"):
+            assert f"mini_game.{mini_game_type}.{part}" in names
+
+
+def test_saved_runs_are_compared(tmp_path):
+    script = os.path.join(REPO_ROOT, "benchmarks", "run_benchmarks.py")
+    baseline = tmp_path / "baseline.json"
+    run = [sys.executable, script, "--quick", "--filter", "restart_game"]
+    subprocess.run(run + ["--save", str(baseline)], check=True, capture_output=True)
+    report = json.loads(baseline.read_text())
+    assert report["meta"]["quick"] and set(report["results"]) == {"restart_game"}
+
+    report["results"]["restart_game"]["value"] /= 100  # a baseline that was much faster
+    baseline.write_text(json.dumps(report))
+    completed = subprocess.run(run + ["--baseline", str(baseline)], capture_output=True, text=True)
+    assert completed.returncode == 1 and "REGRESSION" in completed.stdout
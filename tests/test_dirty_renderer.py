@@ -0,0 +1,81 @@
+import pygame
+
+from dirty_renderer import DirtyRectRenderer
+from game_engine import GameState
+from headless import create_headless_game
+
+
+class Box(pygame.sprite.DirtySprite):
+    def __init__(self, rect, color):
+        super().__init__()
+        self.image = pygame.Surface(rect.size)
+        self.image.fill(color)
+        self.rect = rect
+
+
+def test_full_redraw_only_when_invalidated():
+    screen = pygame.Surface((100, 100))
+    renderer = DirtyRectRenderer(screen, (255, 255, 255), headless=True)
+    drawn = []
+    renderer.begin_frame("menu")
+    renderer.render(lambda: drawn.append(1))
+    renderer.begin_frame("menu")
+    renderer.render(lambda: drawn.append(2))
+    assert drawn == [1]
+
+    renderer.begin_frame("dialog")  # a new scene
+    renderer.render(lambda: drawn.append(3))
+    renderer.invalidate()
+    renderer.render(lambda: drawn.append(4))
+    assert drawn == [1, 3, 4]
+    assert renderer.full_redraws == 3
+
+
+def test_only_changed_sprites_are_repainted():
+    screen = pygame.Surface((100, 100))
+    renderer = DirtyRectRenderer(screen, (255, 255, 255), headless=True)
+    group = pygame.sprite.LayeredDirty()
+    set_threshold = getattr(group, "set_timing_threshold", None) or group.set_timing_treshold
+    set_threshold(float("inf"))  # as the Overworld does
+    background = pygame.Surface(screen.get_size())
+    background.fill((255, 255, 255))
+    group.clear(screen, background)
+    box = Box(pygame.Rect(10, 10, 20, 20), (255, 0, 0))
+    still = Box(pygame.Rect(60, 60, 20, 20), (0, 0, 255))
+    group.add(box, still)
+
+    renderer.render_sprites(group)  # the first frame is drawn in full
+    assert renderer.pending_full and renderer.pending_rects == []
+    renderer.present()
+    renderer.render_sprites(group)  # the group settles into dirty-rect mode
+    renderer.present()
+
+    renderer.render_sprites(group)
+    assert renderer.pending_rects == []  # nothing changed
+    box.rect.x += 5
+    box.dirty = 1
+    renderer.render_sprites(group)
+    assert renderer.pending_rects == [pygame.Rect(10, 10, 25, 20)]  # old and new position
+    assert screen.get_at((12, 15))[:3] == (255, 255, 255)
+    assert screen.get_at((32, 15))[:3] == (255, 0, 0)
+    assert screen.get_at((70, 70))[:3] == (0, 0, 255)
+    renderer.present()
+    assert renderer.pending_rects == [] and not renderer.pending_full
+
+
+def test_standing_still_repaints_nothing():
+    game = create_headless_game(seed=1)
+    game.state = GameState.PLAYING
+    renderer = game.renderer
+    presented = []
+    present = renderer.present
+
+    def record():
+        presented.append((renderer.pending_full, list(renderer.pending_rects)))
+        present()
+
+    renderer.present = record
+    for _ in range(35):
+        game.step()
+    assert presented[0][0]  # entering the overworld
+    assert presented[5:] == [(False, [])] * 30
@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from entity_store import EntityStore
+
+
+def make_store():
+    store = EntityStore(x="i", y="i", fed="B")
+    store.add(x=10, y=20)
+    store.extend(x=[30, 40], y=[50, 60], fed=[1, 0])
+    return store
+
+
+def test_columns_and_rows():
+    store = make_store()
+    assert len(store) == 3
+    assert list(store.x) == [10, 30, 40] and store.x is store.columns["x"]
+    assert store.row(0) == {"x": 10, "y": 20, "fed": 0}
+    assert store.row(1) == {"x": 30, "y": 50, "fed": 1}
+    store.fed[2] = 1
+    assert store.row(2)["fed"] == 1
+    assert store.nbytes() == 3 * (4 + 4 + 1)
+    assert len(EntityStore()) == 0
+
+
+def test_bad_fields():
+    with pytest.raises(ValueError):
+        EntityStore(add="i")
+    store = make_store()
+    with pytest.raises(KeyError):
+        store.add(z=1)
+    with pytest.raises(KeyError):
+        store.extend(z=[1])
+    with pytest.raises(ValueError):
+        store.extend(x=[1, 2], y=[1])
+    # A value that does not fit leaves no partial entity behind
+    with pytest.raises(OverflowError):
+        store.add(x=1, fed=256)
+    with pytest.raises(OverflowError):
+        store.extend(x=[1, 2], fed=[1, 256])
+    assert [len(column) for column in store.columns.values()] == [3, 3, 3]
+
+
+def test_missing_columns_start_at_zero():
+    store = make_store()
+    store.extend(y=[7, 8])
+    assert list(store.x[3:]) == [0, 0] and list(store.fed[3:]) == [0, 0]
+
+
+@pytest.mark.parametrize("protocol", range(2, pickle.HIGHEST_PROTOCOL + 1))
+def test_pickling(protocol):
+    store = make_store()
+    copy = pickle.loads(pickle.dumps(store, protocol=protocol))
+    assert copy.columns == store.columns
+    assert copy.x is copy.columns["x"]
+
+
+def test_columns_travel_out_of_band():
+    store = make_store()
+    buffers = []
+    data = pickle.dumps(store, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 3
+    assert bytes(buffers[0].raw()) == store.x.tobytes()
+    copy = pickle.loads(data, buffers=buffers)
+    assert copy.columns == store.columns
+    copy.x[0] = -1
+    assert store.x[0] == 10  # the copy owns its arrays
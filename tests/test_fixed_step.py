@@ -0,0 +1,60 @@
+import pygame
+import pytest
+
+from game_engine import GameState
+from headless import VirtualClock, create_headless_game, run_headless
+
+
+def playing_game(**kwargs):
+    game = create_headless_game(render=False, seed=1, **kwargs)
+    game.state = GameState.PLAYING
+    return game
+
+
+@pytest.mark.parametrize("frame_ms, ticks", [(1000 / 60, 1), (1000 / 30, 2), (1000 / 144, 0), (5.0, 0)])
+def test_a_frame_runs_the_steps_it_covers(frame_ms, ticks):
+    game = playing_game()
+    game.advance(frame_ms)
+    assert game.sim_ticks == ticks
+    assert game.accumulator_ms == pytest.approx(frame_ms - ticks * game.sim_step_ms)
+    assert game.render_alpha == pytest.approx(game.accumulator_ms / game.sim_step_ms)
+
+
+@pytest.mark.parametrize("fps", [30, 60, 144])
+def test_simulation_speed_does_not_depend_on_the_frame_rate(fps):
+    game = playing_game(clock=VirtualClock())
+    game.FPS = fps
+    run_headless(game, fps * 2)  # two seconds
+    assert abs(game.sim_ticks - 2 * game.SIM_HZ) <= 1
+    assert game.sim_time == pytest.approx(game.sim_ticks * game.SIM_DT)
+
+
+def test_long_frames_are_clamped():
+    game = playing_game()
+    game.advance(5000)
+    assert game.sim_ticks == 15  # 250 ms
+    game.advance(5000)
+    assert game.sim_ticks == 30
+
+
+def test_render_position_is_interpolated():
+    game = playing_game()
+    game.player_previous = (100, 200)
+    game.player.topleft = (110, 180)
+    game.render_alpha = 0.0
+    assert game.player_render_position() == (100, 200)
+    game.render_alpha = 0.5
+    assert game.player_render_position() == (105, 190)
+    game.render_alpha = 1.0
+    assert game.player_render_position() == (110, 180)
+
+
+def test_steps_keep_the_previous_position():
+    game = playing_game()
+    game.input.press(pygame.K_LEFT)
+    start = game.player.topleft
+    game.advance(game.sim_step_ms * 1.5)
+    assert game.player_previous == start
+    assert game.player.x == start[0] - game.player_speed
+    assert game.render_alpha == pytest.approx(0.5)
+    assert game.player_render_position()[0] == round(start[0] - game.player_speed / 2)
@@ -0,0 +1,65 @@
+import pygame
+
+from game_engine import GameState
+from game_input import ScriptedInput
+from headless import VirtualClock, create_headless_game, run_headless
+
+
+def test_virtual_clock_never_sleeps_and_keeps_exact_time():
+    clock = VirtualClock()
+    for _ in range(60):
+        assert clock.tick(60) == 1000 / 60
+    assert abs(clock.time_ms - 1000.0) < 1e-9
+    assert clock.get_fps() == 60.0
+    assert clock.tick() == 0.0  # uncapped
+
+
+def test_scripted_input():
+    source = ScriptedInput()
+    source.press(pygame.K_LEFT)
+    source.tap(pygame.K_a)
+    source.click((10, 20))
+    events = source.get_events()
+    assert [event.type for event in events] == [pygame.KEYDOWN, pygame.KEYDOWN, pygame.KEYUP,
+                                                pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]
+    assert events[1].unicode == "a"
+    assert source.get_events() == []
+    assert source.get_pressed()[pygame.K_LEFT] and not source.get_pressed()[pygame.K_a]
+    source.release(pygame.K_LEFT)
+    assert not source.get_pressed()[pygame.K_LEFT]
+
+
+def test_logic_only_game_has_no_screen():
+    game = create_headless_game(render=False, seed=1)
+    assert game.screen is None and game.overworld is None
+    assert run_headless(game, 10) == 10
+
+
+def test_rendered_headless_game_draws_off_screen():
+    game = create_headless_game(seed=1)
+    assert game.screen.get_size() == (game.WIDTH, game.HEIGHT)
+    assert pygame.display.get_surface() is None  # no window was opened
+    run_headless(game, 3)
+    # The menu title was drawn across the middle of the screen
+    title_y = game.HEIGHT // 2 - 50
+    assert any(game.screen.get_at((x, title_y))[:3] != game.WHITE for x in range(game.WIDTH))
+
+
+def test_scripted_play():
+    game = create_headless_game(render=False, seed=1)
+    start = game.player.x
+
+    def script(frame, game):
+        if frame == 0:
+            game.input.tap(pygame.K_SPACE)
+        elif frame == 1:
+            game.input.press(pygame.K_LEFT)
+        elif frame == 31:
+            game.input.release(pygame.K_LEFT)
+        elif frame == 40:
+            game.input.quit()
+
+    assert run_headless(game, 100, script) == 41
+    assert game.state == GameState.PLAYING
+    assert game.player.x == start - 30 * game.player_speed
+    assert not game.running
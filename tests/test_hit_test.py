@@ -0,0 +1,47 @@
+import random
+from array import array
+
+import pytest
+
+import hit_test
+from hit_test import GridLayout, circle_hits, rect_hits
+
+
+def columns(typecode, count, rng):
+    xs = array(typecode, [rng.randint(0, 3000) for _ in range(count)])
+    ys = array(typecode, [rng.randint(0, 3000) for _ in range(count)])
+    skip = array("B", [rng.random() < 0.2 for _ in range(count)])
+    return xs, ys, skip
+
+
+@pytest.mark.parametrize("typecode", ["i", "I", "h", "q"])
+@pytest.mark.parametrize("count", [10, 100, 2000])
+def test_numpy_and_python_agree(typecode, count, monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(count)
+    xs, ys, skip = columns(typecode, count, rng)
+    points = [(rng.randint(0, 3000), rng.randint(0, 3000)) for _ in range(30)]
+    with_numpy = [(circle_hits(xs, ys, point, 300, skip), rect_hits(xs, ys, (200, 150), point, skip))
+                  for point in points]
+    monkeypatch.setattr(hit_test, "np", None)
+    without = [(circle_hits(xs, ys, point, 300, skip), rect_hits(xs, ys, (200, 150), point, skip))
+               for point in points]
+    assert with_numpy == without
+
+
+def test_hits_come_back_in_entity_order():
+    xs = array("i", [0, 10, 20, 10])
+    ys = array("i", [0, 0, 0, 0])
+    assert circle_hits(xs, ys, (10, 0), 11) == [0, 1, 2, 3]
+    assert circle_hits(xs, ys, (10, 0), 10) == [1, 3]  # strictly within
+    assert circle_hits(xs, ys, (10, 0), 11, skip=[0, 1, 0, 0]) == [0, 2, 3]
+    assert rect_hits(xs, ys, (10, 10), (20, 10)) == [1, 2, 3]  # edges included
+
+
+def test_grid_layout_matches_testing_every_cell():
+    layout = GridLayout((100, 50), (60, 60), (80, 70), 4, 3)
+    for x in range(80, 450, 3):
+        for y in range(30, 300, 3):
+            expected = rect_hits([layout.position(i)[0] for i in range(len(layout))],
+                                 [layout.position(i)[1] for i in range(len(layout))], (60, 60), (x, y))
+            assert layout.index_at((x, y)) == (expected[0] if expected else None)
@@ -0,0 +1,95 @@
+import pygame
+
+from game_engine import GameState
+from headless import create_headless_game
+from hud import Label, ValueBar, ValueLabel, bar_surface, framed_bar_surface
+from observable import Observable, observed
+from text_cache import TextCache, shared_font
+
+
+class Stats(Observable):
+    score = observed()
+    energy = observed()
+
+    def __init__(self):
+        self.score = 0
+        self.energy = 100
+
+
+def make_label(stats, cache):
+    pygame.font.init()
+    return ValueLabel(cache, shared_font(24), (0, 0, 0), (10, 10), "Score: {}".format, stats, "score")
+
+
+def test_observed_attributes_notify_on_change_only():
+    stats = Stats()
+    seen = []
+    stats.observe("score", seen.append)
+    stats.score = 0
+    stats.score = 5
+    stats.score = 5
+    stats.energy = 50  # nobody is watching
+    assert seen == [5]
+    stats.unobserve("score", seen.append)
+    stats.unobserve("score", seen.append)  # harmless when no longer observing
+    stats.score = 6
+    assert seen == [5]
+
+
+def test_value_label_renders_only_when_its_value_changes():
+    stats = Stats()
+    cache = TextCache()
+    label = make_label(stats, cache)
+    assert label.text == "Score: 0" and label.dirty
+    label.dirty = 0
+    image = label.image
+    misses = cache.misses
+    stats.score = 0
+    assert label.image is image and not label.dirty
+    stats.score = 100
+    assert label.text == "Score: 100" and label.dirty and label.image is not image
+    assert cache.misses == misses + 1
+
+    label.unbind()
+    stats.score = 200
+    assert label.text == "Score: 100"
+
+
+def test_value_bar_redraws_only_when_the_fill_width_changes():
+    stats = Stats()
+    bar = ValueBar((0, 0), (150, 20), ((255, 0, 0), (0, 255, 0), (0, 0, 0)), 100, stats, "energy")
+    assert bar.fill_width == 150
+    bar.dirty = 0
+    stats.energy = 99.5  # still 149 pixels wide
+    assert bar.fill_width == 149 and bar.dirty
+    bar.dirty = 0
+    stats.energy = 99.4
+    assert not bar.dirty
+    assert bar.image is framed_bar_surface(149, 150, 20, (255, 0, 0), (0, 255, 0), (0, 0, 0))
+
+
+def test_bar_surfaces_are_shared():
+    surface = bar_surface(30, 50, 8, (255, 0, 0), (0, 255, 0))
+    assert bar_surface(30, 50, 8, (255, 0, 0), (0, 255, 0)) is surface
+    assert bar_surface(-5, 50, 8, (255, 0, 0), (0, 255, 0)).get_at((0, 0))[:3] == (255, 0, 0)
+    assert bar_surface(60, 50, 8, (255, 0, 0), (0, 255, 0)).get_width() == 60  # overfilled
+
+
+def test_labels_keep_their_anchor():
+    pygame.font.init()
+    label = Label(TextCache(), shared_font(24), (0, 0, 0), (100, 50), "short", anchor="center")
+    label.set_text("a much longer text")
+    assert label.rect.center == (100, 50)
+
+
+def test_overworld_hud_follows_the_game():
+    game = create_headless_game(seed=1)
+    game.state = GameState.PLAYING
+    game.step()
+    score = game.overworld.hud[2]
+    game.score = 300
+    assert score.text == "Score: 300"
+    game.restart_game()  # the old overworld stops following the game
+    game.score = 400
+    assert score.text == "Score: 300"
+    assert game.overworld.hud[2].text == "Score: 400"
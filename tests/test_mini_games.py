@@ -0,0 +1,55 @@
+import pickle
+
+import pygame
+import pytest
+
+import MiniGames
+from MiniGames import DEFAULT_MINI_GAME, MINI_GAME_TYPES, MiniGame, create_mini_game
+from game_engine import GameState
+from headless import create_headless_game
+from rng import RandomStreams
+
+
+@pytest.fixture(scope="module")
+def game():
+    return create_headless_game(seed=1)
+
+
+@pytest.mark.parametrize("mini_game_type", sorted(MINI_GAME_TYPES))
+def test_every_type_plays_and_draws(game, mini_game_type):
+    mini_game = create_mini_game(mini_game_type, game, RandomStreams(1).stream(mini_game_type))
+    assert isinstance(mini_game, MiniGame) and mini_game.TYPE == mini_game_type
+    mini_game.setup("help out")
+    for key in (pygame.K_SPACE, pygame.K_1, pygame.K_a, pygame.K_RETURN):
+        mini_game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=pygame.key.name(key), mod=0))
+    mini_game.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(600, 400), button=1))
+    mini_game.draw(game.screen)
+
+    while mini_game.outcome() is None:
+        mini_game.update(game.SIM_DT)
+    assert mini_game.time <= mini_game.duration + game.SIM_DT
+    assert pickle.loads(pickle.dumps(mini_game)).progress == mini_game.progress
+
+
+def test_unknown_types_fall_back_to_button_mash(game):
+    mini_game = create_mini_game("no_such_game", game, RandomStreams(1).stream("x"))
+    assert mini_game.TYPE == DEFAULT_MINI_GAME
+    mini_game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ", mod=0))
+    assert mini_game.progress == 5
+
+
+def test_friends_play_the_mini_game_from_the_roster():
+    game = create_headless_game(render=False, seed=1)
+    friend = game.friends[0]
+    game.state = GameState.QUEST_DIALOG
+    game.current_friend = friend
+    game.current_quest = friend.get_random_objective(game.rng.stream("test"))
+    game.accept_quest()
+    assert game.state == GameState.MINI_GAME
+    assert game.mini_game.TYPE == friend.mini_game == game.roster.friends[0].mini_game
+
+
+def test_plugins_load_on_first_use():
+    assert set(MINI_GAME_TYPES.values()) <= set(dir(MiniGames))
+    with pytest.raises(AttributeError):
+        MiniGames.NoSuchGame
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+
+import pytest
+
+from headless import create_headless_game
+from multiplayer import MultiplayerClient, MultiplayerLink, MultiplayerServer, load_test
+from net_protocol import (
+    HELLO, INPUT, MOVE_RIGHT, MSG_HELLO, MSG_INPUT, MSG_RESYNC, PROTOCOL_VERSION, RESYNC, encode_update, frame,
+    quantize, read_frame,
+)
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data):
+        self.frames.append(data[2:])
+
+
+@pytest.mark.parametrize("payload", [b"", INPUT.pack(MSG_INPUT, 1, 2)[:-1], b"\x63"])
+def test_server_disconnects_a_client_that_sends_garbage(payload):
+    async def session():
+        server = MultiplayerServer(seed=3)
+        await server.start(port=0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(frame(HELLO.pack(MSG_HELLO, PROTOCOL_VERSION)))
+        await read_frame(reader)
+        assert len(server.players) == 1
+
+        writer.write(frame(payload))
+        assert await asyncio.wait_for(reader.read(), 5) == b""  # closed by the server
+        writer.close()
+        # The server goes on serving
+        client = await MultiplayerClient().connect(port=server.port)
+        client.send_input(0)
+        await asyncio.sleep(0)
+        players = len(server.players)
+        await client.close()
+        await server.stop()
+        return players
+
+    assert asyncio.run(session()) == 1
+
+
+def test_world_must_fit_the_protocol():
+    with pytest.raises(ValueError):
+        MultiplayerServer(world_size=(200000, 1000))
+
+
+def test_a_client_that_loses_track_asks_for_a_resync():
+    client = MultiplayerClient()
+    client.writer = RecordingWriter()
+    client.input_seq = 4
+    stale = encode_update(1, 4, 0, [(5, 10, 10, (9, 9))], [], [])
+    client.apply_update(stale)  # a delta for a player we never heard of
+    assert client.resyncs == 1 and client.writer.frames == [RESYNC.pack(MSG_RESYNC, 5)]
+    client.apply_update(stale)  # already asked: the server has not seen the request yet
+    assert client.resyncs == 1
+
+    client.apply_update(encode_update(2, 5, 0, [(5, 10, 10, None)], [], []))
+    assert client.players == {5: (10, 10)}
+    client.apply_update(encode_update(3, 5, 0, [(6, 10, 10, (9, 9))], [], []))
+    assert client.resyncs == 2 and client.players == {}
+
+
+def test_resync_over_the_wire():
+    async def session():
+        server = MultiplayerServer(seed=3, send_hz=60)
+        await server.start(port=0)
+        client = await MultiplayerClient().connect(port=server.port)
+        listener = asyncio.ensure_future(client.listen())
+        client.send_input(MOVE_RIGHT)
+        await server.run(duration=0.2)
+        with client.lock:
+            client.players.clear()  # lose track of ourselves; the next delta is for an unknown player
+        await server.run(duration=0.2)
+        rect = server.players[client.player_id].rect
+        state = (client.resyncs, client.players.get(client.player_id), (quantize(rect.x), quantize(rect.y)),
+                 listener.done())
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await client.close()
+        await server.stop()
+        return state
+
+    resyncs, position, expected, disconnected = asyncio.run(session())
+    assert resyncs == 1 and position == expected and not disconnected
+
+
+def test_link_skips_friends_the_local_world_does_not_have():
+    game = create_headless_game(render=False, seed=1, friend_count=3)
+    link = MultiplayerLink.__new__(MultiplayerLink)  # without connecting
+    link.client = MultiplayerClient()
+    link.loop = asyncio.new_event_loop()
+    link.game = link.friends = link.held = None
+    link.attach(game)
+    link.client.friends = {1: (1, 80), 7: (1, 80)}
+    link.sync()
+    assert game.friends[1].quest_completed and game.friends[1].happiness == 80
+    assert game.completed_friends == {game.friends[1].name}
+    link.loop.close()
+
+
+def test_load_test_shuts_down_cleanly(caplog):
+    caplog.set_level(logging.ERROR, logger="asyncio")
+    results = asyncio.run(load_test(players=4, seconds=0.3, friend_count=20, seed=1))
+    assert results["players"] == 4 and results["ticks"] > 0 and results["updates_per_client"] > 0
+    assert not caplog.records
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from net_protocol import (
+    FRIEND, HELLO, INPUT, MSG_HELLO, MSG_INPUT, MSG_QUEST_DONE, MSG_RESYNC, MSG_UPDATE, PLAYER_DELTA, PLAYER_FULL,
+    PLAYER_GONE, PROTOCOL_VERSION, QUANTUM, QUEST_DONE, RECORD_DELTA, RECORD_FULL, RESYNC, UPDATE, ProtocolError,
+    decode_update, dequantize, encode_update, frame, message_type, quantize, read_frame, unpack,
+)
+
+
+def test_update_round_trip():
+    players = [(1, 10, 20, None),  # just came into view
+               (2, 110, 120, (100, 100)),  # moved a little
+               (3, 500, 20, (100, 20))]  # moved too far for a delta
+    payload = encode_update(7, 42, 1300, players, [9, 10], [(0, 1, 300), (5, 0, -4), (6, 0, 77)])
+    assert payload[0] == MSG_UPDATE
+    assert len(payload) == (UPDATE.size + 2 * PLAYER_FULL.size + PLAYER_DELTA.size + 2 * PLAYER_GONE.size
+                            + 3 * FRIEND.size)
+
+    tick, input_seq, score, records, gone, friends = decode_update(payload)
+    assert (tick, input_seq, score) == (7, 42, 1300)
+    assert records == [(RECORD_FULL, 1, 10, 20), (RECORD_DELTA, 2, 10, 20), (RECORD_FULL, 3, 500, 20)]
+    assert gone == [9, 10]
+    # Happiness is clamped to a byte
+    assert friends == [(0, 1, 255), (5, 0, 0), (6, 0, 77)]
+
+
+@pytest.mark.parametrize("dx, kind", [(127, RECORD_DELTA), (-128, RECORD_DELTA), (128, RECORD_FULL),
+                                      (-129, RECORD_FULL)])
+def test_delta_range(dx, kind):
+    payload = encode_update(0, 0, 0, [(1, 1000 + dx, 1000, (1000, 1000))], [], [])
+    assert decode_update(payload)[3][0][0] == kind
+
+
+def test_empty_update():
+    assert decode_update(encode_update(1, 2, 3, [], [], [])) == (1, 2, 3, [], [], [])
+
+
+def test_quantize():
+    assert quantize(1023.9) == 511
+    assert dequantize(quantize(1024)) == 1024
+    assert dequantize(0xFFFF) == 0xFFFF * QUANTUM
+
+
+@pytest.mark.parametrize("payload", [
+    encode_update(1, 2, 3, [(1, 10, 20, None)], [4], [(0, 1, 50)])[:-1],  # cut short
+    encode_update(1, 2, 3, [(1, 10, 20, None)], [], [])[:UPDATE.size + 2],  # record cut off
+    encode_update(1, 2, 3, [], [], []) + b"\0",  # trailing byte
+    bytes([MSG_UPDATE]),
+])
+def test_malformed_updates_are_protocol_errors(payload):
+    with pytest.raises(ProtocolError):
+        decode_update(payload)
+
+
+def test_fixed_size_messages():
+    assert unpack(INPUT, INPUT.pack(MSG_INPUT, 5, 3)) == (MSG_INPUT, 5, 3)
+    with pytest.raises(ProtocolError):
+        unpack(INPUT, INPUT.pack(MSG_INPUT, 5, 3)[:-1])
+    with pytest.raises(ProtocolError):
+        unpack(QUEST_DONE, QUEST_DONE.pack(MSG_QUEST_DONE, 1, 1) + b"\0")
+    assert unpack(RESYNC, RESYNC.pack(MSG_RESYNC, 9)) == (MSG_RESYNC, 9)
+    with pytest.raises(ProtocolError):
+        unpack(HELLO, b"")
+    with pytest.raises(ProtocolError):
+        message_type(b"")
+
+
+def test_frames():
+    with pytest.raises(ValueError):
+        frame(bytes(0x10000))
+
+    async def read_back():
+        reader = asyncio.StreamReader()
+        reader.feed_data(frame(b"abc") + frame(b"") + frame(HELLO.pack(MSG_HELLO, PROTOCOL_VERSION)))
+        reader.feed_eof()
+        payloads = [await read_frame(reader) for _ in range(3)]
+        with pytest.raises(asyncio.IncompleteReadError):
+            await read_frame(reader)
+        return payloads
+
+    assert asyncio.run(read_back()) == [b"abc", b"", HELLO.pack(MSG_HELLO, PROTOCOL_VERSION)]
@@ -0,0 +1,130 @@
+import random
+
+import pygame
+import pytest
+
+from camera import Camera
+from game_engine import GameState
+from headless import create_headless_game
+from overworld import CULL_MARGIN, HUD_LAYER, GlowSprite, HappinessBarSprite, glow_surface
+from savestate import restore, snapshot
+
+
+def playing_game(**kwargs):
+    game = create_headless_game(seed=1, **kwargs)
+    game.state = GameState.PLAYING
+    game.step()
+    return game
+
+
+def test_glow_surfaces_are_shared_per_color():
+    assert glow_surface((255, 0, 0)) is glow_surface((255, 0, 0))
+    assert glow_surface((255, 0, 0)) is not glow_surface((0, 0, 255))
+
+
+def test_a_friends_sprites_share_a_layer_by_bottom_edge():
+    game = playing_game()
+    group = game.overworld.group
+    assert game.overworld.friend_sprites
+    for friend, sprites in game.overworld.friend_sprites.items():
+        assert [group.get_layer_of_sprite(sprite) for sprite in sprites] == [friend.get_rect().bottom] * 3
+    for widget in game.overworld.hud:
+        assert group.get_layer_of_sprite(widget) == HUD_LAYER
+    assert group.get_top_layer() == HUD_LAYER
+
+
+def test_sprites_follow_their_friend():
+    game = playing_game()
+    friend, (glow, body, bar) = next(iter(game.overworld.friend_sprites.items()))
+    game.step()  # drawn, so nothing is dirty
+    game.overworld.update()
+    assert not body.dirty and not bar.dirty
+
+    friend.happiness = 100
+    game.overworld.update()
+    assert bar.dirty and bar.fill_width == bar.rect.width
+
+    friend.quest_completed = True
+    game.overworld.update()
+    assert glow.dirty and not glow.visible
+
+
+def test_sprites_are_placed_relative_to_the_camera():
+    game = playing_game(world_size=(3000, 3000))
+    offset = game.camera.offset
+    for friend, (glow, body, bar) in game.overworld.friend_sprites.items():
+        assert isinstance(glow, GlowSprite) and isinstance(bar, HappinessBarSprite)
+        assert body.rect.topleft == (friend.x - offset[0], friend.y - offset[1])
+        assert glow.rect.topleft == (friend.x - 8 - offset[0], friend.y - 8 - offset[1])
+
+
+def frame_as_redrawn(game):
+    """What the screen would show if the overworld were drawn from scratch"""
+    reference = pygame.Surface(game.screen.get_size())
+    reference.fill(game.WHITE)
+    for sprite in game.overworld.group.sprites():
+        if sprite.visible:
+            reference.blit(sprite.image, sprite.rect)
+    return pygame.image.tobytes(reference, "RGB")
+
+
+def test_camera_stays_inside_the_world():
+    camera = Camera((800, 600), (2000, 1000))
+    camera.follow((1000, 500))
+    assert camera.offset == (600, 200)
+    assert camera.to_world(camera.to_screen((123, 456))) == (123, 456)
+    camera.follow((0, 0))
+    assert camera.offset == (0, 0)
+    camera.follow((5000, 5000))
+    assert camera.view_rect == pygame.Rect(1200, 400, 800, 600)
+
+
+def test_only_friends_in_view_have_sprites():
+    game = playing_game(friend_count=200, world_size=(4000, 4000))
+    view = game.camera.view_rect.inflate(2 * CULL_MARGIN, 2 * CULL_MARGIN)
+    shown = set(game.overworld.friend_sprites)
+    assert shown == {friend for friend in game.friends if view.colliderect(friend.get_rect())}
+    assert 0 < len(shown) < len(game.friends)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_scrolled_frames_match_a_full_redraw(seed):
+    game = create_headless_game(seed=seed, friend_count=40)
+    game.state = GameState.PLAYING
+    rng = random.Random(seed)
+    keys = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN]
+    compared = 0
+    for frame in range(300):
+        if frame % 25 == 0:
+            game.input.held_keys.clear()
+            game.input.held_keys.update(rng.sample(keys, rng.choice((1, 2))))
+        game.step()
+        if game.state != GameState.PLAYING:
+            game.input.tap(pygame.K_n)  # decline quests, stay in the overworld
+            continue
+        assert pygame.image.tobytes(game.screen, "RGB") == frame_as_redrawn(game), frame
+        compared += 1
+
+    assert compared > 200
+    # Walking scrolls the frame instead of redrawing it
+    assert game.renderer.scrolls > 0
+    assert game.renderer.full_redraws <= 2
+
+
+def test_moved_friends_are_redrawn_where_they_are():
+    game = playing_game(friend_count=40)
+    saved = snapshot(game)
+    friend, (glow, body, bar) = next(iter(game.overworld.friend_sprites.items()))
+    start = (friend.x, friend.y)
+    friend.set_position(friend.x + 40, friend.y + 30)
+    game.step()
+    offset = game.camera.offset
+    assert body.rect.topleft == (friend.x - offset[0], friend.y - offset[1])
+    assert game.overworld.group.get_layer_of_sprite(glow) == friend.get_rect().bottom
+    assert pygame.image.tobytes(game.screen, "RGB") == frame_as_redrawn(game)
+
+    restore(game, saved)
+    game.step()
+    assert (friend.x, friend.y) == start
+    assert body.rect.topleft == (friend.x - offset[0], friend.y - offset[1])
+    assert pygame.image.tobytes(game.screen, "RGB") == frame_as_redrawn(game)
@@ -0,0 +1,77 @@
+import csv
+import json
+
+import pygame
+
+from game_engine import GameState
+from headless import create_headless_game
+from profiler import PhaseTimer, Profiler
+
+
+def test_ring_buffer_keeps_the_latest_samples():
+    timer = PhaseTimer(4)
+    assert timer.stats() is None
+    for ms in range(1, 7):
+        timer.add(float(ms))
+    assert timer.recent() == [3.0, 4.0, 5.0, 6.0]
+    stats = timer.stats()
+    assert stats["count"] == 6 and stats["max"] == 6.0 and stats["mean"] == 4.5
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (4.0, 6.0, 6.0)
+
+
+def test_export(tmp_path):
+    profiler = Profiler(capacity=3)
+    for ms in (1.0, 2.0):
+        profiler.record("update", ms)
+    profiler.record("render", 5.0)
+    profiler.export(str(tmp_path / "trace.csv"))
+    profiler.export(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.csv", newline="") as trace_file:
+        rows = list(csv.reader(trace_file))
+    assert rows == [["phase", "sample", "ms"], ["update", "0", "1.0000"], ["update", "1", "2.0000"],
+                    ["render", "0", "5.0000"]]
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert trace["phases"]["update"]["samples_ms"] == [1.0, 2.0]
+    assert trace["phases"]["render"]["summary"]["p50"] == 5.0
+
+
+def test_overlay_redraws_only_its_own_rect():
+    game = create_headless_game(seed=1, friend_count=40)
+    game.state = GameState.PLAYING
+    game.step()
+    game.toggle_profiler_overlay()
+    renderer = game.renderer
+    overlay = game.profiler_overlay
+    presented = []
+    present = renderer.present
+
+    def record():
+        presented.append((renderer.pending_full, list(renderer.pending_rects)))
+        present()
+
+    renderer.present = record
+    for _ in range(3 * overlay.REFRESH_FRAMES):
+        game.step()
+    assert renderer.full_redraws == 2  # entering the overworld and showing the overlay
+    # Standing still, only the overlay is pushed, and only when it refreshes
+    assert [frame for frame, (_, rects) in enumerate(presented) if rects] == [30, 60]
+    # (the old rect and the new one, which grows as phases are added)
+    assert all(rect.topright == overlay.rect.topright for _, rects in presented for rect in rects)
+
+    # Walking around, the overlay stays put over a correct scene
+    game.input.press(pygame.K_RIGHT)
+    game.input.press(pygame.K_DOWN)
+    for _ in range(40):
+        game.step()
+        reference = pygame.Surface(game.screen.get_size())
+        reference.fill(game.WHITE)
+        for sprite in game.overworld.group.sprites():
+            if sprite.visible:
+                reference.blit(sprite.image, sprite.rect)
+        reference.blit(overlay.surface, overlay.rect)
+        assert pygame.image.tobytes(game.screen, "RGB") == pygame.image.tobytes(reference, "RGB")
+    assert renderer.scrolls > 0 and renderer.full_redraws == 2
+
+    game.toggle_profiler_overlay()
+    game.step()
+    assert renderer.overlay is None and renderer.full_redraws == 3
@@ -0,0 +1,82 @@
+import random
+
+import pygame
+
+from conftest import outcome, play
+from headless import VirtualClock, create_headless_game
+from replay import (
+    EVENT_QUIT, EVENT_SNAPSHOT, FRAME, QUIT, REPLAY_HEADER, REPLAY_MAGIC, InputRecorder, read_replay, replay,
+)
+
+
+class JitterClock(VirtualClock):
+    """Uneven frame times, like a real clock"""
+
+    def __init__(self, seed):
+        super().__init__()
+        self.rng = random.Random(seed)
+
+    def tick(self, framerate=0):
+        self.frame_ms = self.rng.uniform(5, 40)
+        return self.frame_ms
+
+
+def finish(game, recorder):
+    game.input.source.quit()
+    game.step()
+    recorder.close()
+
+
+def test_replay_reproduces_a_recorded_session(tmp_path):
+    path = str(tmp_path / "session.iykr")
+    game = create_headless_game(render=False, seed=11, clock=JitterClock(9))
+    recorder = InputRecorder(path).attach(game)
+    play(game, 2000, random.Random(2))
+    game.input.source.type_text("field")
+    play(game, 500, random.Random(3))
+    finish(game, recorder)
+
+    replayed = replay(path)
+    assert outcome(replayed) == outcome(game)
+    assert replayed.input.frame == recorder.frames
+
+
+def test_replay_of_a_resumed_session_with_a_load(tmp_path):
+    save_path = tmp_path / "resume.iykg"
+    first = create_headless_game(render=False, seed=5, save_path=str(save_path))
+    play(first, 900, random.Random(1))
+    first.save_state()
+
+    path = str(tmp_path / "resumed.iykr")
+    game = create_headless_game(render=False, seed=5, save_path=str(save_path))
+    assert game.load_state()
+    recorder = InputRecorder(path).attach(game)
+    rng = random.Random(3)
+    play(game, 300, rng)
+    game.save_state()
+    play(game, 300, rng)
+    game.input.source.tap(pygame.K_F9)
+    game.step()
+    play(game, 300, rng)
+    finish(game, recorder)
+
+    # Playback neither needs nor touches the save file
+    save_path.unlink()
+    replayed = replay(path)
+    assert outcome(replayed) == outcome(game)
+    assert not save_path.exists()
+
+    _, start, frames = read_replay(path)
+    assert start
+    assert sum(1 for frame in frames if frame[3] and frame[3][-1][0] == EVENT_SNAPSHOT) == 1
+
+
+def test_version_1_recordings_start_a_new_game(tmp_path):
+    path = tmp_path / "old.iykr"
+    path.write_bytes(REPLAY_HEADER.pack(REPLAY_MAGIC, 1, 3, 0, 0, 0)
+                     + FRAME.pack(16.0, 0, 0, 0, 1) + QUIT.pack(EVENT_QUIT))
+    header, start, frames = read_replay(str(path))
+    assert header == dict(seed=3, friend_count=None, world_size=None)
+    assert start == b""
+    assert frames == [(16.0, (0, 0), 0, [(EVENT_QUIT,)])]
+    assert not replay(str(path)).running
@@ -0,0 +1,18 @@
+import pytest
+
+from rng import RandomStream, RandomStreams
+
+
+@pytest.mark.parametrize("a, b", [(0, 0), (0, 1), (5, 17), (-100, 100), (0, 1024), (0, 2 ** 40)])
+def test_randints_draws_what_randint_would(a, b):
+    for seed in range(20):
+        batched, single = RandomStream(seed), RandomStream(seed)
+        assert batched.randints(100, a, b) == [single.randint(a, b) for _ in range(100)]
+        assert batched.random() == single.random()
+
+
+def test_streams_are_independent_and_reproducible():
+    streams = RandomStreams(7)
+    streams.stream("placement").random()
+    assert streams.stream("objectives").random() == RandomStreams(7).stream("objectives").random()
+    assert RandomStreams(7).fork("a").seed != RandomStreams(7).fork("b").seed
@@ -0,0 +1,89 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from Colors.GreenColor import GreenColor
+from MiniGames import DEFAULT_MINI_GAME
+from roster import ROSTER_PATH, create_ability, create_color, compile_manifest, load_roster
+
+FRIEND = {
+    "name": "Ada",
+    "ability": "SuperStrength",
+    "color": [10, 20, 30],
+    "image": "ada.png",
+    "objectives": {"title": "Ada's Objectives", "items": ["Lift", "Carry"]},
+}
+
+
+def write_manifest(path, *friends, player_image="thijs.png"):
+    path.write_text(json.dumps({"version": 1, "player": {"image": player_image}, "friends": list(friends)}))
+
+
+def test_shipped_roster():
+    roster = load_roster(ROSTER_PATH)
+    assert roster.player_image == "thijs.png"
+    assert len(roster.friends) == 8
+    for entry in roster.friends:
+        create_ability(entry.ability)
+        create_color(entry.color)
+
+
+def test_compiled_cache_round_trip(tmp_path):
+    manifest = tmp_path / "roster.json"
+    cache = tmp_path / ".cache" / "roster.pickle"
+    write_manifest(manifest, FRIEND)
+    roster = load_roster(str(manifest))
+    assert cache.exists()
+    [entry] = roster.friends
+    assert entry.name == "Ada" and entry.color == (10, 20, 30)
+    assert entry.objectives == ("Lift", "Carry")
+    assert entry.mini_game == DEFAULT_MINI_GAME
+
+    # The cache is what gets read while the manifest is unchanged
+    stamp, compiled = pickle.loads(cache.read_bytes())
+    cache.write_bytes(pickle.dumps((stamp, (compiled[0], compiled[1] * 2))))
+    assert len(load_roster(str(manifest)).friends) == 2
+    cache.write_bytes(b"not a pickle")
+    assert load_roster(str(manifest)) == roster
+
+
+def test_changed_manifest_is_recompiled(tmp_path):
+    manifest = tmp_path / "roster.json"
+    cache = tmp_path / "compiled.pickle"
+    write_manifest(manifest, FRIEND)
+    load_roster(str(manifest), str(cache))
+    write_manifest(manifest, FRIEND, dict(FRIEND, name="Grace", mini_game="button_mash"), player_image="p.png")
+    stat = os.stat(manifest)
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    roster = load_roster(str(manifest), str(cache))
+    assert roster.player_image == "p.png"
+    assert [entry.name for entry in roster.friends] == ["Ada", "Grace"]
+    assert roster.friends[1].mini_game == "button_mash"
+
+
+def test_unwritable_cache_is_skipped(tmp_path):
+    manifest = tmp_path / "roster.json"
+    write_manifest(manifest, FRIEND)
+    (tmp_path / "blocker").write_text("")
+    roster = load_roster(str(manifest), str(tmp_path / "blocker" / "roster.pickle"))
+    assert roster.friends[0].name == "Ada"
+
+
+@pytest.mark.parametrize("manifest, message", [
+    ({"version": 2, "friends": [FRIEND]}, "version"),
+    ({"version": 1, "friends": []}, "no friends"),
+    ({"version": 1, "friends": [{"name": "Ada"}]}, "entry 0"),
+])
+def test_invalid_manifests(manifest, message):
+    with pytest.raises(ValueError, match=message):
+        compile_manifest(manifest)
+
+
+def test_registry_lookups():
+    assert isinstance(create_color("GreenColor"), GreenColor)
+    assert create_color([1, 2, 3]).get_color() == (1, 2, 3)
+    for name in ("NoSuchColor", "../GreenColor"):
+        with pytest.raises(KeyError):
+            create_color(name)
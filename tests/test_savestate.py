@@ -0,0 +1,150 @@
+import copy
+import pickle
+import random
+import sys
+
+import pygame
+
+from conftest import outcome, play
+from game_engine import GameState
+from headless import create_headless_game
+from rng import RandomStream
+from savestate import resume, restore, snapshot, unpack, user_save_path
+
+
+def start_mini_game(game):
+    """Walk the player into a friend and accept their quest"""
+    game.input.tap(pygame.K_SPACE)
+    game.step()
+    friend = game.friends[2]
+    game.player.topleft = (friend.x, friend.y)
+    game.step()
+    game.input.tap(pygame.K_y)
+    game.step()
+    assert game.state == GameState.MINI_GAME
+
+
+def test_resumed_game_continues_like_the_original():
+    game = create_headless_game(render=False, seed=3)
+    play(game, 600, random.Random(1))
+    data = snapshot(game)
+
+    forked = resume(data, headless=True, render=False)
+    play(game, 900, random.Random(2))
+    play(forked, 900, random.Random(2))
+    assert outcome(forked) == outcome(game)
+
+
+def test_restore_puts_a_mini_game_back_mid_play():
+    game = create_headless_game(render=True, seed=3)
+    start_mini_game(game)
+    for _ in range(30):
+        game.step()
+    data = snapshot(game)
+    saved = (game.mini_game.TYPE, game.mini_game.progress, game.mini_game.time, game.player_energy)
+
+    play(game, 300, random.Random(4))
+    restore(game, data)
+    assert game.state == GameState.MINI_GAME
+    assert (game.mini_game.TYPE, game.mini_game.progress, game.mini_game.time, game.player_energy) == saved
+    assert game.mini_game.game is game
+    # The mini-game still draws from the game's own stream
+    assert game.mini_game.rng is game.rng.streams[f"mini_game.{game.mini_game.TYPE}"]
+
+
+def test_snapshot_is_stable_across_a_round_trip():
+    game = create_headless_game(render=False, seed=7)
+    play(game, 400, random.Random(3))
+    data = snapshot(game)
+    assert snapshot(resume(data, headless=True, render=False)) == data
+
+
+def test_unpack_rejects_other_files():
+    try:
+        unpack(b"IYKR" + bytes(32))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a replay header was accepted as a save state")
+
+
+def test_f5_f9_round_trip(tmp_path):
+    game = create_headless_game(render=False, seed=5, save_path=str(tmp_path / "quick.iykg"))
+    play(game, 300, random.Random(1))
+    game.input.tap(pygame.K_F5)
+    game.handle_events()  # saves before the frame's update
+    saved = outcome(game)
+
+    play(game, 300, random.Random(2))
+    game.input.tap(pygame.K_F9)
+    game.handle_events()
+    assert outcome(game) == saved
+
+
+def test_saving_is_off_without_a_save_path(tmp_path, monkeypatch):
+    game = create_headless_game(render=False, seed=5)
+    monkeypatch.chdir(tmp_path)
+    planted = tmp_path / "quicksave.iykg"
+    planted.write_bytes(b"not ours")  # F9 must not unpickle whatever is lying around
+    assert not game.save_state()
+    assert not game.load_state()
+    game.input.tap(pygame.K_F5)
+    game.input.tap(pygame.K_F9)
+    game.step()
+    assert list(tmp_path.iterdir()) == [planted] and planted.read_bytes() == b"not ours"
+
+
+def test_user_save_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    path = user_save_path()
+    assert path == str(tmp_path / "data" / "iykwim" / "quicksave.iykg")
+    game = create_headless_game(render=False, seed=5, save_path=path)
+    assert game.save_state()  # creates the directory
+    assert game.load_state()
+
+
+def test_save_and_load_mid_mini_game(tmp_path):
+    path = str(tmp_path / "quick.iykg")
+    game = create_headless_game(render=True, seed=3, save_path=path)
+    start_mini_game(game)
+    mini_game = game.mini_game
+    assert mini_game.TYPE == "memory_cards"
+    # Turn over two cards that differ, which sets a timer to hide them again
+    first = mini_game.cards[0]
+    second = next(i for i, card in enumerate(mini_game.cards) if card.symbol != first.symbol)
+    for index in (0, second):
+        x, y = mini_game.LAYOUT.position(index)
+        game.input.click((x + 30, y + 30))
+    game.step()
+    assert len(mini_game.scheduler) == 1
+    # The scheduler pickles as plain data (itertools objects no longer pickle from Python 3.14)
+    assert b"itertools" not in pickle.dumps(mini_game.scheduler, protocol=5)
+    assert game.save_state()
+    saved = (mini_game.TYPE, mini_game.progress, mini_game.time, mini_game.scheduler.sequence)
+
+    play(game, 200, random.Random(4))
+    assert game.load_state()
+    restored = game.mini_game
+    assert restored is not mini_game and game.state == GameState.MINI_GAME
+    assert (restored.TYPE, restored.progress, restored.time, restored.scheduler.sequence) == saved
+    assert len(restored.scheduler) == 1 and restored.cards[second].revealed
+    for _ in range(round(restored.HIDE_DELAY * game.SIM_HZ) + 1):
+        game.step()
+    assert not restored.cards[second].revealed  # the restored timer fired
+
+
+def test_random_stream_pickles_its_state_out_of_band():
+    stream = RandomStream(42)
+    stream.random()
+    stream.gauss(0, 1)  # keeps a second value in gauss_next
+
+    buffers = []
+    payload = pickle.dumps(stream, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1 and len(payload) < 200
+    copies = [pickle.loads(payload, buffers=buffers), pickle.loads(pickle.dumps(stream, protocol=2)),
+              copy.deepcopy(stream)]
+    for other in copies:
+        assert type(other) is RandomStream
+        assert other.getstate() == stream.getstate()
+    assert [other.random() for other in copies] == [stream.random()] * len(copies)
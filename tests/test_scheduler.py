@@ -0,0 +1,78 @@
+from scheduler import Scheduler
+
+
+def test_timers_run_in_deadline_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.call_later(0.3, lambda: fired.append("c"))
+    scheduler.call_later(0.1, lambda: fired.append("a"))
+    scheduler.call_later(0.2, lambda: fired.append("b1"))
+    scheduler.call_later(0.2, lambda: fired.append("b2"))  # ties keep the order they were set in
+    scheduler.advance(0.05)
+    assert fired == []
+    scheduler.advance(1.0)
+    assert fired == ["a", "b1", "b2", "c"]
+    assert len(scheduler) == 0
+
+
+def test_float_steps_reach_their_deadline():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.call_later(1 / 6, lambda: fired.append(scheduler.now))
+    for _ in range(10):
+        scheduler.advance(1 / 60)
+    assert len(fired) == 1
+
+
+def test_cancel_and_reschedule():
+    scheduler = Scheduler()
+    fired = []
+    timer = scheduler.call_later(1.0, lambda: fired.append("timer"))
+    assert timer.active and len(scheduler) == 1
+    scheduler.cancel(timer)
+    scheduler.cancel(timer)  # cancelling twice is harmless
+    assert not timer.active and len(scheduler) == 0
+    scheduler.advance(2.0)
+    assert fired == []
+
+    scheduler.reschedule(timer, 0.5)  # inactive timers can be set again
+    assert timer.deadline == 2.5
+    scheduler.reschedule(timer, 1.0)  # and active ones moved
+    scheduler.advance(0.5)
+    assert fired == []
+    scheduler.advance(0.5)
+    assert fired == ["timer"] and not timer.active
+
+
+def test_call_every_repeats_without_drift():
+    scheduler = Scheduler()
+    fired = []
+    timer = scheduler.call_every(0.25, lambda: fired.append(scheduler.now))
+    scheduler.advance(1.0)  # one long step still fires every due interval
+    assert len(fired) == 4
+    assert timer.active and timer.deadline == 1.25
+    for _ in range(60):
+        scheduler.advance(1 / 60)
+    assert len(fired) == 8
+
+
+def test_callbacks_can_cancel_their_own_timer():
+    scheduler = Scheduler()
+    fired = []
+
+    def once_more():
+        fired.append(scheduler.now)
+        if len(fired) == 2:
+            scheduler.cancel(timer)
+
+    timer = scheduler.call_every(1.0, once_more)
+    scheduler.advance(5.0)
+    assert fired == [5.0, 5.0]
+    assert not timer.active
+
+
+def test_clear():
+    scheduler = Scheduler()
+    timers = [scheduler.call_later(delay, lambda: None) for delay in (1, 2, 3)]
+    scheduler.clear()
+    assert len(scheduler) == 0 and not any(timer.active for timer in timers)
@@ -0,0 +1,73 @@
+import asyncio
+import sys
+
+from bots import MiniGameBot, SessionBot
+from conftest import outcome
+from headless import create_headless_game
+from rng import RandomStreams
+from session_server import SessionServer, _max_rss_kb, run_shard
+
+
+def test_sessions_are_independent_logic_only_games():
+    server = SessionServer(seed=1)
+    first, second = server.open_session(), server.open_session(seed=2)
+    assert (first.id, second.id) == (1, 2)
+    assert first.game.screen is None and first.game.overworld is None
+    assert first.game.save_path is None and first.game.autosave is None
+    assert (first.game.seed, second.game.seed) == (1, 2)
+    assert server.open_session(save_path="own.iykg").game.save_path == "own.iykg"
+
+
+def test_sessions_play_like_standalone_games():
+    def bot(game):
+        return SessionBot(game, MiniGameBot(RandomStreams(9).stream("bot")))
+
+    server = SessionServer()
+    session = server.open_session(seed=4)
+    session.driver = bot(session.game).step
+    for _ in range(1200):
+        server.tick()
+
+    game = create_headless_game(render=False, seed=4)
+    standalone = bot(game)
+    for _ in range(1200):
+        standalone.step()
+        game.step()
+    assert outcome(session.game) == outcome(game)
+    assert game.completed_quests > 0
+
+
+def test_quit_sessions_are_closed():
+    server = SessionServer(seed=1)
+    staying, leaving = server.open_session(), server.open_session()
+    leaving.input.quit()
+    server.tick()
+    assert list(server.sessions) == [staying.id]
+    assert server.close_session(leaving.id) is None
+    stats = server.stats()
+    assert (stats["sessions"], stats["ticks"], stats["session_ticks"]) == (1, 1, 2)
+    assert stats["session_ticks_per_second"] > 0
+
+
+def test_serve_ticks_on_the_event_loop():
+    server = SessionServer(tick_hz=200, batch_size=2, seed=1)
+    for _ in range(5):
+        server.open_session()
+
+    async def serve_and_stop():
+        task = asyncio.ensure_future(server.serve())
+        while server.ticks < 3:
+            await asyncio.sleep(0.01)
+        server.stop()
+        await task
+
+    asyncio.run(serve_and_stop())
+    assert not server.running
+    assert server.session_ticks == 5 * server.ticks
+
+
+def test_run_shard():
+    stats = run_shard(0, sessions=3, seconds=0.2, realtime=False, seed=1)
+    assert stats["sessions"] == 3 and stats["ticks"] > 0
+    assert stats["open_ms_per_session"] > 0
+    assert _max_rss_kb() > 0 or sys.platform == "win32"
@@ -0,0 +1,59 @@
+import random
+
+import pygame
+
+from headless import create_headless_game
+from spatial_hash import SpatialHash
+
+
+def test_insert_move_remove():
+    index = SpatialHash(cell_size=10)
+    index.insert("a", (0, 0, 5, 5))
+    index.insert("b", (8, 8, 5, 5))  # spans four cells
+    assert len(index) == 2 and "b" in index
+    assert len(index.cells) == 4
+    assert index.query_rect((0, 0, 1, 1)) == ["a"]
+    assert index.query_rect((0, 0, 20, 20)) == ["a", "b"]
+
+    index.insert("a", (30, 30, 5, 5))  # inserting again moves
+    assert index.rect_of("a") == pygame.Rect(30, 30, 5, 5)
+    assert index.query_rect((0, 0, 5, 5)) == []
+    index.remove("b")
+    index.remove("b")  # removing twice is harmless
+    assert index.query_rect((0, 0, 40, 40)) == ["a"]
+    assert list(index.cells) == [(3, 3)]
+
+
+def test_queries_match_a_brute_force_scan():
+    rng = random.Random(1)
+    index = SpatialHash(cell_size=32)
+    rects = {}
+    for obj in range(200):
+        rects[obj] = pygame.Rect(rng.randrange(1000), rng.randrange(1000), rng.randrange(1, 80), rng.randrange(1, 80))
+        index.insert(obj, rects[obj])
+    for obj in range(0, 200, 3):
+        rects[obj] = rects[obj].move(rng.randrange(-100, 100), rng.randrange(-100, 100))
+        index.move(obj, rects[obj])
+
+    for _ in range(50):
+        query = pygame.Rect(rng.randrange(1000), rng.randrange(1000), rng.randrange(1, 200), rng.randrange(1, 200))
+        assert index.query_rect(query) == [obj for obj, rect in rects.items() if query.colliderect(rect)]
+
+        center = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        radius = rng.uniform(0, 150)
+        expected = []
+        for obj, rect in rects.items():
+            dx = max(rect.left - center[0], 0, center[0] - rect.right)
+            dy = max(rect.top - center[1], 0, center[1] - rect.bottom)
+            if dx * dx + dy * dy <= radius * radius:
+                expected.append(obj)
+        assert index.query_radius(center, radius) == expected
+
+
+def test_friends_keep_the_index_up_to_date():
+    game = create_headless_game(render=False, seed=1)
+    friend = game.friends[0]
+    assert game.friend_index.rect_of(friend) == friend.get_rect()
+    friend.set_position(friend.x + 500, friend.y + 500)
+    assert game.friend_index.rect_of(friend) == friend.get_rect()
+    assert friend in game.friend_index.query_rect(friend.get_rect())
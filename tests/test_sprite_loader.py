@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+
+import game_engine
+from asset_manager import AssetManager, SpriteLoader, placeholder_sprite
+from conftest import REPO_ROOT
+from game_engine import GameState
+from headless import create_headless_game
+
+SPRITE = "resources/cutout/thijs.png"
+SIZE = (64, 128)
+
+
+def test_placeholder_first_then_the_sprite():
+    manager = AssetManager()
+    loader = SpriteLoader(manager, max_workers=2)
+    assert loader.executor is None and loader.progress == 1.0
+    arrived = []
+    first = loader.request(SPRITE, SIZE, arrived.append)
+    second = loader.request(SPRITE, list(SIZE), arrived.append)  # the same sprite is decoded once
+    assert first is second is placeholder_sprite(SIZE, (0, 0, 255))
+    assert loader.requested == 1 and loader.progress == 0.0
+
+    loader.wait()
+    assert loader.loaded == 1 and loader.progress == 1.0 and not loader.pending
+    [sprite, again] = arrived
+    assert sprite is again is manager.sprites[(SPRITE, SIZE)]
+    assert sprite.get_size() == SIZE
+    assert loader.request(SPRITE, SIZE, arrived.append) is sprite  # cached from now on
+    assert len(arrived) == 2
+
+
+def test_missing_sprites_keep_their_placeholder():
+    loader = SpriteLoader(AssetManager())
+    arrived = []
+    placeholder = loader.request("resources/no_such_sprite.png", SIZE, arrived.append, (255, 0, 0))
+    assert placeholder.get_at((0, 0))[:3] == (255, 0, 0)
+    loader.wait()
+    assert arrived == [] and loader.progress == 1.0
+    [(path, error)] = loader.failed
+    assert path == "resources/no_such_sprite.png"
+
+
+def test_the_game_starts_on_placeholders_and_swaps_in_sprites(monkeypatch):
+    loader = SpriteLoader(AssetManager())
+    monkeypatch.setattr(game_engine, "sprite_loader", loader)
+    game = create_headless_game(seed=1, background_loading=True)
+    assert game.state == GameState.MAIN_MENU
+    assert loader.requested > 0 and loader.pending
+    placeholder = game.player_image
+    loader.wait()
+    assert game.player_image is not placeholder
+    loaded = {id(sprite) for sprite in loader.manager.sprites.values()}
+    assert not loader.failed and all(id(friend.image) in loaded for friend in game.friends)
+    game.step()
+    assert not loader.pending
+
+
+@pytest.mark.parametrize("module", ["asset_manager", "game_engine"])
+def test_the_thread_pool_is_imported_on_first_use(module):
+    code = f"import sys, {module}; print('concurrent.futures' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+                            env={"SDL_VIDEODRIVER": "dummy", "PYGAME_HIDE_SUPPORT_PROMPT": "1"})
+    assert result.stdout.strip() == "False"
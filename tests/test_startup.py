@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+from startup_budget import child_env, parse_importtime  # noqa: E402
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:      3000 |       3000 |   numpy
+import time:      1000 |       4000 | pygame
+import time:       200 |        200 |   json
+import time:       500 |        700 | game_engine
+"""
+
+
+def test_only_imports_after_pygame_are_budgeted():
+    # Modules are listed after the ones they import
+    total, modules = parse_importtime(IMPORTTIME)
+    assert total == 700
+    assert modules == [(200, "json"), (500, "game_engine")]
+    assert parse_importtime(IMPORTTIME, after=None)[0] == 4800
+
+
+def test_packages_import_their_modules_lazily():
+    script = ("import sys, Colors, Abilities\n"
+              "assert 'Colors.GreenColor' not in sys.modules\n"
+              "assert Colors.GreenColor.__name__ == 'GreenColor'\n"
+              "assert 'Colors.GreenColor' in sys.modules and 'Colors.RedColor' not in sys.modules\n"
+              "assert 'Abilities.Invisibility' not in sys.modules\n")
+    subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, env=child_env(), check=True)
+
+
+def test_unknown_package_attributes():
+    import Colors
+
+    assert "RedColor" in dir(Colors)
+    with pytest.raises(AttributeError):
+        Colors.NoSuchColor
@@ -0,0 +1,42 @@
+import pygame
+
+from text_cache import TextCache, shared_font
+
+
+def test_repeated_text_is_rendered_once():
+    pygame.font.init()
+    cache = TextCache()
+    font = shared_font(24)
+    first = cache.render(font, "Score: 100", True, (0, 0, 0))
+    assert cache.render(font, "Score: 100", True, (0, 0, 0)) is first
+    assert cache.render(font, "Score: 100", True, (255, 0, 0)) is not first
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate() == 1 / 3
+
+
+def test_least_recently_used_text_is_evicted():
+    pygame.font.init()
+    cache = TextCache(max_size=2)
+    font = shared_font(24)
+    a = cache.render(font, "a", True, (0, 0, 0))
+    cache.render(font, "b", True, (0, 0, 0))
+    assert cache.render(font, "a", True, (0, 0, 0)) is a  # now the most recent
+    cache.render(font, "c", True, (0, 0, 0))  # evicts "b"
+    assert len(cache.surfaces) == 2
+    assert cache.render(font, "a", True, (0, 0, 0)) is a
+    misses = cache.misses
+    cache.render(font, "b", True, (0, 0, 0))
+    assert cache.misses == misses + 1
+
+
+def test_shared_fonts_and_pre_rendered_glyphs():
+    pygame.font.init()
+    font = shared_font(36)
+    assert shared_font(36) is font
+    cache = TextCache()
+    glyph = pygame.Surface((5, 5))
+    cache.glyphs = {(36, "★", (0, 0, 0)): glyph}
+    assert cache.render(font, "★", True, (0, 0, 0)) is glyph
+    # Only antialiased text in a shared font comes from the glyphs
+    assert cache.render(font, "★", False, (0, 0, 0)) is not glyph
+    assert cache.render(pygame.font.Font(None, 36), "★", True, (0, 0, 0)) is not glyph
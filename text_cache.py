@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+_font_sizes = {}
+
+
+def shared_font(size):
+    """pygame's default font at `size`, loaded once and shared by every game in the process"""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+        _font_sizes[font] = size
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, antialias, color).
+
+    Most strings drawn each frame never change, so rasterizing them again is
+    wasted work. Returned surfaces are shared and must not be drawn on.
+    Pre-rendered glyphs (e.g. from the texture atlas) are used instead of
+    rendering text in a shared font when there is one.
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.glyphs = {}  # (font size, text, color) -> surface, for shared_font() fonts
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.glyphs.get((_font_sizes.get(font), text, color)) if antialias and self.glyphs else None
+        if surface is None:
+            surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0